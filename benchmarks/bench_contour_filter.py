@@ -0,0 +1,80 @@
+# benchmarks/bench_contour_filter.py
+"""
+Benchmark af kontur filtreringen i detect_license_plate: den oprindelige
+kontur-for-kontur løkke mod den vektoriserede NumPy udgave.
+
+Kør: python benchmarks/bench_contour_filter.py
+"""
+import os
+import sys
+import time
+import numpy as np
+import cv2
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from contour_filter import filter_candidates, filter_candidates_loop, filter_candidates_numpy
+
+
+def high_contour_frame(seed, density, width=640, height=480, spacing=10):
+    """
+    Støjfyldt frame (regn, løv, grus) der giver mange konturer efter Canny + closing.
+    Pletterne ligger på et gitter så closing ikke smelter dem sammen.
+    """
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width), 90, dtype=np.uint8)
+    for y in range(spacing // 2, height - 2, spacing):
+        for x in range(spacing // 2, width - 2, spacing):
+            if rng.random() < density:
+                frame[y - 1:y + 2, x - 1:x + 2] = 255
+
+    # Et par plade-lignende rektangler så der også er rigtige kandidater
+    for _ in range(5):
+        x, y = int(rng.integers(0, width - 200)), int(rng.integers(0, height - 60))
+        cv2.rectangle(frame, (x, y), (x + int(rng.integers(120, 200)), y + 40), 255, 2)
+
+    blurred = cv2.GaussianBlur(frame, (5, 5), 0)
+    edges = cv2.Canny(blurred, 50, 150)
+    closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return contours
+
+
+def time_it(fn, repeat):
+    """Median tid i ms over repeat kørsler"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    print("=" * 78)
+    print(" KONTUR FILTRERING - løkke vs. vektoriseret")
+    print("=" * 78)
+    print(f" {'opløsning':>10} {'konturer':>9} {'løkke ms':>10} {'numpy ms':>10} "
+          f"{'auto ms':>9} {'speedup':>8}  identisk")
+
+    for width, height in ((640, 480), (1920, 1080)):
+        for density in (0.01, 0.1, 0.5, 1.0):
+            contours = high_contour_frame(0, density, width, height)
+            args = (contours, 2500, width, height)
+
+            loop_result = filter_candidates_loop(*args)
+            identical = (filter_candidates_numpy(*args) == loop_result
+                         and filter_candidates(*args) == loop_result)
+
+            loop_ms = time_it(lambda: filter_candidates_loop(*args), 50)
+            numpy_ms = time_it(lambda: filter_candidates_numpy(*args), 50)
+            auto_ms = time_it(lambda: filter_candidates(*args), 50)
+
+            print(f" {width:>5}x{height:<4} {len(contours):>9} {loop_ms:>10.2f} {numpy_ms:>10.2f} "
+                  f"{auto_ms:>9.2f} {loop_ms / numpy_ms:>7.1f}x  {'ja' if identical else 'NEJ'}")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
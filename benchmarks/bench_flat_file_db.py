@@ -0,0 +1,172 @@
+# benchmarks/bench_flat_file_db.py
+"""
+Benchmark af FlatFileDB med mange parkerede biler: den oprindelige liste
+(lineær in/remove) mod indekset keyed på nummerplade.
+
+Indkørsel/udkørsel måles uden save_data, så det er opslaget i hukommelsen der
+sammenlignes - fil-skrivningen er den samme for begge. Indlæsning og én
+gemning af hele filen måles for sig.
+
+Derefter måles indkørsel inkl. skrivning til disk: hele JSON filen pr. ændring
+mod journal mode (én logpost pr. ændring) med hver fsync politik og SQLite
+(WAL, én transaktion pr. ændring). SQLites opstart inkluderer importen af JSON.
+
+Til sidst pladetabellen (mmap): opstart af en eksisterende tabel og opslag.
+
+Kør: python benchmarks/bench_flat_file_db.py [--plates 100000]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from flat_file_db import FlatFileDB
+from journaled_db import JournaledFlatFileDB, FSYNC_POLICIES
+from mmap_db import MmapFlatFileDB
+from sqlite_db import SqliteFlatFileDB
+
+
+class ListFlatFileDB(FlatFileDB):
+    """Den oprindelige implementering: parked_cars som en liste af plader"""
+
+    def load_data(self):
+        with open(self.db_file, 'r') as f:
+            return json.load(f)
+
+    def save_data(self):
+        pass
+
+    def car_entry(self, plate_number, lane=None):
+        if plate_number in self.parked_cars:
+            return False
+        self.parked_cars.append(plate_number)
+        return True
+
+    def car_exit(self, plate_number):
+        if plate_number in self.parked_cars:
+            self.parked_cars.remove(plate_number)
+            return True
+        return False
+
+
+def make_plates(count, seed=0):
+    """count unikke danske plader (2 bogstaver + 5 cifre)"""
+    rng = random.Random(seed)
+    plates = set()
+    while len(plates) < count:
+        plates.add("".join(rng.choices(string.ascii_uppercase, k=2)) + f"{rng.randrange(100000):05d}")
+    return list(plates)
+
+
+def time_ops(fn, items):
+    """Gennemsnitlig tid pr. kald i mikrosekunder"""
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - started) / len(items) * 1e6
+
+
+def silence(fn, *args):
+    """Kør fn uden FlatFileDB's print pr. bil"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        return fn(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark af FlatFileDB med mange biler")
+    parser.add_argument('--plates', type=int, default=100000, help="Antal parkerede biler")
+    parser.add_argument('--ops', type=int, default=1000, help="Antal opslag/ind-/udkørsler der måles")
+    parser.add_argument('--write-ops', type=int, default=20, help="Antal indkørsler med skrivning til disk")
+    args = parser.parse_args()
+
+    plates = make_plates(args.plates + args.ops)
+    parked, arriving = plates[:args.plates], plates[args.plates:]
+    lookups = random.Random(1).sample(parked, args.ops)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'parked_cars.json')
+        with open(path, 'w') as f:
+            json.dump(parked, f)   # Gammelt liste format - indlæses af begge
+
+        print("=" * 70)
+        print(f" FLAT FILE DB - {args.plates} parkerede biler, {args.ops} operationer")
+        print("=" * 70)
+        print(f" {'operation':<22} {'liste µs':>12} {'indeks µs':>12} {'speedup':>10}")
+
+        started = time.perf_counter()
+        old = ListFlatFileDB(path)
+        old_load = time.perf_counter() - started
+        started = time.perf_counter()
+        new = silence(FlatFileDB, path)
+        new_load = time.perf_counter() - started
+        new.save_data = lambda: None
+
+        rows = [
+            ("is_car_parked (hit)", lambda db: time_ops(db.is_car_parked, lookups)),
+            ("is_car_parked (miss)", lambda db: time_ops(db.is_car_parked, arriving)),
+            ("car_entry", lambda db: time_ops(db.car_entry, arriving)),
+            ("car_exit", lambda db: time_ops(db.car_exit, lookups)),
+        ]
+        for name, measure in rows:
+            old_us = silence(measure, old)
+            new_us = silence(measure, new)
+            print(f" {name:<22} {old_us:>12.2f} {new_us:>12.2f} {old_us / new_us:>9.0f}x")
+
+        print(f" {'indlæsning (ms)':<22} {old_load * 1000:>12.1f} {new_load * 1000:>12.1f}")
+        del new.save_data
+        started = time.perf_counter()
+        new.save_data()
+        print(f" {'save_data (ms)':<22} {'':>12} {(time.perf_counter() - started) * 1000:>12.1f}")
+        print("=" * 70)
+
+        # Indkørsel inkl. skrivning - hver variant starter fra samme fil med alle biler
+        print(f" Indkørsel med skrivning til disk ({args.write_ops} indkørsler)")
+        print(f" {'mode':<22} {'ms/indkørsel':>12} {'opstart ms':>12}")
+        writes = arriving[:args.write_ops]
+        variants = [("json (hel fil)", lambda p: FlatFileDB(p))]
+        variants += [(f"journal fsync={policy}", lambda p, policy=policy: JournaledFlatFileDB(
+            p, {'fsync': policy, 'compact_interval': 3600})) for policy in FSYNC_POLICIES]
+        variants += [(f"sqlite sync={mode}", lambda p, mode=mode: SqliteFlatFileDB(
+            p, {'synchronous': mode})) for mode in ('NORMAL', 'FULL')]
+        for i, (name, create) in enumerate(variants):
+            variant_path = os.path.join(tmp, f"variant{i}.json")
+            with open(variant_path, 'w') as f:
+                json.dump(parked, f)
+            started = time.perf_counter()
+            db = silence(create, variant_path)
+            startup_ms = (time.perf_counter() - started) * 1000
+            per_op_ms = silence(time_ops, db.car_entry, writes) / 1000
+            silence(db.close)
+            print(f" {name:<22} {per_op_ms:>12.3f} {startup_ms:>12.1f}")
+        print("=" * 70)
+
+        # Pladetabel: importen fra JSON sker kun første gang, derefter læses kun headeren
+        print(" Pladetabel (mmap)")
+        started = time.perf_counter()
+        table = silence(MmapFlatFileDB, path, {'initial_slots': args.plates * 2})
+        print(f" {'import af JSON (ms)':<22} {(time.perf_counter() - started) * 1000:>12.1f}")
+        silence(table.close)
+        started = time.perf_counter()
+        table = silence(MmapFlatFileDB, path)
+        print(f" {'opstart (ms)':<22} {(time.perf_counter() - started) * 1000:>12.1f}")
+        print(f" {'is_car_parked (µs)':<22} {time_ops(table.is_car_parked, lookups):>12.2f}")
+        print(f" {'car_entry (µs)':<22} {silence(time_ops, table.car_entry, arriving):>12.2f}")
+        print(f" {'car_exit (µs)':<22} {silence(time_ops, table.car_exit, lookups):>12.2f}")
+        print(f" {'filstørrelse (MB)':<22} {os.path.getsize(table.table_file) / 1e6:>12.1f}")
+        silence(table.close)
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# benchmarks/bench_pipeline.py
+"""
+Benchmark af genkendelsens trin offline på CPU:
+detect_license_plate, read_plate_template, read_plate_easyocr, validate_plate_text
+og process_frame.
+
+Bruger det indtjekkede korpus i benchmarks/corpus (plade- og ikke-plade frames)
+samt syntetiske danske plader tegnet med OpenCV. For hvert trin rapporteres
+throughput og p50/p95/p99 latency, og resultatet sammenlignes med en gemt
+baseline så regressioner bliver markeret. OCR backends (fp32, onnx) måles som
+read_plate_easyocr[backend] og sammenlignes med standard backenden.
+
+Baseline tallene afhænger af maskinen, så der er ingen indtjekket baseline:
+gem en med --save-baseline på den maskine der måles på, før regressioner
+kan markeres.
+
+Kør:
+    python benchmarks/bench_pipeline.py                  # mål og sammenlign med baseline
+    python benchmarks/bench_pipeline.py --save-baseline  # gem målingen som ny baseline
+    python benchmarks/bench_pipeline.py --backends onnx  # kun ONNX backenden i sammenligningen
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import cv2
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, '..', 'pc-side', 'src')))
+from synthetic import random_plate_text, render_danish_plate
+from template_ocr import TemplateOCR
+
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Genkendelse uden cache, bevægelse, tråde og tracking så hvert trin måles for sig
+BENCH_CONFIG = {
+    'license_plate': {
+        'top_k': 3,
+        'motion': {'enabled': False},
+        'ocr_cache': {'enabled': False},
+        'template_ocr': {'enabled': False},
+        'ocr_pool': {'workers': 0},
+        # Indlæsningsfejl (fx ingen model offline) fanges i baggrundstråden, så trinene
+        # uden OCR stadig måles
+        'ocr_loading': {'background': True},
+        'batching': {'enabled': False},
+        'tracking': {'detect_every': 1},
+    }
+}
+
+
+def load_corpus():
+    """Indlæs korpus frames som (navn, frame, forventet plade eller None)"""
+    with open(os.path.join(CORPUS_DIR, 'labels.json')) as f:
+        labels = json.load(f)
+    return [(name, cv2.imread(os.path.join(CORPUS_DIR, name)), labels[name])
+            for name in sorted(labels)]
+
+
+def synthetic_plates(count, seed=7):
+    """Syntetiske plade crops som (billede, tekst) i forskellige størrelser"""
+    rng = np.random.default_rng(seed)
+    plates = []
+    for i in range(count):
+        text = random_plate_text(rng)
+        plates.append((render_danish_plate(text, height=int(rng.integers(30, 80))), text))
+    return plates
+
+
+def percentile(values, p):
+    return float(np.percentile(values, p)) if values else 0.0
+
+
+def run_stage(fn, inputs, iterations):
+    """Kør fn på alle inputs iterations gange - returnerer statistik i ms"""
+    timings = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for item in inputs:
+            t0 = time.perf_counter()
+            fn(item)
+            timings.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        'calls': len(timings),
+        'throughput': len(timings) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'p99_ms': percentile(timings, 99),
+    }
+
+
+def ocr_available(recognizer):
+    """Om recognizeren har en OCR model den kan bruge"""
+    return recognizer.reader is not None or recognizer.ocr_pool is not None
+
+
+def benchmark(recognizer, iterations):
+    """Mål alle trin - returnerer {trin: statistik}"""
+    corpus = load_corpus()
+    frames = [frame for _, frame, _ in corpus]
+    plates = synthetic_plates(20)
+    texts = [text for _, text in plates]
+    texts += [t[:6] for t in texts[:5]] + [t.lower() + "X" for t in texts[:5]] + ["", "AB 12 345"]
+
+    results = {
+        'detect_license_plate': run_stage(recognizer.detect_license_plate, frames, iterations),
+        'validate_plate_text': run_stage(recognizer.validate_plate_text, texts, iterations * 50),
+    }
+
+    # Template matching (hurtig vej foran EasyOCR) - kun læsninger over confidence tærsklen tæller
+    template_ocr = TemplateOCR()
+    results['read_plate_template'] = run_stage(template_ocr.read, [img for img, _ in plates], iterations)
+    accepted = [template_ocr.read(img) for img, _ in plates]
+    correct = sum(text == expected and confidence >= template_ocr.min_confidence
+                  for (text, confidence), (_, expected) in zip(accepted, plates))
+    results['read_plate_template']['accuracy'] = correct / float(len(plates))
+
+    if not ocr_available(recognizer):
+        print(" OCR model ikke tilgængelig - read_plate_easyocr og process_frame springes over")
+        return results
+
+    results['read_plate_easyocr'] = run_stage(
+        recognizer.read_plate_easyocr, [img for img, _ in plates], iterations)
+    correct = sum(recognizer.read_plate_easyocr(img) == text for img, text in plates)
+    results['read_plate_easyocr']['accuracy'] = correct / float(len(plates))
+
+    results['process_frame'] = run_stage(recognizer.process_frame, frames, iterations)
+    return results
+
+
+def benchmark_backends(backends, iterations):
+    """Mål read_plate_easyocr med andre OCR backends - returnerer {trin: statistik}"""
+    plates = synthetic_plates(20)
+    images = [img for img, _ in plates]
+    results = {}
+
+    for backend in backends:
+        config = copy.deepcopy(BENCH_CONFIG)
+        config['license_plate']['recognizer'] = {'backend': backend}
+        try:
+            recognizer = build_recognizer(config)
+        except Exception as e:
+            print(f" OCR backend {backend} kunne ikke indlæses - springes over: {e}")
+            continue
+
+        try:
+            if not ocr_available(recognizer):
+                print(f" OCR backend {backend} kunne ikke indlæses - springes over")
+                continue
+            stats = run_stage(recognizer.read_plate_easyocr, images, iterations)
+            correct = sum(recognizer.read_plate_easyocr(img) == text for img, text in plates)
+            stats['accuracy'] = correct / float(len(plates))
+        finally:
+            recognizer.close()
+        results[f'read_plate_easyocr[{backend}]'] = stats
+
+    return results
+
+
+def print_backend_comparison(results):
+    """Hastighed og nøjagtighed for hver OCR backend i forhold til standard backenden"""
+    reference = results.get('read_plate_easyocr')
+    backends = [stage for stage in results if stage.startswith('read_plate_easyocr[')]
+    backends += ['read_plate_template'] if 'read_plate_template' in results else []
+    if not reference or not backends:
+        return
+
+    print(f" {'OCR backend':<30} {'p50 ms':>9} {'hastighed':>10} {'nøjagtighed':>12}")
+    print("-" * 92)
+    for stage in ['read_plate_easyocr'] + backends:
+        stats = results[stage]
+        speedup = reference['p50_ms'] / stats['p50_ms'] if stats['p50_ms'] > 0 else 0.0
+        print(f" {stage:<30} {stats['p50_ms']:>9.3f} {speedup:>9.2f}x {stats['accuracy']:>12.0%}")
+    print("=" * 92)
+
+
+def compare(results, baseline, tolerance):
+    """Find trin hvor p50 eller p95 er blevet mere end tolerance langsommere"""
+    regressions = []
+    for stage, stats in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            if base[key] > 0 and stats[key] > base[key] * (1 + tolerance):
+                regressions.append((stage, key, base[key], stats[key]))
+    return regressions
+
+
+def print_results(results, baseline):
+    print("=" * 92)
+    print(f" {'trin':<28} {'kald':>7} {'kald/s':>10} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'p50 vs. baseline':>17}")
+    print("-" * 92)
+    for stage, stats in results.items():
+        change = ""
+        base = baseline.get(stage)
+        if base and base['p50_ms'] > 0:
+            change = f"{(stats['p50_ms'] / base['p50_ms'] - 1) * 100:+.0f}%"
+        print(f" {stage:<28} {stats['calls']:>7} {stats['throughput']:>10.1f} {stats['p50_ms']:>9.3f} "
+              f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {change:>17}")
+        if 'accuracy' in stats:
+            print(f" {'':<28} nøjagtighed på syntetiske plader: {stats['accuracy']:.0%}")
+    print("=" * 92)
+
+
+def build_recognizer(config):
+    """Opret recognizer uden at røre den rigtige parked_cars.json og vent på OCR modellen"""
+    from license_plate_recognizer import LicensePlateRecognizer
+    os.chdir(tempfile.mkdtemp(prefix="anpr-bench-"))
+    recognizer = LicensePlateRecognizer(config)
+    recognizer.ocr_ready.wait()   # Sættes også hvis modellen ikke kunne indlæses
+    return recognizer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark af genkendelsens trin")
+    parser.add_argument('--iterations', type=int, default=5, help="Antal gennemløb af input")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline fil (JSON)")
+    parser.add_argument('--save-baseline', action='store_true', help="Gem målingen som ny baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Tilladt forværring før et trin markeres (0.25 = 25%%)")
+    parser.add_argument('--json', help="Skriv resultatet som JSON til denne fil")
+    parser.add_argument('--backends', nargs='*', default=['fp32', 'onnx'],
+                        help="OCR backends der sammenlignes med standard backenden (easyocr)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    recognizer = build_recognizer(BENCH_CONFIG)
+
+    try:
+        results = benchmark(recognizer, args.iterations)
+        with_ocr = ocr_available(recognizer)
+    finally:
+        recognizer.close()
+
+    if with_ocr and args.backends:
+        results.update(benchmark_backends(args.backends, args.iterations))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+    print_backend_comparison(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f" Baseline gemt i {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f" ADVARSEL: ingen baseline i {args.baseline} - regressioner markeres IKKE. "
+              f"Kør med --save-baseline på denne maskine for at gemme en")
+        return 0
+    missing = [stage for stage in results if stage not in baseline]
+    if missing:
+        print(f" ADVARSEL: ingen baseline for {', '.join(missing)} - de trin sammenlignes ikke")
+
+    regressions = compare(results, baseline, args.tolerance)
+    for stage, key, before, after in regressions:
+        print(f" REGRESSION: {stage} {key} {before:.3f} ms -> {after:.3f} ms")
+    if not regressions:
+        print(f" Ingen regressioner over {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# benchmarks/make_corpus.py
+"""
+Genskab det indtjekkede benchmark korpus i benchmarks/corpus.
+Korpusset skal normalt IKKE genskabes - en gemt baseline (bench_pipeline.py
+--save-baseline) gælder kun for det korpus den er målt på.
+
+Kør: python benchmarks/make_corpus.py
+"""
+import json
+import os
+import numpy as np
+import cv2
+from synthetic import random_plate_text, render_scene
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+# (antal frames, bredde, højde, plade højde, med plade)
+LAYOUT = [
+    (6, 640, 480, 40, True),
+    (4, 640, 480, 40, False),
+    (2, 1280, 720, 70, True),
+]
+
+
+def main():
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    rng = np.random.default_rng(2024)
+    labels = {}
+    seed = 0
+
+    for count, width, height, plate_height, with_plate in LAYOUT:
+        for _ in range(count):
+            text = random_plate_text(rng) if with_plate else None
+            frame = render_scene(seed, text, width, height, plate_height)
+            name = f"{'plate' if with_plate else 'empty'}_{width}x{height}_{seed:02d}.jpg"
+            cv2.imwrite(os.path.join(CORPUS_DIR, name), frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            labels[name] = text
+            seed += 1
+
+    with open(os.path.join(CORPUS_DIR, 'labels.json'), 'w') as f:
+        json.dump(labels, f, indent=2, sort_keys=True)
+    print(f"Skrev {len(labels)} frames til {CORPUS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# pc-side/src/batch_main.py
+"""
+Headless batch genkendelse af optagede billeder og videoer.
+
+Eksempel:
+    python batch_main.py /data/optagelser/2024-05-01 --output plader.jsonl --workers 8
+"""
+import argparse
+import contextlib
+import copy
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import cv2
+from main import load_config
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv'}
+
+CSV_FIELDS = ['type', 'file', 'frame', 'plate', 'x', 'y', 'w', 'h',
+              'detect_ms', 'ocr_ms', 'frames', 'plates', 'total_ms', 'error']
+
+# Hver worker proces har sin egen recognizer (og dermed sin egen OCR reader)
+_recognizer = None
+
+
+def batch_config(config):
+    """Tilpas konfigurationen til stillbilleder uden kamera, tråde eller bevægelse"""
+    config = copy.deepcopy(config)
+    license_plate = config.setdefault('license_plate', {})
+    license_plate['ocr_pool'] = {'workers': 0}
+    license_plate['ocr_loading'] = {'background': False}
+    license_plate.setdefault('batching', {})['enabled'] = False
+    license_plate.setdefault('motion', {})['enabled'] = False
+    # Et næsten ens crop fra en anden fil må ikke genbruge den fils tekst
+    license_plate.setdefault('ocr_cache', {})['enabled'] = False
+    license_plate.setdefault('tracking', {})['detect_every'] = 1
+    # Workers registrerer ingen ind-/udkørsler og må ikke åbne gate PC'ens database
+    config['parking_db'] = {'backend': 'memory'}
+    return config
+
+
+def _init_worker(config):
+    """Opret recognizer én gang pr. worker proces"""
+    global _recognizer
+    # Resultater går tilbage via puljen - stdout er forbeholdt JSONL/CSV output
+    sys.stdout = sys.stderr
+    from license_plate_recognizer import LicensePlateRecognizer
+    _recognizer = LicensePlateRecognizer(config)
+
+
+def find_inputs(paths):
+    """Find alle billed- og videofiler i de angivne filer/mapper"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    files.append(os.path.join(root, name))
+        else:
+            files.append(path)
+
+    extensions = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
+    return [f for f in files if os.path.splitext(f)[1].lower() in extensions]
+
+
+def recognize_frame(frame):
+    """Detekter, læs og valider nummerplade i ét frame - returnerer (boks, tekst, detect_ms, ocr_ms)"""
+    started = time.perf_counter()
+    boxes = _recognizer.detect_license_plate(frame)
+    detected = time.perf_counter()
+    box, text = _recognizer.read_ranked_candidates(frame, boxes)
+    done = time.perf_counter()
+    return box, text, (detected - started) * 1000, (done - detected) * 1000
+
+
+def plate_record(path, frame_index, box, text, detect_ms, ocr_ms):
+    x, y, w, h = box if box else (None, None, None, None)
+    return {'type': 'plate', 'file': path, 'frame': frame_index, 'plate': text,
+            'x': x, 'y': y, 'w': w, 'h': h,
+            'detect_ms': round(detect_ms, 2), 'ocr_ms': round(ocr_ms, 2)}
+
+
+def process_file(path, frame_step):
+    """Kør genkendelse på én fil - returnerer liste af records (plader + opsummering)"""
+    started = time.perf_counter()
+    records = []
+    frames = 0
+    error = None
+
+    try:
+        if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+            frame = cv2.imread(path)
+            if frame is None:
+                raise ValueError("kunne ikke læse billede")
+            frames = 1
+            box, text, detect_ms, ocr_ms = recognize_frame(frame)
+            if text:
+                records.append(plate_record(path, 0, box, text, detect_ms, ocr_ms))
+        else:
+            cap = cv2.VideoCapture(path)
+            if not cap.isOpened():
+                raise ValueError("kunne ikke åbne video")
+            frame_index = 0
+            last_plate = None
+            while True:
+                # grab() springer dekodning over for frames vi ikke skal bruge
+                if not cap.grab():
+                    break
+                if frame_index % frame_step == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    frames += 1
+                    box, text, detect_ms, ocr_ms = recognize_frame(frame)
+                    # Samme plade i træk skrives kun én gang
+                    if text and text != last_plate:
+                        records.append(plate_record(path, frame_index, box, text, detect_ms, ocr_ms))
+                    last_plate = text
+                frame_index += 1
+            cap.release()
+    except Exception as e:
+        error = str(e)
+
+    plates = sorted({r['plate'] for r in records})
+    records.append({'type': 'file', 'file': path, 'frames': frames, 'plates': ' '.join(plates),
+                    'total_ms': round((time.perf_counter() - started) * 1000, 2), 'error': error})
+    return records
+
+
+class ResultWriter:
+    """Skriver records løbende som JSONL eller CSV"""
+
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+        self.csv_writer = None
+        if output_format == 'csv':
+            self.csv_writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            self.csv_writer.writeheader()
+
+    def write(self, record):
+        if self.csv_writer:
+            self.csv_writer.writerow(record)
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch nummerpladegenkendelse")
+    parser.add_argument('inputs', nargs='+', help="Billed-/videofiler eller mapper")
+    parser.add_argument('--output', '-o', help="Resultatfil (.jsonl eller .csv) - standard er stdout")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Outputformat (standard: ud fra filendelse)")
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(), help="Antal worker processer")
+    parser.add_argument('--frame-step', type=int, default=5, help="Brug hvert N'te frame i videoer")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    output_format = args.format
+    if not output_format:
+        output_format = 'csv' if args.output and args.output.lower().endswith('.csv') else 'jsonl'
+
+    files = find_inputs(args.inputs)
+    if not files:
+        print(" Ingen billed- eller videofiler fundet", file=sys.stderr)
+        return 1
+
+    with contextlib.redirect_stdout(sys.stderr):
+        config = load_config()
+    print(f" Behandler {len(files)} filer med {args.workers} workers", file=sys.stderr)
+
+    stream = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    writer = ResultWriter(stream, output_format)
+    started = time.time()
+    plates_found = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(batch_config(config),)) as executor:
+            futures = {executor.submit(process_file, path, max(1, args.frame_step)): path
+                       for path in files}
+
+            # Resultater skrives efterhånden som filerne bliver færdige
+            for done, future in enumerate(as_completed(futures), 1):
+                for record in future.result():
+                    if record['type'] == 'plate':
+                        plates_found += 1
+                    writer.write(record)
+                print(f" [{done}/{len(files)}] {futures[future]}", file=sys.stderr)
+    finally:
+        if args.output:
+            stream.close()
+
+    print(f" Færdig: {len(files)} filer, {plates_found} plader på "
+          f"{time.time() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,116 @@
 # pc-side/src/database_handler.py
+import threading
+import time
+from contextlib import contextmanager
 import mysql.connector
+from mysql.connector import pooling
+from metrics import METRICS
 
 class DatabaseHandler:
     def __init__(self, config):
         self.config = config
-        self.connection = None
+        db_config = config.get('database', {})
+        self.pool_size = db_config.get('pool_size', 4)                     # Samtidige forbindelser (én pr. bane/tråd)
+        self.checkout_timeout = db_config.get('checkout_timeout', 2.0)     # Sekunder der ventes på en ledig forbindelse
+        self.reconnect_delay = db_config.get('reconnect_delay', 0.5)       # Første ventetid efter en fejl
+        self.reconnect_max_delay = db_config.get('reconnect_max_delay', 30.0)
+        
+        self.pool = None
+        self._pool_lock = threading.Lock()
+        self._retry_delay = self.reconnect_delay
+        self._retry_at = 0.0     # Ingen nye forsøg før dette tidspunkt (backoff)
         self.connect()
     
     def connect(self):
-        """Opret forbindelse til databasen"""
+        """Opret connection pool til databasen"""
         try:
             db_config = self.config.get('database', {})
-            self.connection = mysql.connector.connect(
+            self.pool = pooling.MySQLConnectionPool(
+                pool_name=db_config.get('pool_name', 'anpr'),
+                pool_size=self.pool_size,
                 host=db_config.get('host', 'localhost'),
                 port=db_config.get('port', 3306),
                 user=db_config.get('user', 'parking_user'),
                 password=db_config.get('password', 'parking_password123'),
                 database=db_config.get('database', 'parking_system')
             )
-            print(" Forbundet til database")
+            self._retry_delay = self.reconnect_delay
+            self._retry_at = 0.0
+            print(f" Forbundet til database ({self.pool_size} forbindelser)")
+            return True
         except Exception as e:
-            print(f" Database fejl: {e}")
+            self._connect_failed(e)
+            return False
+    
+    def _connect_failed(self, error):
+        """Vent længere og længere mellem forsøgene, uden at blokere kaldet der fejlede"""
+        self._retry_at = time.time() + self._retry_delay
+        print(f" Database fejl: {error} - prøver igen om {self._retry_delay:.1f}s")
+        self._retry_delay = min(self._retry_delay * 2, self.reconnect_max_delay)
+        METRICS.inc("db_connect_errors")
+    
+    def _get_connection(self):
+        """Lån en forbindelse fra poolen - poolen pinger den og genopretter den hvis MariaDB er genstartet"""
+        deadline = time.time() + self.checkout_timeout
+        while True:
+            with self._pool_lock:
+                if time.time() < self._retry_at:
+                    # Fejl straks i stedet for at vente på timeout mod en database der er nede
+                    raise ConnectionError("ingen forbindelse til databasen (venter på nyt forsøg)")
+                if self.pool is None and not self.connect():
+                    raise ConnectionError("kunne ikke forbinde til databasen")
+            try:
+                connection = self.pool.get_connection()
+                self._retry_delay = self.reconnect_delay
+                return connection
+            except mysql.connector.PoolError:
+                # Alle forbindelser er lånt ud - vent kort på at en bliver afleveret
+                if time.time() >= deadline:
+                    raise
+                time.sleep(0.01)
+            except mysql.connector.Error as e:
+                with self._pool_lock:
+                    self._connect_failed(e)
+                raise
     
+    @contextmanager
+    def checkout(self):
+        """Brug en forbindelse til ét kald og aflever den igen bagefter"""
+        connection = self._get_connection()
+        try:
+            yield connection
+        finally:
+            try:
+                connection.close()   # Pool forbindelse: reset_session og tilbage i poolen
+            except Exception as e:
+                # reset_session fejler på en død forbindelse. Poolen tager den alligevel
+                # tilbage og genopretter den ved næste udlån - kaldet må ikke fejle af den grund
+                print(f"   Database forbindelse kasseret: {e}")
+    
+    def _execute(self, query, params):
+        """Kør én skrivning med egen cursor - én gang til på en ny forbindelse hvis den blev tabt undervejs"""
+        for attempt in range(2):
+            with self.checkout() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(query, params)
+                    connection.commit()
+                    return
+                except (mysql.connector.OperationalError, mysql.connector.InterfaceError):
+                    if attempt:
+                        raise
+                    print("   Database forbindelse tabt - prøver igen")
+                    METRICS.inc("db_reconnects")
+                finally:
+                    cursor.close()
+    
+    @METRICS.timed("db_insert")
     def insert_license_plate(self, plate_number):
         """Indsæt nummerplade i databasen (simpel version)"""
         try:
-            cursor = self.connection.cursor()
-            
             # Indsæt direkte - lad database håndtere duplikater hvis vi har UNIQUE constraint
             query = "INSERT INTO license_plates (plate_number) VALUES (%s)"
-            cursor.execute(query, (plate_number,))
-            self.connection.commit()
-            cursor.close()
+            self._execute(query, (plate_number,))
             
             print(f"   Database: Nummerplade gemt: {plate_number}")
             return True
@@ -46,7 +125,9 @@ class DatabaseHandler:
             return False
     
     def close(self):
-        """Luk database forbindelsen"""
-        if self.connection:
-            self.connection.close()
-            print(" Database forbindelse lukket")
\ No newline at end of file
+        """Luk database forbindelserne"""
+        if self.pool is not None:
+            # Lukker de forbindelser der ligger i poolen (mysql.connector har ingen offentlig metode)
+            self.pool._remove_connections()
+            self.pool = None
+            print(" Database forbindelser lukket")
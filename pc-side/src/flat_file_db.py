@@ -2,52 +2,109 @@
 import json
 import os
 from datetime import datetime
+from metrics import METRICS
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+
+class DatabaseLockedError(RuntimeError):
+    """En anden proces skriver allerede til databasen"""
+
+
+def lock_file(path):
+    """
+    Tag en eksklusiv lås på path (oprettes hvis den mangler) - returnerer den åbne
+    fil, og låsen slippes når den lukkes (også hvis processen dør)
+    """
+    f = open(path, 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        raise DatabaseLockedError(f"{path} er låst - en anden proces bruger allerede databasen")
+    return f
+
+
+def write_snapshot(path, data, indent=None):
+    """Skriv JSON atomisk: temp fil + fsync + rename, så et nedbrud aldrig efterlader en halv fil"""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, 'O_DIRECTORY'):
+        # Selve omdøbningen skal også på disken
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
 
 class FlatFileDB:
     def __init__(self, db_file="parked_cars.json"):
         self.db_file = db_file
+        # Indeks: nummerplade -> {"entry_time", "lane"} (dict bevarer indkørselsrækkefølgen)
         self.parked_cars = self.load_data()
     
     def load_data(self):
-        """Indlæs data fra JSON fil"""
+        """Indlæs data fra JSON fil (både nyt format og den gamle liste af plader)"""
         try:
             if os.path.exists(self.db_file):
                 with open(self.db_file, 'r') as f:
                     data = json.load(f)
-                    print(f"Indlæst {len(data)} parkerede biler fra {self.db_file}")
-                    return data
+                if isinstance(data, list):
+                    # Gammelt format uden indkørselstid og bane
+                    data = {plate: {"entry_time": None, "lane": None} for plate in data}
+                print(f"Indlæst {len(data)} parkerede biler fra {self.db_file}")
+                return data
             else:
                 print(f"Ingen eksisterende database - starter med tom liste")
-                return []
+                return {}
         except Exception as e:
             print(f"Fejl ved indlæsning af data: {e}")
-            return []
+            return {}
     
+    @METRICS.timed("flatfile_save")
     def save_data(self):
         """Gem data til JSON fil"""
         try:
-            with open(self.db_file, 'w') as f:
-                json.dump(self.parked_cars, f, indent=2)
+            write_snapshot(self.db_file, self.parked_cars, indent=2)
         except Exception as e:
             print(f"Fejl ved gemning af data: {e}")
     
-    def car_entry(self, plate_number):
-        """Registrer indkørsel - tilføj bil til database"""
+    def persist(self, op, plate_number=None):
+        """Gem en ændring (entry/exit/clear) - her ved at skrive hele filen"""
+        self.save_data()
+    
+    def car_entry(self, plate_number, lane=None):
+        """Registrer indkørsel - tilføj bil til database med tidspunkt og bane"""
         if plate_number in self.parked_cars:
             print(f"Bil {plate_number} er allerede registreret")
             return False
         
-        self.parked_cars.append(plate_number)
-        self.save_data()
+        self.parked_cars[plate_number] = {
+            "entry_time": datetime.now().isoformat(timespec="seconds"),
+            "lane": lane,
+        }
+        self.persist("entry", plate_number)
         print(f"Bil {plate_number} tilføjet til database")
         print(f"Antal parkerede biler: {len(self.parked_cars)}")
         return True
     
     def car_exit(self, plate_number):
         """Registrer udkørsel - fjern bil fra database"""
-        if plate_number in self.parked_cars:
-            self.parked_cars.remove(plate_number)
-            self.save_data()
+        if self.parked_cars.pop(plate_number, None) is not None:
+            self.persist("exit", plate_number)
             print(f"Bil {plate_number} fjernet fra database")
             print(f"Antal parkerede biler: {len(self.parked_cars)}")
             return True
@@ -59,9 +116,14 @@ class FlatFileDB:
         """Tjek om en bil er registreret som parkeret"""
         return plate_number in self.parked_cars
     
+    def get_entry(self, plate_number):
+        """Hent indkørselstid og bane for en parkeret bil (None hvis den ikke er parkeret)"""
+        entry = self.parked_cars.get(plate_number)
+        return dict(entry) if entry is not None else None
+    
     def get_all_parked_cars(self):
         """Hent liste over alle parkerede biler"""
-        return self.parked_cars.copy()
+        return list(self.parked_cars)
     
     def get_count(self):
         """Hent antal parkerede biler"""
@@ -69,6 +131,20 @@ class FlatFileDB:
     
     def clear_all(self):
         """Ryd alle data (til debugging)"""
-        self.parked_cars = []
-        self.save_data()
-        print("Alle data ryddet")
\ No newline at end of file
+        self.parked_cars = {}
+        self.persist("clear")
+        print("Alle data ryddet")
+    
+    def close(self):
+        """Intet at lukke - filen skrives ved hver ændring"""
+        pass
+
+
+class MemoryFlatFileDB(FlatFileDB):
+    """FlatFileDB der kun lever i hukommelsen (batch kørsler må ikke røre den rigtige database)"""
+
+    def load_data(self):
+        return {}
+
+    def persist(self, op, plate_number=None):
+        pass
@@ -0,0 +1,112 @@
+# pc-side/src/frame_pipeline.py
+import threading
+import time
+from metrics import METRICS
+
+
+class LatestFrameSlot:
+    """Begrænset slot der kun holder det nyeste frame"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = None      # Frame der venter på genkendelse
+        self._latest = None       # Nyeste frame (til preview)
+        self._seq = 0
+        self._closed = False
+
+        # Statistik
+        self.captured = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        """Læg nyt frame i slottet - et ulæst frame bliver smidt væk"""
+        with self._cond:
+            self._seq += 1
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = (self._seq, frame)
+            self._latest = (self._seq, frame)
+            self.captured += 1
+            self._cond.notify()
+
+    def take(self, timeout=None):
+        """Hent nyeste ulæste frame til genkendelse (seq, frame) eller None"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending is not None or self._closed, timeout):
+                return None
+            item = self._pending
+            self._pending = None
+            return item
+
+    def peek(self):
+        """Hent nyeste frame uden at forbruge det (til preview)"""
+        with self._cond:
+            return self._latest
+
+    def close(self):
+        """Væk alle ventende tråde så de kan afslutte"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class CaptureThread(threading.Thread):
+    """Læser frames fra kameraet så hurtigt som muligt og holder kun det nyeste"""
+
+    def __init__(self, cap, slot):
+        super().__init__(daemon=True, name="capture")
+        self.cap = cap
+        self.slot = slot
+        self.fps = 0.0
+
+    def run(self):
+        frames = 0
+        window_start = time.time()
+
+        while not self.slot.closed:
+            with METRICS.time("capture_wait"):
+                ret, frame = self.cap.read()
+            if not ret:
+                print(" Kamera leverer ikke flere frames")
+                break
+
+            self.slot.put(frame)
+
+            # Mål kamera FPS over et vindue på ca. 1 sekund
+            frames += 1
+            elapsed = time.time() - window_start
+            if elapsed >= 1.0:
+                self.fps = frames / elapsed
+                frames = 0
+                window_start = time.time()
+
+        self.slot.close()
+
+
+class RecognitionWorker(threading.Thread):
+    """Henter det nyeste frame fra slottet og kører genkendelse på det"""
+
+    def __init__(self, slot, handle_frame, name="recognition"):
+        super().__init__(daemon=True, name=name)
+        self.slot = slot
+        self.handle_frame = handle_frame
+        self.processed = 0
+
+    def run(self):
+        while True:
+            item = self.slot.take(timeout=0.5)
+            if item is None:
+                if self.slot.closed:
+                    break
+                continue
+
+            seq, frame = item
+            try:
+                self.handle_frame(seq, frame)
+            except Exception as e:
+                print(f" Genkendelsesfejl: {e}")
+            self.processed += 1
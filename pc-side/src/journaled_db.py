@@ -0,0 +1,208 @@
+# pc-side/src/journaled_db.py
+import json
+import os
+import threading
+import time
+from flat_file_db import FlatFileDB, lock_file, write_snapshot
+from metrics import METRICS
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+class JournaledFlatFileDB(FlatFileDB):
+    """
+    FlatFileDB hvor hver ændring tilføjes som én JSON linje i en append-only log
+    (<fil>.log) i stedet for at omskrive hele filen. En baggrundstråd skriver
+    med mellemrum et snapshot atomisk (temp fil + rename) og starter en ny log.
+    Opstart = indlæs snapshot + afspil loggen. Kun én proces kan have
+    databasen åben (<fil>.lock) - en anden får DatabaseLockedError.
+    """
+
+    def __init__(self, db_file="parked_cars.json", config=None):
+        config = config or {}
+        self.journal_file = config.get('journal_file', db_file + ".log")
+        self.fsync = config.get('fsync', 'interval')            # always, interval eller never
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Ukendt fsync politik: {self.fsync} (vælg mellem {', '.join(FSYNC_POLICIES)})")
+        self.fsync_interval = config.get('fsync_interval', 1.0)     # Sekunder mellem fsync (interval)
+        self.compact_records = config.get('compact_records', 1000)  # Poster i loggen før komprimering
+        self.compact_interval = config.get('compact_interval', 300) # Sekunder før komprimering alligevel
+
+        # Før loggen læses: to skrivere ville overskrive hinandens snapshot og log
+        self._lock_file = lock_file(db_file + ".lock")
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()   # Kun én komprimering ad gangen (.old deles)
+        self._journal_records = 0
+        self._dirty = False            # Skrevet til loggen men ikke fsync'et
+        super().__init__(db_file)
+
+        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        self._last_fsync = time.time()
+        self._last_compact = time.time()
+
+        # Statistik
+        self.compactions = 0
+
+        self._stop = threading.Event()
+        self._compact_requested = threading.Event()
+        self._compactor = threading.Thread(target=self._background, daemon=True, name="flatfile-compactor")
+        self._compactor.start()
+
+    def load_data(self):
+        """Indlæs snapshot og afspil log(s) ovenpå"""
+        data = super().load_data()
+        # En log fra en afbrudt komprimering (.old) afspilles før den aktuelle.
+        # Afspilning er idempotent, så det gør ikke noget hvis snapshottet allerede har den
+        for path in (self.journal_file + ".old", self.journal_file):
+            replayed = self._replay(path, data)
+            self._journal_records += replayed
+            if replayed:
+                print(f"Afspillet {replayed} ændringer fra {path}")
+        return data
+
+    def _replay(self, path, data):
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        good = 0   # Bytes til og med sidste hele post
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("mangler linjeskift")
+                    record = json.loads(line)
+                except ValueError:
+                    # Halv linje fra et nedbrud midt i en skrivning - resten af loggen er ubrugelig
+                    print(f"Ufuldstændig post i {path} ignoreret")
+                    break
+                apply_record(data, record)
+                count += 1
+                good += len(line)
+            torn = f.seek(0, os.SEEK_END) > good
+        if torn:
+            # Skær den halve linje væk, ellers limes næste post på den og går tabt ved næste opstart
+            with open(path, 'r+b') as f:
+                f.truncate(good)
+        return count
+
+    # Ændring og logpost sker under samme lås, så komprimeringen ser en konsistent tilstand
+    def car_entry(self, plate_number, lane=None):
+        with self._lock:
+            return super().car_entry(plate_number, lane)
+
+    def car_exit(self, plate_number):
+        with self._lock:
+            return super().car_exit(plate_number)
+
+    def clear_all(self):
+        with self._lock:
+            super().clear_all()
+
+    @METRICS.timed("flatfile_journal")
+    def persist(self, op, plate_number=None):
+        """Tilføj ændringen som én linje i loggen"""
+        record = {"op": op}
+        if plate_number is not None:
+            record["plate"] = plate_number
+        if op == "entry":
+            record.update(self.parked_cars[plate_number])
+
+        with self._lock:
+            try:
+                self._journal.write(json.dumps(record) + "\n")
+                self._journal.flush()   # Overlever et proces nedbrud - fsync styrer strømsvigt
+                self._dirty = True
+                if self.fsync == 'always':
+                    self._sync()
+            except Exception as e:
+                print(f"Fejl ved skrivning til log: {e}")
+            self._journal_records += 1
+            if self._journal_records >= self.compact_records:
+                self._compact_requested.set()
+
+    def _sync(self):
+        os.fsync(self._journal.fileno())
+        self._dirty = False
+        self._last_fsync = time.time()
+
+    def _background(self):
+        """fsync efter interval og komprimering når loggen er lang nok eller gammel nok"""
+        wait = self.compact_interval
+        if self.fsync == 'interval':
+            wait = min(wait, self.fsync_interval)
+        while not self._stop.is_set():
+            requested = self._compact_requested.wait(timeout=max(0.05, wait))
+            if self._stop.is_set():
+                break
+            with self._lock:
+                if (self._dirty and self.fsync == 'interval'
+                        and time.time() - self._last_fsync >= self.fsync_interval):
+                    self._sync()
+                due = self._journal_records and time.time() - self._last_compact >= self.compact_interval
+            if requested or due:
+                self.compact()
+
+    @METRICS.timed("flatfile_compact")
+    def compact(self):
+        """Skriv snapshot atomisk og start en ny log - ændringer blokeres kun mens loggen skiftes"""
+        with self._compact_lock:
+            with self._lock:
+                self._compact_requested.clear()
+                self._last_compact = time.time()
+                if not self._journal_records:
+                    return
+                # Værdierne ændres aldrig efter indsættelse, så en overfladisk kopi er nok
+                snapshot = dict(self.parked_cars)
+                self._sync()
+                self._journal.close()
+                self._rotate_journal(self.journal_file + ".old")
+                self._journal = open(self.journal_file, 'a', encoding='utf-8')
+                self._journal_records = 0
+
+            try:
+                write_snapshot(self.db_file, snapshot)
+                os.remove(self.journal_file + ".old")
+                self.compactions += 1
+            except Exception as e:
+                # .old afspilles ved næste opstart, så intet går tabt
+                print(f"Fejl ved komprimering af {self.db_file}: {e}")
+
+    def _rotate_journal(self, old_path):
+        """Flyt den aktuelle log til .old (efter en fejlet komprimering tilføjes den bagerst)"""
+        if not os.path.exists(old_path):
+            os.replace(self.journal_file, old_path)
+            return
+        with open(old_path, 'a', encoding='utf-8') as old, open(self.journal_file, 'r', encoding='utf-8') as new:
+            old.write(new.read())
+            old.flush()
+            os.fsync(old.fileno())
+        os.remove(self.journal_file)
+
+    def save_data(self):
+        """Gem hele databasen med det samme (snapshot + ny log)"""
+        with self._lock:
+            self._journal_records = max(self._journal_records, 1)
+        self.compact()
+
+    def close(self):
+        """Stop baggrundstråden og komprimer, så næste opstart kun skal læse snapshottet"""
+        if self._journal.closed:
+            return
+        self._stop.set()
+        self._compact_requested.set()
+        self._compactor.join(timeout=5)
+        self.compact()
+        with self._lock:
+            self._journal.close()
+        self._lock_file.close()
+
+
+def apply_record(data, record):
+    """Anvend én logpost på data (plade -> {"entry_time", "lane"})"""
+    op = record.get("op")
+    if op == "entry":
+        data[record["plate"]] = {"entry_time": record.get("entry_time"), "lane": record.get("lane")}
+    elif op == "exit":
+        data.pop(record["plate"], None)
+    elif op == "clear":
+        data.clear()
@@ -0,0 +1,172 @@
+# pc-side/src/lane_manager.py
+import copy
+import re
+import threading
+import time
+import cv2
+from license_plate_recognizer import LicensePlateRecognizer
+from parking_state import ParkingState
+from metrics import METRICS
+
+ROLES = ("entry", "exit")
+
+
+def lane_config(config, camera, index):
+    """
+    Konfiguration for én bane: camera sektionen fra config.yaml med kameraets
+    egne værdier ovenpå. Rollen er fast, og banen kører uden eget vindue
+    """
+    role = camera.get('role', 'entry')
+    if role not in ROLES:
+        raise ValueError(f"Ukendt rolle for kamera {index}: {role} (vælg entry eller exit)")
+
+    config = copy.deepcopy(config)
+    lane_camera = dict(config.get('camera', {}))
+    lane_camera.update(camera)
+    lane_camera.setdefault('name', f"{role}-{index + 1}")
+    lane_camera['mode'] = role
+    lane_camera['headless'] = True   # Preview vises samlet af LaneManager
+    config['camera'] = lane_camera
+    return config
+
+
+class LaneManager:
+    """
+    Flere kameraer (baner) i én proces. Hver bane optages og genkendes i sin egen tråd,
+    mens OCR backend, DB/MQTT forbindelser og parkeringsdata deles mellem dem
+    """
+
+    def __init__(self, config, recognizer_factory=LicensePlateRecognizer):
+        cameras = config.get('cameras') or []
+        if not cameras:
+            raise ValueError("Ingen kameraer i config (cameras:)")
+
+        self.headless = config.get('camera', {}).get('headless', False)
+        self.report_interval = config.get('camera', {}).get('lane_report_interval', 60)
+        self.parking = ParkingState(config.get('parking_db', {}))
+
+        # Første bane indlæser OCR modellen - de andre låner den
+        self.lanes = []
+        for index, camera in enumerate(cameras):
+            owner = self.lanes[0] if self.lanes else None
+            self.lanes.append(recognizer_factory(lane_config(config, camera, index),
+                                                 parking=self.parking, ocr_source=owner))
+
+        names = [lane.lane_name for lane in self.lanes]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Kameranavne skal være unikke: {', '.join(names)}")
+
+        self._threads = []
+        self._started = None
+        self._last_report = None
+        self._reported = {}   # bane -> (tid, frames, plader) ved sidste rapport
+
+    @property
+    def ocr_ready(self):
+        return self.lanes[0].ocr_ready
+
+    @property
+    def available_spots(self):
+        return self.parking.available_spots
+
+    def start(self, db_handler, mqtt_publisher):
+        """Start én tråd pr. bane (run_real_time eller pipeline pr. kamera)"""
+        self._started = self._last_report = time.time()
+        for lane in self.lanes:
+            self._reported[lane.lane_name] = (self._started, 0, 0)
+            thread = threading.Thread(target=self._run_lane, args=(lane, db_handler, mqtt_publisher),
+                                      daemon=True, name=f"lane-{lane.lane_name}")
+            self._threads.append(thread)
+            print(f" Bane {lane.lane_name}: kamera {lane.camera_source}, {lane.mode.upper()}")
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _run_lane(self, lane, db_handler, mqtt_publisher):
+        try:
+            lane.run_real_time(db_handler, mqtt_publisher)
+        except Exception as e:
+            print(f" Fejl i bane {lane.lane_name}: {e}")
+        print(f" Bane {lane.lane_name} stoppet")
+
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def run_real_time(self, db_handler, mqtt_publisher):
+        """Kør alle baner indtil Q (preview), Ctrl+C eller alle kameraer er stoppet"""
+        self.start(db_handler, mqtt_publisher)
+        try:
+            while self.running():
+                if self.headless:
+                    time.sleep(0.5)
+                elif not self.show_previews():
+                    break
+                if self.report_interval and time.time() - self._last_report >= self.report_interval:
+                    print(self.report())
+        finally:
+            self.stop()
+            print(self.report(final=True))
+
+    def show_previews(self):
+        """Ét preview vindue pr. bane - returnerer False ved afslut"""
+        for lane in self.lanes:
+            frame = lane.latest_frame
+            if frame is not None:
+                cv2.imshow(f"Parkeringssystem - {lane.lane_name}", lane.add_overlay(frame))
+
+        key = cv2.waitKey(30) & 0xFF
+        # Banernes roller er faste - I/U skifter ikke mode her
+        if key in (ord('i'), ord('I'), ord('u'), ord('U')):
+            return True
+        return self.lanes[0].handle_key(key)
+
+    def throughput(self):
+        """
+        Gennemløb pr. bane siden sidste kald som {bane: (frames/s, plader)}
+        og opdaterede tællere pr. bane i metrics (anpr_lane_<bane>_frames_total)
+        """
+        now = time.time()
+        result = {}
+        for lane in self.lanes:
+            since, frames, plates = self._reported.get(lane.lane_name, (self._started or now, 0, 0))
+            new_frames = lane.frames_processed - frames
+            new_plates = lane.plates_handled - plates
+            elapsed = max(now - since, 1e-6)
+            result[lane.lane_name] = (new_frames / elapsed, new_plates)
+
+            metric_name = re.sub(r"[^a-zA-Z0-9_]", "_", lane.lane_name)
+            METRICS.inc(f"lane_{metric_name}_frames", new_frames)
+            METRICS.inc(f"lane_{metric_name}_plates", new_plates)
+            self._reported[lane.lane_name] = (now, lane.frames_processed, lane.plates_handled)
+        self._last_report = now
+        return result
+
+    def report(self, final=False):
+        """Gennemløb pr. bane til loggen"""
+        lines = ["[LANES] " + ("i alt" if final else "siden sidste rapport") + ": frames/s, plader"]
+        if final:
+            elapsed = max(time.time() - (self._started or time.time()), 1e-6)
+            for lane in self.lanes:
+                lines.append(f"        {lane.lane_name} ({lane.mode}): "
+                             f"{lane.frames_processed / elapsed:.1f} frames/s, {lane.plates_handled} plader")
+        else:
+            for name, (fps, plates) in self.throughput().items():
+                lines.append(f"        {name}: {fps:.1f} frames/s, {plates} plader")
+        lines.append(f"        Ledige pladser: {self.parking.available_spots}, "
+                     f"parkeret: {self.parking.db.get_count()}")
+        return "\n".join(lines)
+
+    def stop(self):
+        """Stop alle baner og vent på deres tråde"""
+        for lane in self.lanes:
+            lane.stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        if not self.headless:
+            cv2.destroyAllWindows()
+
+    def close(self):
+        """Frigiv den fælles OCR backend (ejes af første bane) og parkeringsdatabasen"""
+        for lane in self.lanes:
+            lane.close()
+        self.parking.close()
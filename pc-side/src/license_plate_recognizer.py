@@ -1,41 +1,284 @@
 # pc-side/src/license_plate_recognizer.py
 import cv2
-import easyocr
 import re
+import threading
 import time
+import functools
 import numpy as np
-from flat_file_db import FlatFileDB
+from collections import deque
+from parking_state import ParkingState
+from frame_pipeline import LatestFrameSlot, CaptureThread, RecognitionWorker
+from motion_detector import MotionDetector
+from ocr_cache import OCRCache
+from ocr_pool import OCRWorkerPool
+from ocr_backends import create_reader, recognize_rois
+from plate_decoder import decode_rois
+from template_ocr import TemplateOCR
+from ocr_batcher import OCRBatcher
+from plate_tracker import PlateTracker, box_iou
+from plate_voter import PlateVoter
+from contour_filter import filter_candidates
+from metrics import METRICS
+
+# Detektorens arealtærskel er kalibreret til denne opløsning
+REFERENCE_SIZE = (640, 480)
+REFERENCE_MIN_AREA = 2500
+
 
 class LicensePlateRecognizer:
-    def __init__(self, config):
+    def __init__(self, config, parking=None, ocr_source=None):
+        """
+        parking og ocr_source bruges når flere baner kører i samme proces: parkeringsdata
+        deles, og OCR backenden (model/pulje, batcher, cache) lånes fra første bane
+        """
         self.config = config
-        self.reader = easyocr.Reader(['en'], verbose=False)
+        self.started_at = time.perf_counter()
+        self.ocr_source = ocr_source
+        
+        # OCR kører enten i en pulje af worker processer eller direkte her.
+        # Modellen kan indlæses i baggrunden, så kamera, DB og MQTT starter med det samme
+        loading_config = config.get('license_plate', {}).get('ocr_loading', {})
+        self.ocr_pool = None
+        self.reader = None
+        self.ocr_ready = threading.Event()
+        self.startup_timings = {}
+        self._startup_frames = deque(maxlen=max(1, loading_config.get('queue_size', 8)))
+        self._startup_lock = threading.Lock()
+        
+        # Crops er allerede lokaliseret - læs dem uden EasyOCR's egen tekstdetektion.
+        # Uden detektor netværket (recognizer.detector: false) er det den eneste mulighed
+        recognizer_config = config.get('license_plate', {}).get('recognizer', {})
+        self.recognition_only = (config.get('license_plate', {}).get('recognition_only', False)
+                                 or not recognizer_config.get('detector', True))
+        
+        # Formatbevidst afkodning af modellens tegn-sandsynligheder (kører også uden CRAFT)
+        decoding_config = config.get('license_plate', {}).get('constrained_decoding', {})
+        self.decoder_config = None
+        if decoding_config.get('enabled', False):
+            self.decoder_config = {'min_confidence': decoding_config.get('min_confidence', 0.3)}
+            self.recognition_only = True
+        if ocr_source is not None:
+            self.ocr_ready = ocr_source.ocr_ready
+        elif loading_config.get('background', False):
+            threading.Thread(target=self.load_ocr_background, daemon=True, name="ocr-loader").start()
+        else:
+            self.load_ocr()
+        
+        # Batching af crops fra flere frames/kandidater i ét OCR kald (på tværs af baner)
+        batch_config = config.get('license_plate', {}).get('batching', {})
+        self.batch_width = batch_config.get('width', 320)
+        self.batch_height = batch_config.get('height', 80)
+        self.ocr_batcher = None
+        if ocr_source is not None:
+            self.ocr_batcher = ocr_source.ocr_batcher
+        elif batch_config.get('enabled', False):
+            self.ocr_batcher = OCRBatcher(self.read_batch_raw, batch_config)
         
         # Kamera opsætning
         self.camera_source = config.get('camera', {}).get('source', 0)
         self.camera_width = config.get('camera', {}).get('width', 640)
         self.camera_height = config.get('camera', {}).get('height', 480)
+        self.lane_name = config.get('camera', {}).get('name', 'camera')
+        
+        # Pipeline opsætning (capture/genkendelse/preview i hver sin tråd)
+        self.pipelined = config.get('camera', {}).get('pipelined', False)
+        self.recognition_workers = config.get('camera', {}).get('recognition_workers', 1)
+        self.preview_fps = config.get('camera', {}).get('preview_fps', 30)
+        
+        # Headless (ingen vindue/tastatur) til gate PC'er uden skærm
+        self.headless = config.get('camera', {}).get('headless', False)
+        self._overlay_buffer = None
+        self._last_preview = 0.0
+        
+        # Detektion på nedskaleret billede (evt. flere niveauer), OCR i fuld opløsning
+        self.detection_width = config.get('license_plate', {}).get('detection_width')
+        self.detection_pyramid = config.get('license_plate', {}).get('detection_pyramid', [1.0])
+        
+        # Antal rangerede kandidater og tidsbudget for OCR pr. frame
+        self.top_k = config.get('license_plate', {}).get('top_k', 1)
+        self.ocr_budget = config.get('license_plate', {}).get('ocr_budget_ms', 150) / 1000.0
+        
+        # Bevægelsesdetektor foran detektion/OCR
+        motion_config = config.get('license_plate', {}).get('motion', {})
+        self.motion_detector = None
+        if motion_config.get('enabled', False):
+            self.motion_detector = MotionDetector(motion_config)
+        
+        # Hurtig template matching foran EasyOCR til rene, velbelyste plader (slået fra som standard:
+        # skabelonerne er Hershey font og ikke afprøvet på rigtige danske plader)
+        template_config = config.get('license_plate', {}).get('template_ocr', {})
+        self.template_ocr = None
+        if ocr_source is not None:
+            self.template_ocr = ocr_source.template_ocr
+        elif template_config.get('enabled', False):
+            self.template_ocr = TemplateOCR(template_config)
+        
+        # Cache af OCR resultater for næsten ens nummerplade crops
+        cache_config = config.get('license_plate', {}).get('ocr_cache', {})
+        self.ocr_cache = None
+        if ocr_source is not None:
+            self.ocr_cache = ocr_source.ocr_cache
+        elif cache_config.get('enabled', False):
+            self.ocr_cache = OCRCache(cache_config)
         
         # System state
-        self.mode = "entry"  # "entry" eller "exit"
-        self.available_spots = 50
+        self.mode = config.get('camera', {}).get('mode', "entry")  # "entry" eller "exit"
         
-        # Flat file database
-        self.db = FlatFileDB("parked_cars.json")
+        # Flat file database og ledige pladser (fælles for alle baner)
+        self._owns_parking = parking is None
+        self.parking = parking or ParkingState(config.get('parking_db', {}))
         
-        # Tracking
-        self.stable_plate = ""
-        self.stable_start = 0
+        # Tracking af nummerplader mellem frames og afstemning over læsninger pr. track
+        self.tracker = PlateTracker(config.get('license_plate', {}).get('tracking', {}))
+        # Stemmevægtens skala følger kildernes egne acceptgrænser, medmindre den er sat i voting.calibration
+        voting_config = dict(config.get('license_plate', {}).get('voting', {}))
+        voting_config['calibration'] = {
+            'template': (template_config.get('min_confidence', 0.6), 1.0),
+            'decoder': (decoding_config.get('min_confidence', 0.3), 1.0),
+            **voting_config.get('calibration', {}),
+        }
+        self.voter = PlateVoter(voting_config)
         self.last_logged = ""
+        
+        # Beskytter tracking state og parkeringsdata når der køres med tråde (delt mellem baner)
+        self._state_lock = self.parking.lock
+        self._last_applied_seq = 0
+        self.stale_results = 0
+        
+        # Gennemløb pr. bane og stop signal når banen kører i sin egen tråd
+        self.frames_processed = 0
+        self.plates_handled = 0
+        self.latest_frame = None
+        self.stop_event = threading.Event()
+    
+    @property
+    def db(self):
+        return self.parking.db
+    
+    @property
+    def available_spots(self):
+        return self.parking.available_spots
     
+    @available_spots.setter
+    def available_spots(self, value):
+        self.parking.available_spots = value
+    
+    def load_ocr(self):
+        """Indlæs OCR model med den valgte backend (EasyOCR/torch importeres først her)"""
+        started = time.perf_counter()
+        pool_config = self.config.get('license_plate', {}).get('ocr_pool', {})
+        recognizer_config = self.config.get('license_plate', {}).get('recognizer', {})
+        if pool_config.get('workers', 0) > 0:
+            ocr_pool = OCRWorkerPool(pool_config, functools.partial(create_reader, recognizer_config),
+                                     recognition_only=self.recognition_only,
+                                     decoder_config=self.decoder_config)
+            ocr_pool.warm_up()
+            self.ocr_pool = ocr_pool
+            if not self.pipelined or self.recognition_workers < ocr_pool.workers:
+                # Hver genkendelsestråd venter på sit eget OCR kald
+                print(f" OCR pulje: {ocr_pool.workers} workers, men kun "
+                      f"{self.recognition_workers if self.pipelined else 1} genkendelsestråd(e) - "
+                      f"sæt camera.pipelined og recognition_workers for at bruge dem alle")
+        else:
+            self.reader = create_reader(recognizer_config)
+        
+        self.startup_timings['ocr_load'] = time.perf_counter() - started
+        self.startup_timings['ocr_ready'] = time.perf_counter() - self.started_at
+        METRICS.observe("startup_ocr_load", self.startup_timings['ocr_load'])
+        self.ocr_ready.set()
+    
+    def load_ocr_background(self):
+        """Baggrundstråd: indlæs OCR model og rapporter hvor lang tid det tog"""
+        print(" Indlæser OCR model i baggrunden...")
+        try:
+            self.load_ocr()
+        except Exception as e:
+            # Systemet kører videre uden OCR i stedet for at vente for evigt
+            print(f" Kunne ikke indlæse OCR model: {e}")
+            self.ocr_ready.set()
+            return
+        timings = self.startup_timings
+        print(f" OCR model klar efter {timings['ocr_ready']:.1f}s "
+              f"(indlæsning {timings['ocr_load']:.1f}s, {len(self._startup_frames)} frames i kø)")
+    
+    def note_first_frame(self):
+        """Rapporter hvor lang tid der gik fra opstart til første frame"""
+        self.startup_timings['first_frame'] = time.perf_counter() - self.started_at
+        state = "klar" if self.ocr_ready.is_set() else "indlæses stadig"
+        print(f" Første frame efter {self.startup_timings['first_frame']:.1f}s (OCR model {state})")
+    
+    def queue_startup_frame(self, frame):
+        """Gem frame med bevægelse mens OCR modellen indlæses (kun de nyeste gemmes)"""
+        with self._startup_lock:
+            # Kopi - frame kan blive tegnet på af preview bagefter
+            self._startup_frames.append((time.time(), frame.copy()))
+        METRICS.inc("startup_frames_queued")
+    
+    def take_startup_frames(self):
+        """Hent (og tøm) frames gemt under opstart når OCR modellen er klar"""
+        if not self.ocr_ready.is_set() or not self._startup_frames:
+            return []
+        with self._startup_lock:
+            frames = list(self._startup_frames)
+            self._startup_frames.clear()
+        return frames
+    
+    def replay_startup_frames(self, frames):
+        """Kør genkendelse på frames fra opstarten med deres egne tidsstempler"""
+        found = None
+        for captured_at, frame in frames:
+            plate = self.update_tracking(self.recognize_plates(frame), captured_at)
+            found = plate or found
+        return found
+    
+    @METRICS.timed("validate")
     def validate_plate_text(self, text):
         """Valider dansk nummerplade format"""
         text = text.replace(" ", "").upper()
         return bool(re.match(r"^[A-Z]{2}\d{5}$", text))
     
+    @METRICS.timed("detect")
     def detect_license_plate(self, frame):
         """Detekter største rektangulære område"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        frame_h, frame_w = frame.shape[:2]
+        base_scale = self.detection_base_scale(frame_w)
+        
+        # Arealtærsklen er kalibreret til 640x480 og skaleres med detektionsopløsningen
+        min_area = (REFERENCE_MIN_AREA * (frame_w * base_scale) * (frame_h * base_scale)
+                    / float(REFERENCE_SIZE[0] * REFERENCE_SIZE[1]))
+        
+        candidates = []
+        for factor in self.detection_pyramid:
+            # Finere niveauer bruger samme tærskel i pixels og fanger dermed mindre (fjerne) plader
+            scale = min(1.0, base_scale * factor)
+            candidates.extend(self.detect_candidates(frame, scale, min_area))
+        
+        if not candidates:
+            return []
+        
+        candidates.sort(reverse=True, key=lambda c: c[0])
+        if len(self.detection_pyramid) > 1:
+            candidates = self.suppress_overlapping(candidates)
+        
+        return [(x, y, w, h) for _, x, y, w, h in candidates[:self.top_k]]
+    
+    def detection_base_scale(self, frame_width):
+        """Skala for detektion så billedet højst er detection_width bredt"""
+        if not self.detection_width or frame_width <= self.detection_width:
+            return 1.0
+        return self.detection_width / float(frame_width)
+    
+    def detect_candidates(self, frame, scale, min_area):
+        """
+        Find kandidater på et nedskaleret billede og returner dem som
+        (score, x, y, w, h) i fuld opløsning så OCR får et skarpt crop
+        """
+        if scale < 1.0:
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
+        
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
         blurred = cv2.GaussianBlur(gray, (5,5), 0)
         edges = cv2.Canny(blurred, 50, 150)
         
@@ -44,32 +287,139 @@ class LicensePlateRecognizer:
         
         contours, _ = cv2.findContours(edges_closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        candidates = []
+        # Areal, aspect ratio og afstand filtreres og scores - samlet i NumPy fra
+        # VECTORIZE_MIN_CONTOURS konturer, under det er en løkke hurtigst
         h, w = gray.shape
-        cx, cy = w/2, h/2
-        
-        for cnt in contours:
-            area = cv2.contourArea(cnt)
-            if area < 2500:
-                continue
-            x, y, ww, hh = cv2.boundingRect(cnt)
-            ratio = ww / float(hh)
-            if 2 < ratio < 6:
-                dist = np.sqrt((x + ww/2 - cx)**2 + (y + hh/2 - cy)**2)
-                score = area - 0.3 * dist
-                candidates.append((score, x, y, ww, hh))
+        scored = filter_candidates(contours, min_area, w, h, scale)
+        if scale == 1.0:
+            return scored
         
-        if not candidates:
-            return []
+        # Map boksene tilbage til fuld opløsning
+        frame_h, frame_w = frame.shape[:2]
+        candidates = []
+        for score, x, y, ww, hh in scored:
+            x0, y0 = int(round(x / scale)), int(round(y / scale))
+            x1 = min(frame_w, int(round((x + ww) / scale)))
+            y1 = min(frame_h, int(round((y + hh) / scale)))
+            candidates.append((score, x0, y0, x1 - x0, y1 - y0))
         
-        candidates.sort(reverse=True, key=lambda c: c[0])
-        _, x, y, w, h = candidates[0]
-        return [(x, y, w, h)]
+        return candidates
+    
+    def suppress_overlapping(self, candidates, iou_threshold=0.5):
+        """Fjern kandidater der overlapper en bedre kandidat (fra et andet pyramideniveau)"""
+        kept = []
+        for candidate in candidates:
+            if all(box_iou(candidate[1:], other[1:]) < iou_threshold for other in kept):
+                kept.append(candidate)
+        return kept
     
     def read_plate_easyocr(self, plate_img):
         """Læs nummerplade med EasyOCR"""
-        result = self.reader.readtext(plate_img, detail=0, paragraph=False)
+        return self.read_plates_easyocr([plate_img])[0]
+    
+    def read_plates_easyocr(self, plate_imgs):
+        """Læs flere nummerplader på én gang - kun teksterne"""
+        return [text for text, _ in self.read_plates_scored(plate_imgs)]
+    
+    def read_plates_scored(self, plate_imgs):
+        """
+        Læs flere nummerplader på én gang (cache, template matching, batching eller OCR pulje)
+        som liste af (tekst, stemmevægt) - se PlateVoter.weight. Et cachetræf er ikke en
+        ny læsning, men samme læsning igen, så det får vægt 0 og stemmer ikke
+        """
+        scored = [None] * len(plate_imgs)
+        cache_keys = [None] * len(plate_imgs)
         
+        if self.ocr_cache is not None:
+            for i, plate_img in enumerate(plate_imgs):
+                cache_keys[i] = self.ocr_cache.key(plate_img)
+                cached = self.ocr_cache.get(cache_keys[i])
+                if cached is not None:
+                    scored[i] = (cached[0], 0.0)
+        
+        missing = [i for i, result in enumerate(scored) if result is None]
+        METRICS.inc("ocr_crops", len(plate_imgs))
+        if self.ocr_cache is not None:
+            METRICS.inc("ocr_cache_hits", len(plate_imgs) - len(missing))
+        if missing and self.template_ocr is not None:
+            missing = self.read_plates_template(plate_imgs, scored, cache_keys, missing)
+        if missing:
+            results = self.ocr_raw([plate_imgs[i] for i in missing])
+            
+            for i, result in zip(missing, results):
+                scored[i] = self.score_ocr_result(result)
+                if self.ocr_cache is not None:
+                    self.ocr_cache.put(cache_keys[i], scored[i])
+        
+        return scored
+    
+    @METRICS.timed("template_ocr")
+    def read_plates_template(self, plate_imgs, scored, cache_keys, missing):
+        """
+        Læs med template matching og udfyld scored - returnerer de indeks
+        der stadig mangler (for usikre eller ugyldige) og skal til EasyOCR
+        """
+        remaining = []
+        for i in missing:
+            text, confidence = self.template_ocr.read(plate_imgs[i])
+            if confidence >= self.template_ocr.min_confidence and self.validate_plate_text(text):
+                scored[i] = (text, self.voter.weight('template', confidence))
+                if self.ocr_cache is not None:
+                    self.ocr_cache.put(cache_keys[i], scored[i])
+            else:
+                remaining.append(i)
+        
+        METRICS.inc("template_ocr_accepted", len(missing) - len(remaining))
+        return remaining
+    
+    @METRICS.timed("ocr")
+    def ocr_raw(self, rois):
+        """Kør OCR på ROIs og returner rå EasyOCR resultater"""
+        # Direkte kald (fx benchmark) venter på at modellen er indlæst
+        self.ocr_ready.wait()
+        if self.ocr_batcher is not None:
+            # Alle ROIs lægges i kø før der ventes, så de kan komme i samme batch
+            futures = [self.ocr_batcher.submit(roi) for roi in rois]
+            return [future.result() for future in futures]
+        return (self.ocr_source or self).read_batch_raw(rois)
+    
+    def read_batch_raw(self, rois):
+        """Kør en batch af ROIs gennem OCR pulje eller lokal reader"""
+        if self.ocr_pool is not None:
+            return self.ocr_pool.read_many(rois)
+        if self.reader is None:
+            return [[] for _ in rois]   # Modellen kunne ikke indlæses
+        if self.decoder_config is not None:
+            # Én batch gennem modellen og format-afkodning pr. ROI
+            return decode_rois(self.decoder_config, self.reader, rois)
+        if self.recognition_only:
+            # Alle ROIs i ét recognize kald uden CRAFT detektion
+            return recognize_rois(self.reader, rois)
+        if self.ocr_batcher is not None and len(rois) > 1:
+            # readtext_batched kræver ens størrelse - detektoren kører så i ét kald
+            return self.reader.readtext_batched(
+                rois, n_width=self.batch_width, n_height=self.batch_height,
+                batch_size=len(rois), detail=1, paragraph=False
+            )
+        return [self.reader.readtext(roi, detail=1, paragraph=False) for roi in rois]
+    
+    def score_ocr_result(self, result):
+        """Rå OCR resultat -> (tekst, stemmevægt)"""
+        if isinstance(result, tuple):
+            # Allerede afkodet af PlateDecoder med sin egen confidence (CTC sandsynlighed)
+            text, confidence = result
+            return self.normalize_ocr_result([text]), self.voter.weight('decoder', confidence)
+        # EasyOCR (detail=1) giver (boks, tekst, confidence) pr. tekststykke - pladen er
+        # ikke sikrere end sit svageste stykke. Rene tekster har ingen confidence
+        texts = [item if isinstance(item, str) else item[1] for item in result or []]
+        confidences = [item[2] for item in result or [] if not isinstance(item, str)]
+        text = self.normalize_ocr_result(texts)
+        if not text:
+            return text, 0.0
+        return text, self.voter.weight('easyocr', min(confidences) if confidences else None)
+    
+    def normalize_ocr_result(self, result):
+        """Saml EasyOCR tekststykker til en renset nummerplade tekst"""
         if not result:
             return ""
         
@@ -81,41 +431,127 @@ class LicensePlateRecognizer:
         
         return text
     
-    def process_frame(self, frame):
+    def recognize_frame(self, frame):
+        """Find gyldige nummerplader i et frame som liste af (track, tekst, confidence)"""
+        results = []
+        METRICS.inc("frames")
+        self.frames_processed += 1
+        if 'first_frame' not in self.startup_timings:
+            self.note_first_frame()
+        
+        # Spring detektion og OCR over når intet har bevæget sig
+        if self.motion_detector and not self.motion_detector.has_motion(frame):
+            METRICS.inc("frames_without_motion")
+            return results
+        
+        # Indtil OCR modellen er klar gemmes frames og læses bagefter
+        if not self.ocr_ready.is_set():
+            self.queue_startup_frame(frame)
+            return results
+        
+        return self.recognize_plates(frame)
+    
+    def recognize_plates(self, frame):
+        """Detektion/tracking og OCR på et frame uden bevægelses- og opstartscheck"""
+        results = []
+        
+        # Fuld detektion hvert N'te frame - ellers følges de kendte tracks
+        frame_index, detect = self.tracker.next_frame()
+        if detect:
+            box, text, confidence = self.read_ranked_scored(frame, self.detect_license_plate(frame))
+            found = [box] if box else []
+            for track, _ in self.tracker.update(found, frame_index):
+                results.append((track, text, confidence))
+            return results
+        
+        located = self.tracker.predicted(frame_index, frame.shape)
+        rois = [frame[y:y+h, x:x+w] for _, (x, y, w, h) in located]
+        
+        for (track, _), (text, confidence) in zip(located, self.read_plates_scored(rois)):
+            valid = bool(text) and self.validate_plate_text(text)
+            self.tracker.report(track, valid)
+            if valid:
+                results.append((track, text, confidence))
+        
+        return results
+    
+    def read_ranked_candidates(self, frame, boxes):
         """
-        Processer et enkelt frame og returnerer detekteret nummerplade
+        OCR kandidater i score-rækkefølge og stop ved første gyldige plade
+        eller når frame'ets OCR budget er brugt - returnerer (boks, tekst)
         """
-        plates = self.detect_license_plate(frame)
-        now = time.time()
+        box, text, _ = self.read_ranked_scored(frame, boxes)
+        return box, text
+    
+    def read_ranked_scored(self, frame, boxes):
+        """Som read_ranked_candidates, men returnerer (boks, tekst, confidence)"""
+        rois = [frame[y:y+h, x:x+w] for (x, y, w, h) in boxes]
         
-        for (x, y, w, h) in plates:
-            roi = frame[y:y+h, x:x+w]
-            text = self.read_plate_easyocr(roi)
-            
+        if self.ocr_batcher is not None:
+            # Med batching er det billigere at læse alle kandidater i samme batch
+            for box, (text, confidence) in zip(boxes, self.read_plates_scored(rois)):
+                if text and self.validate_plate_text(text):
+                    return box, text, confidence
+            return None, None, 0.0
+        
+        deadline = time.time() + self.ocr_budget
+        for box, roi in zip(boxes, rois):
+            text, confidence = self.read_plates_scored([roi])[0]
             if text and self.validate_plate_text(text):
-                # Stabilitetscheck
-                if text != self.stable_plate:
-                    self.stable_plate = text
-                    self.stable_start = now
-                else:
-                    if now - self.stable_start >= 0.3 and text != self.last_logged:
-                        print(f" NUMMERPLADE FUNDET: {text}")
-                        self.last_logged = text
-                        return text
+                return box, text, confidence
+            if time.time() >= deadline:
+                break
+        
+        return None, None, 0.0
+    
+    def update_tracking(self, results, now):
+        """Stem med læsningerne pr. track og returner nummerplade når afstemningen er afgjort"""
+        for track, text, confidence in results:
+            METRICS.inc("plate_votes")
+            plate, posterior = self.voter.add(track, text, confidence, now)
+            if plate and plate != self.last_logged:
+                print(f" NUMMERPLADE FUNDET: {plate} (track {track.track_id}, "
+                      f"{len(track.reads)} læsninger, posterior {posterior:.2f})")
+                self.last_logged = plate
+                METRICS.inc("plates")
+                return plate
         
         return None
     
+    def process_frame(self, frame):
+        """
+        Processer et enkelt frame og returnerer detekteret nummerplade
+        """
+        queued = self.replay_startup_frames(self.take_startup_frames())
+        results = self.recognize_frame(frame)
+        return self.update_tracking(results, time.time()) or queued
+    
+    def handle_plate(self, plate, db_handler, mqtt_publisher):
+        """Send fundet nummerplade videre til indkørsel eller udkørsel"""
+        # Låsen er fælles for alle baner, så parkeringsdata og DB/MQTT kald ikke blandes
+        with self._state_lock:
+            self.plates_handled += 1
+            if self.mode == "entry":
+                self.handle_entry(plate, db_handler, mqtt_publisher)
+            elif self.mode == "exit":
+                self.handle_exit(plate, db_handler, mqtt_publisher)
+    
     def handle_entry(self, plate, db_handler, mqtt_publisher):
         """Håndter indkørsel"""
         print(f"   → INDSKÆR: Bil {plate} kører ind")
         
+        # Samme bil kan ses af flere indkørselskameraer - tæl den kun én gang
+        if self.db.is_car_parked(plate):
+            print(f"Bil {plate} er allerede registreret - ingen handling")
+            return False
+        
         # Tjek om der er plads
         if self.available_spots > 0:
             # 1. Gem i MariaDB (hvis du vil beholde historik)
             db_handler.insert_license_plate(plate)
             
-            # 2. Gem i flat file DB (til exit tracking)
-            self.db.car_entry(plate)
+            # 2. Gem i flat file DB (til exit tracking) med tidspunkt og bane
+            self.db.car_entry(plate, lane=self.lane_name)
             
             # 3. Opdater ledige pladser
             self.available_spots -= 1
@@ -133,9 +569,10 @@ class LicensePlateRecognizer:
 
     def reset_tracking(self):
         """Nulstil tracking når mode ændres"""
-        self.stable_plate = ""
-        self.stable_start = 0
+        self.tracker.reset()
         self.last_logged = ""
+        if self.motion_detector:
+            self.motion_detector.reset()
         print("    Tracking nulstillet for nyt mode")
 
     def handle_exit(self, plate, db_handler, mqtt_publisher):
@@ -143,8 +580,9 @@ class LicensePlateRecognizer:
         print(f"   ← UDSKÆR: Bil {plate} kører ud")
         
         # 1. Tjek om bilen er i flat file DB
-        if self.db.is_car_parked(plate):
-            print(f"Bil {plate} er registreret - åbner bom")
+        entry = self.db.get_entry(plate)
+        if entry is not None:
+            print(f"Bil {plate} er registreret (ind {entry['entry_time'] or 'ukendt tid'}) - åbner bom")
             
             # 2. Gem i MariaDB (historik)
             db_handler.insert_license_plate(plate)
@@ -168,12 +606,8 @@ class LicensePlateRecognizer:
             print(f"Bil {plate} IKKE registreret - ingen handling")
             return False
     
-    def run_real_time(self, db_handler, mqtt_publisher):
-        """Kør realtids nummerpladegenkendelse"""
-        cap = cv2.VideoCapture(self.camera_source)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
-        
+    def print_controls(self):
+        """Vis tastatur kommandoer og status"""
         print("=" * 60)
         print(" PARKERINGSYSTEM - FLAT FILE DATABASE")
         print("=" * 60)
@@ -188,67 +622,219 @@ class LicensePlateRecognizer:
         print(f" Ledige pladser: {self.available_spots}")
         print(f" Parkerede biler: {self.db.get_count()}")
         print("=" * 60)
-        
-        # Send initial status
-        mqtt_publisher.publish_available_spots(self.available_spots)
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Process frame for nummerplade
-            plate = self.process_frame(frame)
-            
-            if plate:
-                if self.mode == "entry":
-                    self.handle_entry(plate, db_handler, mqtt_publisher)
-                elif self.mode == "exit":
-                    self.handle_exit(plate, db_handler, mqtt_publisher)
-            
-            # Tilføj overlay
-            frame_with_info = self.add_overlay(frame)
-            
-            # Vis kamera output
-            cv2.imshow("Parkeringssystem - Flat File DB", frame_with_info)
-            
-            # Tastatur input
-            key = cv2.waitKey(1) & 0xFF
-            
-            if key == ord('q') or key == ord('Q'):
-                break
-            elif key == ord('i') or key == ord('I'):
+    
+    def handle_key(self, key):
+        """Håndter tastatur input - returnerer False når programmet skal stoppe"""
+        if key == ord('q') or key == ord('Q'):
+            return False
+        elif key == ord('i') or key == ord('I'):
+            with self._state_lock:
                 if self.mode != "entry":  # Kun hvis faktisk ændring
                     self.mode = "entry"
                     self.reset_tracking()  # NULSTIL TRACKING!
                     print(f"\n[ÆNDRET MODE] Nu: INDSKÆR (bil kører IND)")
-            elif key == ord('u') or key == ord('U'):
+        elif key == ord('u') or key == ord('U'):
+            with self._state_lock:
                 if self.mode != "exit":  # Kun hvis faktisk ændring
                     self.mode = "exit"
                     self.reset_tracking()  # NULSTIL TRACKING!
                     print(f"\n[ÆNDRET MODE] Nu: UDSKÆR (bil kører UD)")
-            elif key == ord('s') or key == ord('S'):
-                parked_cars = self.db.get_all_parked_cars()
-                print(f"\n[STATUS] Ledige pladser: {self.available_spots}")
-                print(f"         Parkerede biler: {self.db.get_count()}")
-                print(f"         Mode: {self.mode}")
-                if parked_cars:
-                    print(f"         Liste over parkerede biler:")
-                    for i, car in enumerate(parked_cars, 1):
-                        print(f"           {i}. {car}")
-            elif key == ord('c') or key == ord('C'):
-                confirm = input("\nEr du sikker på du vil rydde alle data? (ja/nej): ")
-                if confirm.lower() == 'ja':
-                    self.db.clear_all()
-                    self.available_spots = 50
-                    print("Alle data ryddet og pladser nulstillet")
-        
-        cap.release()
-        cv2.destroyAllWindows()
-    
-    def add_overlay(self, frame):
-        """Tilføj overlay med info til videoen"""
-        overlay = frame.copy()
+        elif key == ord('s') or key == ord('S'):
+            parked_cars = self.db.get_all_parked_cars()
+            print(f"\n[STATUS] Ledige pladser: {self.available_spots}")
+            print(f"         Parkerede biler: {self.db.get_count()}")
+            print(f"         Mode: {self.mode}")
+            if parked_cars:
+                print(f"         Liste over parkerede biler:")
+                for i, car in enumerate(parked_cars, 1):
+                    entry = self.db.get_entry(car) or {}
+                    print(f"           {i}. {car} (ind {entry.get('entry_time') or 'ukendt tid'}, "
+                          f"bane {entry.get('lane') or '-'})")
+        elif key == ord('c') or key == ord('C'):
+            confirm = input("\nEr du sikker på du vil rydde alle data? (ja/nej): ")
+            if confirm.lower() == 'ja':
+                self.parking.reset()
+                print("Alle data ryddet og pladser nulstillet")
+        
+        return True
+    
+    def open_camera(self):
+        """Åbn kameraet med den konfigurerede opløsning"""
+        cap = cv2.VideoCapture(self.camera_source)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
+        return cap
+    
+    def preview_due(self):
+        """Om der skal vises et nyt preview frame (begrænset til preview_fps)"""
+        if self.headless:
+            return False
+        now = time.time()
+        if self.preview_fps > 0 and now - self._last_preview < 1.0 / self.preview_fps:
+            return False
+        self._last_preview = now
+        return True
+    
+    def show_preview(self, frame, in_place=False):
+        """Vis frame med overlay og håndter tastatur - returnerer False ved afslut"""
+        cv2.imshow("Parkeringssystem - Flat File DB", self.add_overlay(frame, in_place))
+        
+        # Tastatur input
+        key = cv2.waitKey(1) & 0xFF
+        return self.handle_key(key)
+    
+    def run_real_time(self, db_handler, mqtt_publisher):
+        """Kør realtids nummerpladegenkendelse"""
+        if self.pipelined:
+            return self.run_pipelined(db_handler, mqtt_publisher)
+        
+        cap = self.open_camera()
+        if self.headless:
+            print(f" Headless mode: {self.mode.upper()} - stop med Ctrl+C")
+        else:
+            self.print_controls()
+        
+        # Send initial status
+        mqtt_publisher.publish_available_spots(self.available_spots)
+        
+        try:
+            while not self.stop_event.is_set():
+                with METRICS.time("capture_wait"):
+                    ret, frame = cap.read()
+                if not ret:
+                    break
+                self.latest_frame = frame
+                
+                # Process frame for nummerplade
+                plate = self.process_frame(frame)
+                
+                if plate:
+                    self.handle_plate(plate, db_handler, mqtt_publisher)
+                
+                # Preview med overlay - frame bruges ikke efter dette, så der tegnes direkte i det
+                if self.preview_due() and not self.show_preview(frame, in_place=True):
+                    break
+        finally:
+            cap.release()
+            if not self.headless:
+                cv2.destroyAllWindows()
+    
+    def run_pipelined(self, db_handler, mqtt_publisher):
+        """
+        Kør genkendelse som pipeline: capture, genkendelse og preview
+        kører hver for sig, så OCR altid arbejder på det nyeste frame
+        """
+        cap = self.open_camera()
+        if self.headless:
+            print(f" Headless mode: {self.mode.upper()} - stop med Ctrl+C")
+        else:
+            self.print_controls()
+        print(f" Pipeline mode: {self.recognition_workers} genkendelsestråd(e), "
+              f"preview {'slået fra' if self.headless else f'{self.preview_fps} FPS'}")
+        
+        # Send initial status
+        mqtt_publisher.publish_available_spots(self.available_spots)
+        
+        slot = LatestFrameSlot()
+        capture = CaptureThread(cap, slot)
+        
+        def handle_frame(seq, frame):
+            self.latest_frame = frame
+            queued = self.take_startup_frames()
+            if queued:
+                with self._state_lock:
+                    plate = self.replay_startup_frames(queued)
+                    if plate:
+                        self.handle_plate(plate, db_handler, mqtt_publisher)
+            
+            results = self.recognize_frame(frame)
+            
+            with self._state_lock:
+                # Resultater fra ældre frames end det sidst anvendte smides væk
+                if seq < self._last_applied_seq:
+                    self.stale_results += 1
+                    return
+                self._last_applied_seq = seq
+                
+                plate = self.update_tracking(results, time.time())
+                if plate:
+                    self.handle_plate(plate, db_handler, mqtt_publisher)
+        
+        workers = [
+            RecognitionWorker(slot, handle_frame, name=f"recognition-{i}")
+            for i in range(max(1, self.recognition_workers))
+        ]
+        
+        capture.start()
+        for worker in workers:
+            worker.start()
+        
+        frame_interval = 1.0 / self.preview_fps if self.preview_fps > 0 else 0
+        if self.headless:
+            frame_interval = 0.5
+        
+        try:
+            while not slot.closed and not self.stop_event.is_set():
+                started = time.time()
+                
+                # Frame deles med genkendelsen, så overlay tegnes i en genbrugt buffer
+                latest = slot.peek()
+                if latest is not None and not self.headless:
+                    _, frame = latest
+                    if not self.show_preview(frame):
+                        break
+                
+                # Preview kører i sit eget tempo uafhængigt af genkendelsen
+                remaining = frame_interval - (time.time() - started)
+                if remaining > 0:
+                    time.sleep(remaining)
+        finally:
+            slot.close()
+            capture.join(timeout=2)
+            for worker in workers:
+                worker.join(timeout=2)
+            
+            processed = sum(worker.processed for worker in workers)
+            print(f"\n[PIPELINE] Frames optaget: {slot.captured}, genkendt: {processed}, "
+                  f"droppet: {slot.dropped}, forældede resultater: {self.stale_results}, "
+                  f"kamera FPS: {capture.fps:.1f}")
+            if self.motion_detector:
+                print(f"[PIPELINE] Frames uden bevægelse sprunget over: "
+                      f"{self.motion_detector.skipped}/{self.motion_detector.frames}")
+            if self.ocr_cache is not None:
+                print(f"[PIPELINE] OCR cache: {self.ocr_cache.hits} hits, "
+                      f"{self.ocr_cache.misses} misses ({self.ocr_cache.hit_rate():.0%})")
+            
+            cap.release()
+            if not self.headless:
+                cv2.destroyAllWindows()
+    
+    def close(self):
+        """Frigiv OCR workers og parkeringsdatabasen"""
+        if self._owns_parking:
+            self.parking.close()
+        if self.ocr_source is not None:
+            return   # Backenden ejes og lukkes af banen den er lånt fra
+        if self.ocr_batcher is not None:
+            print(f" {self.ocr_batcher.report()}")
+            self.ocr_batcher.stop()
+            self.ocr_batcher = None
+        if self.ocr_pool is not None:
+            self.ocr_pool.shutdown()
+            self.ocr_pool = None
+    
+    def add_overlay(self, frame, in_place=False):
+        """
+        Tilføj overlay med info til videoen. Med in_place tegnes direkte i
+        frame - ellers i en buffer der genbruges mellem kald (ingen ny allokering)
+        """
+        if in_place:
+            overlay = frame
+        else:
+            if self._overlay_buffer is None or self._overlay_buffer.shape != frame.shape:
+                self._overlay_buffer = np.empty_like(frame)
+            overlay = self._overlay_buffer
+            np.copyto(overlay, frame)
         
         # Mode info (øverst venstre)
         mode_text = f"Mode: {self.mode.upper()}"
@@ -267,6 +853,10 @@ class LicensePlateRecognizer:
         cv2.putText(overlay, parked_text, (20, 100), 
                     cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 150, 255), 2)
         
+        if not self.ocr_ready.is_set():
+            cv2.putText(overlay, "Indlaeser OCR model...", (320, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 200, 255), 2)
+        
         # Instruktioner
         instructions = "I=Indskær  U=Udskær  S=Status  C=Clear  Q=Afslut"
         cv2.putText(overlay, instructions, 
@@ -2,9 +2,12 @@
 import yaml
 import sys
 import os
+import time
 from database_handler import DatabaseHandler
 from mqtt_publisher import MQTTPublisher
 from license_plate_recognizer import LicensePlateRecognizer
+from lane_manager import LaneManager
+from metrics import METRICS, MetricsServer
 
 def load_config():
     """Indlæs YAML konfiguration"""
@@ -24,6 +27,19 @@ def load_config():
         print(f" Fejl ved indlæsning af config: {e}")
         return {}
 
+def timed_phase(timings, name, fn, *args):
+    """Kør et opstartstrin og gem hvor lang tid det tog"""
+    started = time.perf_counter()
+    result = fn(*args)
+    timings[name] = time.perf_counter() - started
+    return result
+
+def create_recognizer(config):
+    """Én recognizer til camera sektionen, eller en LaneManager når der er flere kameraer"""
+    if config.get('cameras'):
+        return LaneManager(config)
+    return LicensePlateRecognizer(config)
+
 def main():
     print("=" * 50)
     print(" PARKINGSYSTEM - NUMMERPLADEGENKENDELSE")
@@ -39,13 +55,26 @@ def main():
     print(f"\nSystem konfiguration:")
     print(f"  Database: {config['database']['host']}:{config['database']['port']}")
     print(f"  MQTT Broker: {config['mqtt']['broker']}:{config['mqtt']['port']}")
-    print(f"  Kamera: Source {config['camera']['source']}")
+    if config.get('cameras'):
+        for camera in config['cameras']:
+            print(f"  Kamera: Source {camera.get('source')} ({camera.get('role', 'entry')})")
+    else:
+        print(f"  Kamera: Source {config['camera']['source']}")
     
     # Initialize components
     print("\nInitialiserer komponenter...")
-    db_handler = DatabaseHandler(config)
-    mqtt_publisher = MQTTPublisher(config)
-    plate_recognizer = LicensePlateRecognizer(config)
+    metrics_server = None
+    if config.get('metrics', {}).get('enabled', False):
+        metrics_server = MetricsServer(config['metrics']).start()
+    
+    timings = {}
+    db_handler = timed_phase(timings, "database", DatabaseHandler, config)
+    mqtt_publisher = timed_phase(timings, "mqtt", MQTTPublisher, config)
+    plate_recognizer = timed_phase(timings, "recognizer", create_recognizer, config)
+    
+    print("\n[STARTUP] " + ", ".join(f"{name}: {seconds:.2f}s" for name, seconds in timings.items()))
+    if not plate_recognizer.ocr_ready.is_set():
+        print("[STARTUP] OCR model indlæses i baggrunden - frames med bevægelse gemmes til den er klar")
     
     # Send initial status til MQTT
     mqtt_publisher.publish_available_spots(plate_recognizer.available_spots)
@@ -55,7 +84,10 @@ def main():
     print("  - Genkender nummerplader med kamera")
     print("  - Gemmer plader i database")
     print("  - Sender til MQTT broker")
-    print("\nTryk Q i kamera-vinduet for at stoppe")
+    if config.get('camera', {}).get('headless', False):
+        print("\nHeadless mode - stop med Ctrl+C")
+    else:
+        print("\nTryk Q i kamera-vinduet for at stoppe")
     print("=" * 50 + "\n")
     
     try:
@@ -75,8 +107,12 @@ def main():
     finally:
         # Cleanup
         print("\nRydder op...")
+        plate_recognizer.close()
         mqtt_publisher.disconnect()
         db_handler.close()
+        if metrics_server:
+            metrics_server.stop()
+        print(METRICS.summary())
         print("System afsluttet")
 
 if __name__ == "__main__":
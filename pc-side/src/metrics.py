@@ -0,0 +1,205 @@
+# pc-side/src/metrics.py
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bucket grænser i sekunder (0.5 ms - 5 s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Latency histogram med faste buckets (Prometheus stil)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # Sidste bucket er +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q):
+        """Estimer kvantil ved lineær interpolation i den bucket den falder i"""
+        counts, _, count = self.snapshot()
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Samling af latency histogrammer og tællere for PC-siden"""
+
+    def __init__(self):
+        self.histograms = {}   # trin -> Histogram
+        self.counters = {}     # navn -> værdi
+        self._lock = threading.Lock()
+
+    def histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, Histogram())
+        return histogram
+
+    def observe(self, stage, seconds):
+        self.histogram(stage).observe(seconds)
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def time(self, stage):
+        """Mål tiden for en blok kode: with METRICS.time("detect"): ..."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def timed(self, stage):
+        """Decorator der måler hvert kald af en funktion/metode"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(stage, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def render_prometheus(self):
+        """Alle metrics i Prometheus tekstformat"""
+        lines = [
+            "# HELP anpr_stage_duration_seconds Varighed af hvert trin i genkendelsen",
+            "# TYPE anpr_stage_duration_seconds histogram",
+        ]
+        for stage, histogram in sorted(self.histograms.items()):
+            counts, total, count = histogram.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'anpr_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'anpr_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'anpr_stage_duration_seconds_sum{{stage="{stage}"}} {total}')
+            lines.append(f'anpr_stage_duration_seconds_count{{stage="{stage}"}} {count}')
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+        for name, value in counters:
+            lines.append(f"# TYPE anpr_{name}_total counter")
+            lines.append(f"anpr_{name}_total {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Kort opsummering til loggen: antal, gennemsnit og p50/p95 pr. trin"""
+        lines = ["[METRICS] trin: antal, gns / p50 / p95 ms"]
+        for stage, histogram in sorted(self.histograms.items()):
+            _, total, count = histogram.snapshot()
+            if not count:
+                continue
+            lines.append(f"          {stage}: {count}, {total / count * 1000:.1f} / "
+                         f"{histogram.quantile(0.5) * 1000:.1f} / {histogram.quantile(0.95) * 1000:.1f}")
+        with self._lock:
+            counters = sorted(self.counters.items())
+        if counters:
+            lines.append("          " + ", ".join(f"{name}={value}" for name, value in counters))
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+# Fælles registry for alle moduler på PC-siden
+METRICS = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = METRICS
+
+    def do_GET(self):
+        if self.path not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass   # Ingen access log i konsollen
+
+
+class MetricsServer:
+    """Lokalt HTTP endpoint (/metrics) og periodisk opsummering i loggen"""
+
+    def __init__(self, config=None, registry=METRICS):
+        config = config or {}
+        self.host = config.get('host', '127.0.0.1')
+        self.port = config.get('port', 9108)
+        self.summary_interval = config.get('summary_interval', 60)
+        self.registry = registry
+
+        self._httpd = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        handler = type("Handler", (_MetricsHandler,), {"registry": self.registry})
+        try:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+            self._threads.append(threading.Thread(target=self._httpd.serve_forever,
+                                                  daemon=True, name="metrics-http"))
+            print(f" Metrics endpoint: http://{self.host}:{self._httpd.server_address[1]}/metrics")
+        except OSError as e:
+            print(f" Kunne ikke starte metrics endpoint: {e}")
+
+        if self.summary_interval:
+            self._threads.append(threading.Thread(target=self._log_summary,
+                                                  daemon=True, name="metrics-summary"))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _log_summary(self):
+        while not self._stop.wait(self.summary_interval):
+            print(self.registry.summary())
+
+    @property
+    def address(self):
+        return self._httpd.server_address if self._httpd else None
+
+    def stop(self):
+        self._stop.set()
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
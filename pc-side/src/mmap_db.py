@@ -0,0 +1,325 @@
+# pc-side/src/mmap_db.py
+import json
+import mmap
+import os
+import struct
+import zlib
+import numpy as np
+from datetime import datetime
+from flat_file_db import lock_file
+from metrics import METRICS
+
+MAGIC = b"ANPRPLT1"
+VERSION = 1
+
+# Filens opbygning: header | indeks (slots * SLOT) | poster (capacity * RECORD)
+HEADER = struct.Struct("<8sHHIQQQQQ")   # magic, version, dirty, record_size, slots, count, tombstones, high, free_head
+HEADER_SIZE = 64
+SLOT = struct.Struct("<II")              # post nr. + 1 (0 = tom, TOMBSTONE = slettet), hash af pladen
+PLATE_SIZE, LANE_SIZE = 15, 29
+RECORD = struct.Struct(f"<B{PLATE_SIZE}s19s{LANE_SIZE}s")   # i brug, plade, indkørselstid (ISO), bane
+FREE = struct.Struct("<BQ")              # Ledig post: 0, næste ledige post + 1
+TOMBSTONE = 0xFFFFFFFF
+LOAD_FACTOR = 0.7                        # Maks. (parkerede + slettede) / slots før genopbygning
+
+
+def plate_hash(plate_bytes):
+    """Stabil hash (Pythons hash() er tilfældig pr. proces og kan ikke gemmes på disk)"""
+    return zlib.crc32(plate_bytes)
+
+
+def record_capacity(slots):
+    return int(slots * LOAD_FACTOR)
+
+
+def table_size(slots):
+    return HEADER_SIZE + slots * SLOT.size + record_capacity(slots) * RECORD.size
+
+
+class MmapFlatFileDB:
+    """
+    FlatFileDB-kompatibel database i en memory-mapped binær fil med poster af fast
+    størrelse og et open-addressing hash indeks (lineær probing) på disken.
+    Et opslag rører kun indeks- og postsiden for pladen, og opstart læser kun
+    headeren - intet JSON skal parses, og OS'et holder kun de brugte sider i RAM.
+    Kun én proces kan have tabellen åben (<tabel>.lock), så en dirty header
+    betyder altid at den sidste ejer døde - en anden får DatabaseLockedError.
+    """
+
+    def __init__(self, db_file="parked_cars.json", config=None):
+        config = config or {}
+        self.db_file = db_file
+        self.table_file = config.get('table_file', os.path.splitext(db_file)[0] + ".plates")
+        self.initial_slots = config.get('initial_slots', 1024)   # Afrundes op til potens af 2
+        self.fsync = config.get('fsync', False)                  # msync efter hver ændring (ellers ved close)
+
+        self._file = None
+        self._mm = None
+        # Låsen tages før headeren læses - ellers ligner "åben i en anden proces" et nedbrud
+        self._lock_file = lock_file(self.table_file + ".lock")
+        try:
+            if os.path.exists(self.table_file):
+                self._open()
+                if self._dirty:
+                    # Ikke lukket korrekt - tæller og ledige poster kan være halvt opdateret
+                    print(f"{self.table_file} blev ikke lukket korrekt - genopbygger indekset")
+                    self._rebuild(self.slots)
+            else:
+                self._create(self.table_file, self._round_slots(self.initial_slots))
+                self._open()
+                self._import_json()
+            self._set_dirty(1)
+        except Exception:
+            self._close_map()
+            self._lock_file.close()
+            raise
+        print(f"Indlæst {self.count} parkerede biler fra {self.table_file}")
+
+    # --- Fil og header ---
+
+    @staticmethod
+    def _round_slots(slots):
+        rounded = 16
+        while rounded < slots:
+            rounded *= 2
+        return rounded
+
+    @staticmethod
+    def _create(path, slots):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, RECORD.size, slots, 0, 0, 0, 0))
+            f.truncate(table_size(slots))   # Sparse fil - nuller læses som tomme slots
+
+    def _open(self):
+        self._file = open(self.table_file, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        (magic, version, self._dirty, record_size, self.slots, self.count,
+         self.tombstones, self.high, self.free_head) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._close_map()
+            raise ValueError(f"{self.table_file} er ikke en pladetabel (version {VERSION})")
+        self.capacity = record_capacity(self.slots)
+        self._records_offset = HEADER_SIZE + self.slots * SLOT.size
+
+    def _close_map(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = self._file = None
+
+    def _write_header(self):
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self._dirty, RECORD.size, self.slots,
+                         self.count, self.tombstones, self.high, self.free_head)
+
+    def _set_dirty(self, dirty):
+        self._dirty = dirty
+        self._write_header()
+        self._mm.flush()
+
+    def _import_json(self):
+        """Første opstart: overtag en eksisterende JSON database (nyt format eller liste)"""
+        if not os.path.exists(self.db_file):
+            return
+        try:
+            with open(self.db_file, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Fejl ved import af {self.db_file}: {e}")
+            return
+        if isinstance(data, list):
+            data = {plate: {"entry_time": None, "lane": None} for plate in data}
+        for plate, entry in data.items():
+            self._insert(plate, entry.get("entry_time"), entry.get("lane"))
+        print(f"Importeret {len(data)} parkerede biler fra {self.db_file}")
+
+    # --- Indeks og poster ---
+
+    def _record_offset(self, record):
+        return self._records_offset + record * RECORD.size
+
+    def _find(self, plate_bytes):
+        """Returnér (slot, post) for pladen, eller (første ledige slot, None)"""
+        h = plate_hash(plate_bytes)
+        mask = self.slots - 1
+        slot = h & mask
+        free_slot = None
+        while True:
+            record_plus_one, slot_hash = SLOT.unpack_from(self._mm, HEADER_SIZE + slot * SLOT.size)
+            if record_plus_one == 0:
+                return (slot if free_slot is None else free_slot), None
+            if record_plus_one == TOMBSTONE:
+                if free_slot is None:
+                    free_slot = slot
+            elif slot_hash == h:
+                record = record_plus_one - 1
+                offset = self._record_offset(record) + 1
+                if self._mm[offset:offset + PLATE_SIZE].rstrip(b"\0") == plate_bytes:
+                    return slot, record
+            slot = (slot + 1) & mask
+
+    def _read_record(self, record):
+        _, plate, entry_time, lane = RECORD.unpack_from(self._mm, self._record_offset(record))
+        entry_time = entry_time.rstrip(b"\0").decode() or None
+        lane = lane.rstrip(b"\0").decode(errors="ignore") or None
+        return plate.rstrip(b"\0").decode(), {"entry_time": entry_time, "lane": lane}
+
+    def _insert(self, plate_number, entry_time, lane):
+        plate_bytes = encode_plate(plate_number)
+        if self.count + self.tombstones + 1 > self.capacity:
+            # Dobbelt op hvis tabellen er over halvt fuld, ellers ryd kun slettede slots
+            self._rebuild(self.slots * 2 if self.count + 1 > self.capacity // 2 else self.slots)
+        slot, record = self._find(plate_bytes)
+        if record is not None:
+            return False
+
+        if self.free_head:
+            record = self.free_head - 1
+            self.free_head = FREE.unpack_from(self._mm, self._record_offset(record))[1]
+        else:
+            record = self.high
+            self.high += 1
+        RECORD.pack_into(self._mm, self._record_offset(record), 1, plate_bytes,
+                         (entry_time or "").encode(), (lane or "").encode()[:LANE_SIZE])
+        # high og free_head skal stå i headeren før slottet peger på posten - ellers
+        # peger indekset efter et nedbrud ud over de poster genopbygningen kender
+        self._write_header()
+        if SLOT.unpack_from(self._mm, HEADER_SIZE + slot * SLOT.size)[0] == TOMBSTONE:
+            self.tombstones -= 1
+        SLOT.pack_into(self._mm, HEADER_SIZE + slot * SLOT.size, record + 1, plate_hash(plate_bytes))
+        self.count += 1
+        self._write_header()
+        return True
+
+    def _delete(self, plate_number):
+        slot, record = self._find(encode_plate(plate_number))
+        if record is None:
+            return False
+        SLOT.pack_into(self._mm, HEADER_SIZE + slot * SLOT.size, TOMBSTONE, 0)
+        self._mm[self._record_offset(record):self._record_offset(record) + RECORD.size] = bytes(RECORD.size)
+        FREE.pack_into(self._mm, self._record_offset(record), 0, self.free_head)
+        self.free_head = record + 1
+        self.count -= 1
+        self.tombstones += 1
+        self._write_header()
+        return True
+
+    def _live_records(self):
+        """Numre og hashes for alle poster indekset peger på, i postrækkefølge"""
+        index = np.frombuffer(self._mm, dtype='<u4', count=self.slots * 2, offset=HEADER_SIZE).reshape(-1, 2)
+        live = index[(index[:, 0] != 0) & (index[:, 0] != TOMBSTONE)]
+        del index   # Ingen numpy views må holde på mmap'en når den lukkes
+        live = live[np.argsort(live[:, 0])]
+        return live[:, 0].astype(np.int64) - 1, live[:, 1]
+
+    @METRICS.timed("mmapdb_rebuild")
+    def _rebuild(self, slots):
+        """Skriv tabellen om med slots indeks pladser (ingen slettede slots, ingen huller i posterne)"""
+        live, hashes = self._live_records()
+        valid = live < self.high
+        if not valid.all():
+            # Slot skrevet uden at headeren nåede med (ældre tabel) - posten kan ikke stoles på
+            print(f"{self.table_file}: {int((~valid).sum())} slots peger ud over posterne - fjernet")
+            live, hashes = live[valid], hashes[valid]
+        tmp_path = self.table_file + ".tmp"
+        self._create(tmp_path, slots)
+        with open(tmp_path, 'r+b') as f:
+            mm = mmap.mmap(f.fileno(), 0)
+            old = new = None
+            try:
+                records_offset = HEADER_SIZE + slots * SLOT.size
+                old = np.frombuffer(self._mm, dtype=np.uint8, count=self.high * RECORD.size,
+                                    offset=self._records_offset).reshape(-1, RECORD.size)
+                new = np.frombuffer(mm, dtype=np.uint8, count=len(live) * RECORD.size,
+                                    offset=records_offset).reshape(-1, RECORD.size)
+                new[:] = old[live]
+
+                # Hashen står i det gamle indeks, så pladerne skal ikke hashes igen
+                mask = slots - 1
+                for record, h in enumerate(hashes.tolist()):
+                    slot = h & mask
+                    while SLOT.unpack_from(mm, HEADER_SIZE + slot * SLOT.size)[0]:
+                        slot = (slot + 1) & mask
+                    SLOT.pack_into(mm, HEADER_SIZE + slot * SLOT.size, record + 1, h)
+                HEADER.pack_into(mm, 0, MAGIC, VERSION, 1, RECORD.size, slots, len(live), 0, len(live), 0)
+                mm.flush()
+            finally:
+                del old, new   # Ingen numpy views må holde på mmap'erne når de lukkes
+                mm.close()
+        self._close_map()
+        os.replace(tmp_path, self.table_file)
+        self._open()
+        METRICS.inc("mmapdb_rebuilds")
+        print(f"Pladetabel genopbygget: {self.count} biler, {self.slots} slots")
+
+    def _changed(self):
+        if self.fsync:
+            self._mm.flush()
+
+    # --- FlatFileDB API ---
+
+    def car_entry(self, plate_number, lane=None):
+        """Registrer indkørsel - tilføj bil til database med tidspunkt og bane"""
+        if not self._insert(plate_number, datetime.now().isoformat(timespec="seconds"), lane):
+            print(f"Bil {plate_number} er allerede registreret")
+            return False
+        self._changed()
+        print(f"Bil {plate_number} tilføjet til database")
+        print(f"Antal parkerede biler: {self.count}")
+        return True
+
+    def car_exit(self, plate_number):
+        """Registrer udkørsel - fjern bil fra database"""
+        if self._delete(plate_number):
+            self._changed()
+            print(f"Bil {plate_number} fjernet fra database")
+            print(f"Antal parkerede biler: {self.count}")
+            return True
+        print(f"Bil {plate_number} findes ikke i database")
+        return False
+
+    def is_car_parked(self, plate_number):
+        """Tjek om en bil er registreret som parkeret"""
+        return self._find(encode_plate(plate_number))[1] is not None
+
+    def get_entry(self, plate_number):
+        """Hent indkørselstid og bane for en parkeret bil (None hvis den ikke er parkeret)"""
+        record = self._find(encode_plate(plate_number))[1]
+        return self._read_record(record)[1] if record is not None else None
+
+    def get_all_parked_cars(self):
+        """Hent liste over alle parkerede biler sorteret efter indkørselstid"""
+        cars = [self._read_record(record) for record in self._live_records()[0].tolist()]
+        # Ledige poster genbruges, så postrækkefølgen er ikke altid indkørselsrækkefølgen
+        cars.sort(key=lambda car: car[1]["entry_time"] or "")
+        return [plate for plate, _ in cars]
+
+    def get_count(self):
+        """Hent antal parkerede biler"""
+        return self.count
+
+    def clear_all(self):
+        """Ryd alle data (til debugging)"""
+        self._close_map()
+        self._create(self.table_file, self._round_slots(self.initial_slots))
+        self._open()
+        self._set_dirty(1)
+        print("Alle data ryddet")
+
+    def save_data(self):
+        """Skriv ændrede sider til disken"""
+        self._mm.flush()
+
+    def close(self):
+        """Marker tabellen som korrekt lukket, så næste opstart ikke genopbygger"""
+        if self._mm is None:
+            return
+        self._set_dirty(0)
+        self._close_map()
+        self._lock_file.close()
+
+
+def encode_plate(plate_number):
+    plate_bytes = plate_number.encode()
+    if len(plate_bytes) > PLATE_SIZE:
+        raise ValueError(f"Nummerplade for lang til pladetabellen: {plate_number}")
+    return plate_bytes
@@ -0,0 +1,72 @@
+# pc-side/src/motion_detector.py
+import threading
+import time
+import cv2
+
+
+class MotionDetector:
+    """Billig bevægelsesdetektor baseret på frame differencing i lav opløsning"""
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.width = config.get('width', 160)                     # Bredde på nedskaleret frame
+        self.pixel_threshold = config.get('pixel_threshold', 25)  # Min. gråtone forskel pr. pixel
+        self.min_changed_ratio = config.get('min_changed_ratio', 0.01)  # Andel ændrede pixels
+        self.hold_time = config.get('hold_time', 2.0)             # Sekunder vi fortsætter efter bevægelse
+
+        self._previous = None
+        self._last_motion = 0.0
+        self._lock = threading.Lock()
+
+        # Statistik
+        self.frames = 0
+        self.skipped = 0
+
+    def _prepare(self, frame):
+        """Nedskaler og konverter til sløret gråtonebillede"""
+        h, w = frame.shape[:2]
+        scale = min(1.0, self.width / float(w))
+        small = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def has_motion(self, frame, now=None):
+        """Returner True hvis noget har bevæget sig (eller for nylig har)"""
+        now = time.time() if now is None else now
+        current = self._prepare(frame)
+
+        with self._lock:
+            self.frames += 1
+            previous = self._previous
+            self._previous = current
+            return self._evaluate(current, previous, now)
+
+    def _evaluate(self, current, previous, now):
+        """Sammenlign med forrige frame og opdater bevægelsestidspunkt"""
+        # Første frame (eller ny opløsning) behandles altid
+        if previous is None or previous.shape != current.shape:
+            self._last_motion = now
+            return True
+
+        diff = cv2.absdiff(current, previous)
+        _, mask = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        changed = cv2.countNonZero(mask) / float(mask.size)
+
+        if changed >= self.min_changed_ratio:
+            self._last_motion = now
+            return True
+
+        # Bliv ved lidt efter bevægelse så en bil der holder ved bommen også læses
+        if now - self._last_motion <= self.hold_time:
+            return True
+
+        self.skipped += 1
+        return False
+
+    def reset(self):
+        """Glem referenceframe så næste frame altid behandles"""
+        with self._lock:
+            self._previous = None
+            self._last_motion = 0.0
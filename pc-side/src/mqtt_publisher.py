@@ -4,6 +4,7 @@ import json
 from datetime import datetime
 import ssl
 import os
+from metrics import METRICS
 
 class MQTTPublisher:
     def __init__(self, config):
@@ -55,6 +56,7 @@ class MQTTPublisher:
             print(f" MQTT TLS forbindelsesfejl: {e}")
             self.connected = False
     
+    @METRICS.timed("mqtt_available_spots")
     def publish_available_spots(self, available_spots):
         """Publicer antal ledige pladser"""
         try:
@@ -74,6 +76,7 @@ class MQTTPublisher:
         except Exception as e:
             print(f"   MQTT publish fejl (spots): {e}")
     
+    @METRICS.timed("mqtt_parking_event")
     def parking_event(self, plate_number, event_type):
         """Publicer parkeringsbegivenhed"""
         try:
@@ -93,6 +96,7 @@ class MQTTPublisher:
         except Exception as e:
             print(f"   MQTT publish fejl (event): {e}")
 
+    @METRICS.timed("mqtt_gate_command")
     def publish_gate_command(self, command, plate_number=""):
         """Send direkte kommando til gate controller"""
         # FJERN check på self.connected eller fix det:
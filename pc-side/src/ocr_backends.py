@@ -0,0 +1,133 @@
+# pc-side/src/ocr_backends.py
+"""
+Valg af inferens backend til EasyOCR's genkendelsesmodel (license_plate.recognizer):
+
+    easyocr  EasyOCR som standard - på CPU er modellen dynamisk int8 kvantiseret
+    fp32     Fuld præcision (reference ved sammenligning af nøjagtighed)
+    onnx     Modellen eksporteres én gang til ONNX og køres med ONNX Runtime på CPU
+
+Alle backends returnerer en almindelig easyocr.Reader, så readtext/recognize
+virker uændret og read_plate_easyocr kan bruges som før. Med detector: false
+indlæses CRAFT tekstdetektoren ikke, og crops skal læses med recognize_rois.
+"""
+import os
+import cv2
+import numpy as np
+
+BACKENDS = ('easyocr', 'fp32', 'onnx')
+
+
+def create_reader(config=None, languages=('en',)):
+    """Opret EasyOCR reader med den valgte backend (easyocr/torch importeres først her)"""
+    config = config or {}
+    backend = config.get('backend', 'easyocr')
+    if backend not in BACKENDS:
+        raise ValueError(f"Ukendt OCR backend: {backend} (vælg mellem {', '.join(BACKENDS)})")
+
+    import easyocr
+    # Uden detektor spares CRAFT modellen (hukommelse og opstartstid)
+    detector = config.get('detector', True)
+    if backend == 'easyocr':
+        return easyocr.Reader(list(languages), verbose=False, detector=detector)
+
+    # ONNX eksporten kræver også fp32 modellen - dynamisk kvantiserede LSTM'er kan ikke eksporteres
+    reader = easyocr.Reader(list(languages), verbose=False, quantize=False, detector=detector)
+    if backend == 'onnx':
+        onnx_path = config.get('onnx_path', 'easyocr_recognizer.onnx')
+        if not os.path.exists(onnx_path):
+            export_onnx(reader.recognizer, onnx_path)
+        reader.recognizer = OnnxRecognizer(onnx_path, config.get('threads', 0))
+    return reader
+
+
+def recognize_rois(reader, rois):
+    """
+    Læs crops kun med genkendelsesmodellen (ingen CRAFT detektion) - detect_license_plate
+    har allerede fundet pladen. Crops stables lodret i ét gråtonebillede med én
+    tekstboks pr. crop, så hele batchen går gennem ét recognize kald.
+    Returnerer samme format som readtext(detail=1): en liste af (boks, tekst, confidence) pr. crop.
+    """
+    if not rois:
+        return []
+
+    grays = [cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi for roi in rois]
+    width = max(gray.shape[1] for gray in grays)
+    stacked = np.zeros((sum(gray.shape[0] for gray in grays), width), dtype=np.uint8)
+
+    boxes = []
+    top = 0
+    for gray in grays:
+        h, w = gray.shape
+        stacked[top:top + h, :w] = gray
+        boxes.append([0, w, top, top + h])   # [x_min, x_max, y_min, y_max]
+        top += h
+
+    results = reader.recognize(stacked, horizontal_list=boxes, free_list=[],
+                               detail=1, paragraph=False, batch_size=len(boxes))
+
+    # Resultater kobles til deres crop via boksens top (EasyOCR kan sortere dem og springe tomme over)
+    index_by_top = {box[2]: i for i, box in enumerate(boxes)}
+    texts = [[] for _ in rois]
+    for box, text, confidence in results:
+        i = index_by_top.get(int(box[0][1]))
+        if i is not None and text:
+            texts[i].append((box, text, confidence))
+    return texts
+
+
+def export_onnx(model, onnx_path, height=64):
+    """Eksporter genkendelsesmodellen med dynamisk batch og bredde"""
+    import torch
+
+    class ExportModel(torch.nn.Module):
+        """
+        Samme forward som EasyOCR's Model, men AdaptiveAvgPool2d((None, 1))
+        skrives som middelværdi over højden, da adaptiv pooling med dynamisk
+        bredde ikke kan eksporteres. text argumentet bruges ikke og udelades.
+        """
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            visual_feature = self.model.FeatureExtraction(image)
+            visual_feature = visual_feature.permute(0, 3, 1, 2).mean(dim=3)
+            contextual_feature = self.model.SequenceModeling(visual_feature)
+            return self.model.Prediction(contextual_feature.contiguous())
+
+    # Wrapperen skal også være i eval mode - eksporten gendanner dens mode bagefter
+    export_model = ExportModel(model).eval()
+    dummy = torch.zeros(1, 1, height, 256)
+    torch.onnx.export(
+        export_model, (dummy,), onnx_path,
+        input_names=['image'], output_names=['preds'],
+        dynamic_axes={'image': {0: 'batch', 3: 'width'}, 'preds': {0: 'batch', 1: 'steps'}},
+        opset_version=17, dynamo=False,
+    )
+    print(f" OCR model eksporteret til {onnx_path}")
+
+
+class OnnxRecognizer:
+    """
+    Drop-in for EasyOCR's recognizer: kaldes som model(image, text) med en
+    torch tensor og returnerer en torch tensor, men køres af ONNX Runtime
+    """
+
+    def __init__(self, onnx_path, threads=0):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            onnx_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def eval(self):
+        return self
+
+    def __call__(self, image, text=None):
+        import torch
+
+        preds = self.session.run(None, {self.input_name: image.cpu().numpy().astype(np.float32)})[0]
+        return torch.from_numpy(preds)
@@ -0,0 +1,118 @@
+# pc-side/src/ocr_batcher.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class OCRBatcher:
+    """
+    Samler nummerplade crops fra flere frames/kandidater og kører dem
+    gennem OCR i én batch (op til max_batch_size eller max_wait_ms)
+    """
+
+    def __init__(self, batch_fn, config=None):
+        config = config or {}
+        self.batch_fn = batch_fn                                 # Funktion: liste af ROIs -> liste af resultater
+        self.max_batch_size = config.get('max_batch_size', 8)
+        self.max_wait = config.get('max_wait_ms', 20) / 1000.0
+        self.report_interval = config.get('report_interval', 60)  # Sekunder mellem statistik udskrifter
+
+        self._queue = queue.Queue()
+        self._stopped = False
+
+        # Statistik
+        self.batches = 0
+        self.items = 0
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self._total_latency_ms = 0.0
+        self._last_report = time.time()
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="ocr-batcher")
+        self._thread.start()
+
+    def submit(self, roi):
+        """Læg en ROI i kø - returnerer en Future med OCR resultatet"""
+        future = Future()
+        self._queue.put((roi, future))
+        return future
+
+    def _collect_batch(self):
+        """Vent på første ROI og saml flere indtil batchen er fuld eller tiden er gået"""
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while not self._stopped:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            rois = [roi for roi, _ in batch]
+            started = time.time()
+            try:
+                results = self.batch_fn(rois)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self._record(len(batch), (time.time() - started) * 1000)
+
+            # Send resultaterne tilbage til de frames der bad om dem
+            results = list(results)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            if len(results) != len(batch):
+                # Ellers venter de frames der ikke fik et resultat for evigt
+                error = RuntimeError(f"OCR batch gav {len(results)} resultater for {len(batch)} ROIs")
+                print(f" {error}")
+                for _, future in batch[len(results):]:
+                    future.set_exception(error)
+
+    def _record(self, size, latency_ms):
+        """Opdater batch statistik og udskriv den med jævne mellemrum"""
+        self.batches += 1
+        self.items += size
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self._total_latency_ms += latency_ms
+
+        if self.report_interval and time.time() - self._last_report >= self.report_interval:
+            print(f" {self.report()}")
+            self._last_report = time.time()
+
+    def report(self):
+        """Kort statistik over batch størrelse og latency"""
+        if not self.batches:
+            return "OCR batch: ingen batches endnu"
+        return (f"OCR batch: {self.batches} batches, "
+                f"gns. størrelse {self.items / self.batches:.1f}, "
+                f"latency gns. {self._total_latency_ms / self.batches:.1f} ms, "
+                f"sidste {self.last_latency_ms:.1f} ms, maks {self.max_latency_ms:.1f} ms")
+
+    def stop(self):
+        """Stop batch tråden og afvis ventende ROIs"""
+        self._stopped = True
+        self._thread.join(timeout=2)
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
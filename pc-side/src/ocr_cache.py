@@ -0,0 +1,103 @@
+# pc-side/src/ocr_cache.py
+import threading
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+
+def dhash(image, hash_width=48, hash_height=12, margin=8):
+    """Beregn difference hash (dHash) af et billede som et heltal"""
+    gray = image
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+
+    # Normaliser størrelse så crops i forskellig opløsning kan sammenlignes
+    small = cv2.resize(gray, (hash_width + 1, hash_height), interpolation=cv2.INTER_AREA)
+    small = small.astype(np.int16)
+
+    # Kun tydelige kanter tæller - ellers vender sensorstøj bits i ensfarvede områder
+    bits = ((small[:, 1:] - small[:, :-1]) > margin).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a, b):
+    """Antal bits der er forskellige mellem to hashes"""
+    return bin(a ^ b).count("1")
+
+
+class OCRCache:
+    """
+    LRU cache af OCR resultater nøglet på perceptuel hash af nummerplade ROI.
+    Et resultat er det recognizeren gemmer - (tekst, stemmevægt)
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.max_size = config.get('max_size', 64)           # Maks antal gemte resultater
+        self.ttl = config.get('ttl', 10.0)                   # Sekunder et resultat er gyldigt
+        self.max_distance = config.get('max_distance', 4)    # Maks antal forskellige bits
+        self.hash_width = config.get('hash_width', 48)
+        self.hash_height = config.get('hash_height', 12)
+        self.margin = config.get('margin', 8)                # Min. gråtone forskel for en kant
+
+        self._entries = OrderedDict()   # hash -> ((tekst, stemmevægt), tidspunkt)
+        self._lock = threading.Lock()
+
+        # Statistik
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, roi):
+        """Beregn cache nøgle for en ROI"""
+        return dhash(roi, self.hash_width, self.hash_height, self.margin)
+
+    def get(self, key, now=None):
+        """Find resultatet for nærmeste hash inden for tærsklen - None ved miss"""
+        now = time.time() if now is None else now
+
+        with self._lock:
+            best_key = None
+            best_distance = self.max_distance + 1
+
+            for entry_key, (_, stored_at) in list(self._entries.items()):
+                # Fjern udløbne resultater
+                if now - stored_at > self.ttl:
+                    del self._entries[entry_key]
+                    continue
+
+                distance = hamming_distance(key, entry_key)
+                if distance < best_distance:
+                    best_key = entry_key
+                    best_distance = distance
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key][0]
+
+    def put(self, key, result, now=None):
+        """Gem OCR resultat og smid det mindst brugte ud hvis cachen er fuld"""
+        now = time.time() if now is None else now
+
+        with self._lock:
+            self._entries[key] = (result, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Tøm cachen"""
+        with self._lock:
+            self._entries.clear()
+
+    def hit_rate(self):
+        """Andel af opslag der blev besvaret fra cachen"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,95 @@
+# pc-side/src/ocr_pool.py
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Hver worker proces har sin egen reader, indlæst én gang ved opstart
+_worker_reader = None
+
+
+def create_easyocr_reader(languages):
+    """Standard reader factory - importeres først i worker processen"""
+    import easyocr
+    return easyocr.Reader(languages, gpu=False, verbose=False)
+
+
+def _init_worker(reader_factory, languages):
+    """Initialiser worker proces med egen OCR reader"""
+    global _worker_reader
+    _worker_reader = reader_factory(languages)
+
+
+def _warm_up(delay):
+    """Lille opgave der sikrer at alle workers er startet"""
+    time.sleep(delay)
+    return os.getpid()
+
+
+def _read_rois(rois, recognition_only=False, decoder_config=None):
+    """Kør OCR på en liste af ROIs i worker processen"""
+    if decoder_config is not None:
+        from plate_decoder import decode_rois
+        return decode_rois(decoder_config, _worker_reader, rois)
+    if recognition_only:
+        from ocr_backends import recognize_rois
+        return recognize_rois(_worker_reader, rois)
+    return [_worker_reader.readtext(roi, detail=1, paragraph=False) for roi in rois]
+
+
+class OCRWorkerPool:
+    """
+    Pulje af OCR worker processer med én EasyOCR reader pr. proces.
+    Hvert kald venter på sit eget resultat (ingen asynkron indsendelse), så
+    workers kun arbejder samtidig når flere tråde kalder på én gang (pipeline
+    mode med flere genkendelsestråde eller flere baner) - rækkefølgen pr. frame
+    holdes der. Med én genkendelsestråd giver puljen ingen parallelisme
+    """
+
+    def __init__(self, config=None, reader_factory=create_easyocr_reader, recognition_only=False,
+                 decoder_config=None):
+        config = config or {}
+        self.workers = config.get('workers', 2)
+        self.languages = config.get('languages', ['en'])
+        self.recognition_only = recognition_only   # ROIs læses uden CRAFT detektion
+        self.decoder_config = decoder_config       # Formatbevidst afkodning -> (tekst, confidence)
+
+        # spawn så workers ikke arver tråde/kamera handles fra hovedprocessen
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(reader_factory, self.languages),
+        )
+
+        self._lock = threading.Lock()
+
+        # Statistik
+        self.submitted = 0
+        self.completed = 0
+
+    def warm_up(self, delay=0.2):
+        """Start alle workers (og indlæs deres readers) før første frame"""
+        started = time.time()
+        futures = [self._executor.submit(_warm_up, delay) for _ in range(self.workers)]
+        pids = {future.result() for future in futures}
+        print(f" OCR pulje klar: {len(pids)} worker(s) på {time.time() - started:.1f}s")
+
+    def read(self, roi):
+        """Kør OCR på én ROI og vent på resultatet"""
+        return self.read_many([roi])[0]
+
+    def read_many(self, rois):
+        """Kør OCR på flere ROIs som én opgave og vent på resultaterne"""
+        with self._lock:
+            self.submitted += 1
+        results = self._executor.submit(_read_rois, list(rois), self.recognition_only,
+                                        self.decoder_config).result()
+        with self._lock:
+            self.completed += 1
+        return results
+
+    def shutdown(self):
+        """Stop alle worker processer"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
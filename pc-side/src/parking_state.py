@@ -0,0 +1,50 @@
+# pc-side/src/parking_state.py
+import threading
+from flat_file_db import FlatFileDB, MemoryFlatFileDB
+from journaled_db import JournaledFlatFileDB
+from mmap_db import MmapFlatFileDB
+from sqlite_db import SqliteFlatFileDB
+
+DB_BACKENDS = ('json', 'journal', 'mmap', 'sqlite', 'memory')
+
+
+def create_parking_db(config=None):
+    """Opret parkeringsdatabasen valgt i parking_db sektionen i config.yaml"""
+    config = config or {}
+    backend = config.get('backend', 'json')
+    db_file = config.get('file', 'parked_cars.json')
+    if backend == 'json':
+        return FlatFileDB(db_file)
+    if backend == 'memory':
+        return MemoryFlatFileDB(db_file)
+    if backend == 'journal':
+        return JournaledFlatFileDB(db_file, config.get('journal', {}))
+    if backend == 'mmap':
+        return MmapFlatFileDB(db_file, config.get('mmap', {}))
+    if backend == 'sqlite':
+        return SqliteFlatFileDB(db_file, config.get('sqlite', {}))
+    raise ValueError(f"Ukendt parkeringsdatabase: {backend} (vælg mellem {', '.join(DB_BACKENDS)})")
+
+
+class ParkingState:
+    """
+    Parkeringsdata der deles af alle baner: flat file DB, ledige pladser og én lås,
+    så ind- og udkørsler fra forskellige kameraer ikke kan overlappe hinanden
+    """
+
+    def __init__(self, db_config=None, capacity=50):
+        self.db = create_parking_db(db_config)
+        self.capacity = capacity
+        self.available_spots = capacity
+        self.lock = threading.RLock()
+
+    def reset(self):
+        """Ryd alle parkerede biler og nulstil ledige pladser"""
+        with self.lock:
+            self.db.clear_all()
+            self.available_spots = self.capacity
+
+    def close(self):
+        """Luk databasen (journal: skriv snapshot og stop baggrundstråden)"""
+        with self.lock:
+            self.db.close()
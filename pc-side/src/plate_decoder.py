@@ -0,0 +1,202 @@
+# pc-side/src/plate_decoder.py
+"""
+Formatbevidst afkodning af EasyOCR's genkendelsesmodel til danske plader.
+
+I stedet for greedy afkodning (argmax pr. tidsskridt) findes den mest
+sandsynlige CTC sti der staver præcis 2 bogstaver + 5 cifre (^[A-Z]{2}\\d{5}$).
+Et tegn der ligner noget fra den forkerte klasse (O/0, I/1, B/8) bliver dermed
+læst som det mest sandsynlige tegn fra den rigtige klasse.
+"""
+import math
+import string
+import cv2
+import numpy as np
+
+PLATE_LAYOUT = "LLDDDDD"       # L = bogstav, D = ciffer
+SEPARATORS = " -."             # Tegn mellem grupperne tæller som blank
+MODEL_HEIGHT = 64              # EasyOCR's imgH for engelske modeller
+
+
+def preprocess_rois(rois, height=MODEL_HEIGHT):
+    """
+    Samme forbehandling som EasyOCR's get_image_list + AlignCollate: gråtone,
+    skalering til modelhøjden og højre-padding med sidste kolonne til fælles bredde
+    """
+    grays = [cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi for roi in rois]
+    ratios = [max(1.0, g.shape[1] / float(g.shape[0])) for g in grays]
+    max_width = math.ceil(max(ratios)) * height
+
+    batch = np.empty((len(grays), 1, height, max_width), dtype=np.float32)
+    for i, (gray, ratio) in enumerate(zip(grays, ratios)):
+        width = min(max_width, int(height * ratio))
+        # EasyOCR bruger Image.LANCZOS (= 1) som cv2 interpolation, dvs. INTER_LINEAR
+        resized = cv2.resize(gray, (width, height), interpolation=cv2.INTER_LINEAR)
+        normalized = resized.astype(np.float32) / 127.5 - 1.0
+        batch[i, 0, :, :width] = normalized
+        batch[i, 0, :, width:] = normalized[:, -1:]
+    return batch
+
+
+def ctc_probabilities(reader, rois):
+    """Kør genkendelsesmodellen på alle ROIs i én batch - returnerer (batch, tid, klasser)"""
+    import torch
+
+    batch = torch.from_numpy(preprocess_rois(rois))
+    model = reader.recognizer
+    model.eval()
+    with torch.no_grad():
+        preds = model(batch, None)
+        probs = torch.softmax(preds, dim=2).cpu().numpy()
+
+    # Tegn uden for sprogets tegnsæt fjernes ligesom i EasyOCR
+    characters = reader.converter.character
+    allowed = set(reader.lang_char)
+    ignore = [i for i, c in enumerate(characters) if i > 0 and c not in allowed]
+    probs[:, :, ignore] = 0.0
+    probs /= np.maximum(probs.sum(axis=2, keepdims=True), 1e-12)
+    return probs
+
+
+class PlateDecoder:
+    """Afkoder CTC sandsynligheder til den mest sandsynlige gyldige plade med confidence"""
+
+    def __init__(self, characters, config=None):
+        config = config or {}
+        self.min_confidence = config.get('min_confidence', 0.3)
+        self.characters = list(characters)   # Indeks 0 er CTC blank
+
+        index = {c: i for i, c in enumerate(self.characters)}
+        self.letters = string.ascii_uppercase
+        self.upper_idx = np.array([index.get(c, -1) for c in self.letters])
+        self.lower_idx = np.array([index.get(c.lower(), -1) for c in self.letters])
+        self.digit_idx = np.array([index.get(c, -1) for c in string.digits])
+        self.separator_idx = [index[c] for c in SEPARATORS if c in index]
+
+    def class_probabilities(self, probs):
+        """(tid, 26) bogstav-, (tid, 10) ciffer- og (tid,) blank sandsynligheder"""
+        def gather(idx):
+            return np.where(idx >= 0, probs[:, np.maximum(idx, 0)], 0.0)
+
+        # Store og små bogstaver er samme tegn på en plade
+        letters = gather(self.upper_idx) + gather(self.lower_idx)
+        digits = gather(self.digit_idx)
+        blank = probs[:, 0] + probs[:, self.separator_idx].sum(axis=1)
+        return letters, digits, blank
+
+    def greedy(self, probs):
+        """Almindelig greedy CTC afkodning (som EasyOCR) - til sammenligning"""
+        best = probs.argmax(axis=1)
+        keep = np.ones(len(best), dtype=bool)
+        keep[1:] = best[1:] != best[:-1]
+        return "".join(self.characters[i] for i in best[keep] if i > 0)
+
+    def decode(self, probs):
+        """
+        Viterbi over CTC stier der staver PLATE_LAYOUT - returnerer (tekst, confidence)
+        hvor confidence er den laveste top-sandsynlighed blandt pladens 7 tegn
+        """
+        letters, digits, blank = self.class_probabilities(probs)
+        steps = len(blank)
+        positions = len(PLATE_LAYOUT)
+        if steps < positions:
+            return "", 0.0
+
+        # Emissioner pr. position: (tid, position, tegn) - cifre paddes til 26 med -inf
+        with np.errstate(divide='ignore'):
+            log_letters = np.log(letters)
+            log_digits = np.full((steps, 26), -np.inf)
+            log_digits[:, :10] = np.log(digits)
+            log_blank = np.log(blank)
+        emit = np.stack([log_letters if p == "L" else log_digits for p in PLATE_LAYOUT], axis=1)
+
+        # Tilstande: tegn (position, tegn) og mellemrum før hver position (+ efter sidste)
+        chars = np.full((positions, 26), -np.inf)
+        gaps = np.full(positions + 1, -np.inf)
+        chars[0] = emit[0, 0]
+        gaps[0] = log_blank[0]
+
+        # Bagudpegere: for tegn 0 = bliv, 1 = fra mellemrum, 2 = fra forrige positions tegn
+        char_from = np.zeros((steps, positions, 26), dtype=np.int8)
+        char_prev = np.zeros((steps, positions, 26), dtype=np.int8)
+        gap_from = np.zeros((steps, positions + 1), dtype=np.int8)   # 0 = bliv, 1 = fra tegn
+        gap_prev = np.zeros((steps, positions + 1), dtype=np.int8)
+        cols = np.arange(26)
+        # Kun når to naboer er samme klasse kan de være samme CTC label
+        same_class = np.array([PLATE_LAYOUT[k] == PLATE_LAYOUT[k - 1] for k in range(1, positions)])
+
+        for t in range(1, steps):
+            # Bedste og næstbedste tegn på forrige position (samme tegn to gange kræver blank imellem)
+            order = np.argsort(chars, axis=1)
+            best, second = order[:, -1], order[:, -2]
+            best_score = chars[np.arange(positions), best]
+            second_score = chars[np.arange(positions), second]
+
+            from_prev = np.full((positions, 26), -np.inf)
+            prev_idx = np.zeros((positions, 26), dtype=np.int8)
+            from_prev[1:] = best_score[:-1, None]
+            prev_idx[1:] = best[:-1, None]
+            same = (cols[None, :] == best[:-1, None]) & same_class[:, None]
+            from_prev[1:][same] = np.broadcast_to(second_score[:-1, None], (positions - 1, 26))[same]
+            prev_idx[1:][same] = np.broadcast_to(second[:-1, None], (positions - 1, 26))[same]
+
+            options = np.stack([chars, np.broadcast_to(gaps[:positions, None], chars.shape), from_prev])
+            choice = options.argmax(axis=0)
+            new_chars = options.max(axis=0) + emit[t]
+
+            gap_options = np.stack([gaps, np.concatenate([[-np.inf], best_score])])
+            gap_choice = gap_options.argmax(axis=0)
+            new_gaps = gap_options.max(axis=0) + log_blank[t]
+
+            char_from[t], char_prev[t] = choice, prev_idx
+            gap_from[t], gap_prev[t] = gap_choice, np.concatenate([[0], best])
+            chars, gaps = new_chars, new_gaps
+
+        # Slut i sidste tegn eller mellemrummet efter det
+        last = positions - 1
+        if gaps[positions] >= chars[last].max():
+            state = ('gap', positions, 0)
+            score = gaps[positions]
+        else:
+            state = ('char', last, int(chars[last].argmax()))
+            score = chars[last].max()
+        if not np.isfinite(score):
+            return "", 0.0
+
+        # Følg stien baglæns og find tegn og deres højeste sandsynlighed
+        text = [None] * positions
+        peak = np.zeros(positions)
+        for t in range(steps - 1, -1, -1):
+            kind, k, c = state
+            if kind == 'char':
+                text[k] = c
+                prob = letters[t, c] if PLATE_LAYOUT[k] == "L" else digits[t, c]
+                peak[k] = max(peak[k], prob)
+                step = char_from[t, k, c]
+                if step == 1:
+                    state = ('gap', k, 0)
+                elif step == 2:
+                    state = ('char', k - 1, int(char_prev[t, k, c]))
+            elif gap_from[t, k] == 1:
+                state = ('char', k - 1, int(gap_prev[t, k]))
+
+        plate = "".join(self.letters[c] if PLATE_LAYOUT[k] == "L" else string.digits[c]
+                        for k, c in enumerate(text))
+        return plate, float(peak.min())
+
+    def read(self, probs):
+        """
+        Afkod én ROI - en sikker gyldig plade foretrækkes, ellers bruges
+        den almindelige greedy tekst (som så typisk afvises af valideringen)
+        """
+        plate, confidence = self.decode(probs)
+        if plate and confidence >= self.min_confidence:
+            return plate, confidence
+        return self.greedy(probs), confidence
+
+
+def decode_rois(config, reader, rois):
+    """ROI læser til recognizer/OCR pulje: [(tekst, confidence)] for hver ROI"""
+    if not rois:
+        return []
+    decoder = PlateDecoder(reader.converter.character, config)
+    return [decoder.read(probs) for probs in ctc_probabilities(reader, rois)]
@@ -0,0 +1,162 @@
+# pc-side/src/plate_tracker.py
+import itertools
+import threading
+from collections import deque
+
+
+def box_iou(a, b):
+    """Intersection over union for to bokse (x, y, w, h)"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / float(union) if union else 0.0
+
+
+class Track:
+    """En nummerplade der følges på tværs af frames"""
+
+    def __init__(self, track_id, box, frame_index):
+        self.track_id = track_id
+        self.box = box                  # (x, y, w, h) fra seneste detektion
+        self.velocity = (0.0, 0.0)      # Pixels pr. frame fra de to seneste detektioner
+        self.last_detected = frame_index
+        self.misses = 0                 # Antal læsninger/detektioner i træk uden resultat
+
+        # Afstemning over læsninger pr. track (PlateVoter)
+        self.stable_plate = ""          # Førende plade i afstemningen
+        self.reads = deque()            # (tekst, confidence) i det glidende vindue
+        self.first_read = None          # Tidspunkt for første gyldige læsning
+
+    def predict(self, frame_index, margin):
+        """Forventet boks i et frame uden detektion, udvidet med en margin"""
+        x, y, w, h = self.box
+        steps = frame_index - self.last_detected
+        x += self.velocity[0] * steps
+        y += self.velocity[1] * steps
+        mx, my = w * margin, h * margin
+        return (int(round(x - mx)), int(round(y - my)),
+                int(round(w + 2 * mx)), int(round(h + 2 * my)))
+
+    def update(self, box, frame_index):
+        """Opdater track med en ny detektion"""
+        steps = max(1, frame_index - self.last_detected)
+        self.velocity = ((box[0] - self.box[0]) / steps, (box[1] - self.box[1]) / steps)
+        self.box = box
+        self.last_detected = frame_index
+        self.misses = 0
+
+
+class PlateTracker:
+    """
+    Følger bekræftede nummerplader mellem frames med IoU/centroid match,
+    så den fulde detektion kun køres hvert N'te frame eller når et track tabes
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.detect_every = max(1, config.get('detect_every', 1))  # Fuld detektion hvert N'te frame
+        self.iou_threshold = config.get('iou_threshold', 0.3)
+        self.max_centroid_distance = config.get('max_centroid_distance', 0.5)  # Relativt til boksens bredde
+        self.max_misses = config.get('max_misses', 3)
+        self.margin = config.get('margin', 0.1)
+
+        self.tracks = {}
+        self._ids = itertools.count(1)
+        self._frame_index = 0
+        self._force_detection = True
+        self._lock = threading.Lock()
+
+    def next_frame(self):
+        """
+        Start et nyt frame - returnerer (frame_index, skal_detektere)
+        Detektion køres hvert N'te frame, når der ingen tracks er, eller når et track er tabt
+        """
+        with self._lock:
+            self._frame_index += 1
+            detect = (self._force_detection or not self.tracks
+                      or self._frame_index % self.detect_every == 0)
+            self._force_detection = False
+            return self._frame_index, detect
+
+    def predicted(self, frame_index, frame_shape):
+        """Forventede bokse for alle aktive tracks som (track, boks)"""
+        frame_h, frame_w = frame_shape[:2]
+        with self._lock:
+            result = []
+            for track in self.tracks.values():
+                x, y, w, h = track.predict(frame_index, self.margin)
+                x0, y0 = max(0, x), max(0, y)
+                x1, y1 = min(frame_w, x + w), min(frame_h, y + h)
+                if x1 > x0 and y1 > y0:
+                    result.append((track, (x0, y0, x1 - x0, y1 - y0)))
+            return result
+
+    def _centroid_close(self, a, b):
+        ax, ay = a[0] + a[2] / 2.0, a[1] + a[3] / 2.0
+        bx, by = b[0] + b[2] / 2.0, b[1] + b[3] / 2.0
+        limit = self.max_centroid_distance * max(a[2], b[2])
+        return (ax - bx) ** 2 + (ay - by) ** 2 <= limit ** 2
+
+    def update(self, boxes, frame_index):
+        """
+        Match detekterede bokse med eksisterende tracks - returnerer (track, boks)
+        i samme rækkefølge som boxes. Umatchede bokse starter nye tracks.
+        """
+        with self._lock:
+            # Grådig matching efter højeste IoU
+            pairs = []
+            for i, box in enumerate(boxes):
+                for track in self.tracks.values():
+                    predicted = track.predict(frame_index, 0.0)
+                    iou = box_iou(box, predicted)
+                    if iou >= self.iou_threshold or self._centroid_close(box, predicted):
+                        pairs.append((iou, i, track.track_id))
+            pairs.sort(reverse=True)
+
+            assigned = {}
+            used_tracks = set()
+            for _, i, track_id in pairs:
+                if i in assigned or track_id in used_tracks:
+                    continue
+                assigned[i] = self.tracks[track_id]
+                used_tracks.add(track_id)
+
+            # Tracks uden detektion i dette frame tæller som miss
+            for track_id in list(self.tracks):
+                if track_id not in used_tracks:
+                    self._miss(self.tracks[track_id])
+
+            result = []
+            for i, box in enumerate(boxes):
+                track = assigned.get(i)
+                if track is None:
+                    track = Track(next(self._ids), box, frame_index)
+                    self.tracks[track.track_id] = track
+                else:
+                    track.update(box, frame_index)
+                result.append((track, box))
+
+            return result
+
+    def report(self, track, found):
+        """Registrer om OCR på track'ets boks gav en gyldig plade"""
+        with self._lock:
+            if found:
+                track.misses = 0
+            else:
+                self._miss(track)
+
+    def _miss(self, track):
+        track.misses += 1
+        if track.misses > self.max_misses and track.track_id in self.tracks:
+            del self.tracks[track.track_id]
+            self._force_detection = True
+
+    def reset(self):
+        """Glem alle tracks"""
+        with self._lock:
+            self.tracks.clear()
+            self._force_detection = True
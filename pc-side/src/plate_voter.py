@@ -0,0 +1,96 @@
+# pc-side/src/plate_voter.py
+
+# Confidence interval for hver kilde der mappes lineært til stemmevægten:
+# template korrelation accepteres først fra template_ocr.min_confidence, CTC
+# sandsynligheden fra plate_decoder.min_confidence, EasyOCR bruger hele [0, 1]
+DEFAULT_CALIBRATION = {
+    'template': (0.6, 1.0),
+    'decoder': (0.3, 1.0),
+    'easyocr': (0.0, 1.0),
+}
+
+
+class PlateVoter:
+    """
+    Afstemning over de seneste læsninger af hvert track: hver position i pladen får
+    stemmer vægtet med OCR confidence, og pladen afgøres så snart den svageste
+    position har posterior w_bedst / (w_total + prior) over tærsklen.
+    En enkelt fejllæsning koster dermed kun lidt i stedet for at nulstille tracket.
+    Kildernes confidence har hver sin skala og omsættes med weight() til en
+    fælles stemmevægt, der er loftet så én læsning ikke kan afgøre pladen alene.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.window = max(1, config.get('window', 8))        # Antal seneste læsninger der stemmer
+        self.threshold = config.get('threshold', 0.75)       # Posterior før pladen afgøres
+        self.prior = config.get('prior', 0.25)               # Stemmevægt for "ikke set endnu"
+        self.max_wait = config.get('max_wait', 1.5)          # Sekunder før flertallet bruges alligevel
+        self.min_reads = max(1, config.get('min_reads', 2))  # Hele læsninger af pladen efter max_wait
+        self.min_weight = config.get('min_weight', 0.1)      # Stemmevægt for den usikreste gyldige læsning
+        self.max_weight = config.get('max_weight', 0.5)      # Stemmevægt for den sikreste læsning
+        self.calibration = dict(DEFAULT_CALIBRATION)
+        self.calibration.update({source: tuple(bounds)
+                                 for source, bounds in config.get('calibration', {}).items()})
+        if self.max_weight / (self.max_weight + self.prior) >= self.threshold:
+            print(f" Advarsel: voting.max_weight {self.max_weight} lader én læsning afgøre pladen "
+                  f"(threshold {self.threshold}, prior {self.prior})")
+
+    def weight(self, source, confidence):
+        """
+        Kildens confidence (template, decoder, easyocr) -> stemmevægt i
+        [min_weight, max_weight] - ukendt confidence tæller som max_weight
+        """
+        if confidence is None:
+            return self.max_weight
+        low, high = self.calibration.get(source, (0.0, 1.0))
+        scaled = (confidence - low) / (high - low) if high > low else 1.0
+        scaled = min(1.0, max(0.0, scaled))
+        return self.min_weight + (self.max_weight - self.min_weight) * scaled
+
+    def tally(self, reads):
+        """Stemmer pr. position for læsninger (tekst, confidence) -> (førende plade, posterior)"""
+        lengths = {}
+        for text, confidence in reads:
+            lengths[len(text)] = lengths.get(len(text), 0.0) + confidence
+        if not lengths:
+            return "", 0.0
+        length = max(lengths, key=lengths.get)
+
+        plate = []
+        posterior = 1.0
+        for position in range(length):
+            votes = {}
+            for text, confidence in reads:
+                if len(text) == length:
+                    votes[text[position]] = votes.get(text[position], 0.0) + confidence
+            char = max(votes, key=votes.get)
+            plate.append(char)
+            posterior = min(posterior, votes[char] / (sum(votes.values()) + self.prior))
+        return "".join(plate), posterior
+
+    def add(self, track, text, confidence, now):
+        """
+        Tilføj en gyldig læsning med stemmevægt (se weight) til tracket -
+        returnerer (plade, posterior), hvor plade er None indtil afstemningen er afgjort.
+        Vægt 0 (fx et cachetræf af en tidligere læsning) stemmer ikke, men max_wait tjekkes
+        """
+        if confidence > 0:
+            if track.first_read is None:
+                track.first_read = now
+            track.reads.append((text, confidence))
+            while len(track.reads) > self.window:
+                track.reads.popleft()
+        elif not track.reads:
+            return None, 0.0
+
+        plate, posterior = self.tally(track.reads)
+        track.stable_plate = plate
+        if posterior >= self.threshold:
+            return plate, posterior
+
+        # Efter max_wait afgøres pladen hvis flertallet er læst helt mindst min_reads gange
+        if now - track.first_read >= self.max_wait:
+            if sum(1 for read, _ in track.reads if read == plate) >= self.min_reads:
+                return plate, posterior
+        return None, posterior
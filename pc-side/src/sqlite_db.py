@@ -0,0 +1,157 @@
+# pc-side/src/sqlite_db.py
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from flat_file_db import lock_file
+from metrics import METRICS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parked_cars (
+    id INTEGER PRIMARY KEY,
+    plate TEXT NOT NULL,
+    entry_time TEXT,
+    lane TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_parked_cars_plate ON parked_cars (plate);
+"""
+
+# Faste SQL strenge - sqlite3 genbruger de forberedte statements fra sin cache
+INSERT_CAR = "INSERT OR IGNORE INTO parked_cars (plate, entry_time, lane) VALUES (?, ?, ?)"
+DELETE_CAR = "DELETE FROM parked_cars WHERE plate = ?"
+SELECT_CAR = "SELECT entry_time, lane FROM parked_cars WHERE plate = ?"
+SELECT_ALL = "SELECT plate FROM parked_cars ORDER BY id"
+COUNT_CARS = "SELECT COUNT(*) FROM parked_cars"
+DELETE_ALL = "DELETE FROM parked_cars"
+
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL')
+
+
+class SqliteFlatFileDB:
+    """
+    FlatFileDB-kompatibel database i SQLite med WAL: hver ændring er én lille
+    transaktion i stedet for en omskrivning af hele filen, og andre processer
+    kan læse samtidig. Antallet caches, så get_count ikke tæller tabellen -
+    derfor kan kun én proces skrive (<sqlite fil>.lock), en anden får
+    DatabaseLockedError.
+    """
+
+    def __init__(self, db_file="parked_cars.json", config=None):
+        config = config or {}
+        self.db_file = db_file
+        self.sqlite_file = config.get('sqlite_file', os.path.splitext(db_file)[0] + ".sqlite")
+        self.synchronous = str(config.get('synchronous', 'NORMAL')).upper()   # NORMAL er crash-sikker med WAL
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Ukendt synchronous: {self.synchronous} (vælg mellem {', '.join(SYNCHRONOUS_MODES)})")
+
+        self._lock = threading.Lock()   # Forbindelsen deles af banernes tråde
+        # En anden skriver ville gøre det cachede antal forkert
+        self._lock_file = lock_file(self.sqlite_file + ".lock")
+        try:
+            new_database = not os.path.exists(self.sqlite_file)
+            self.connection = sqlite3.connect(self.sqlite_file, check_same_thread=False,
+                                              timeout=config.get('busy_timeout', 5.0),
+                                              cached_statements=config.get('cached_statements', 128))
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(f"PRAGMA synchronous={self.synchronous}")
+            self.connection.executescript(SCHEMA)
+            if new_database:
+                self._import_json()
+            self._count = self.connection.execute(COUNT_CARS).fetchone()[0]
+        except Exception:
+            self._lock_file.close()
+            raise
+        print(f"Indlæst {self._count} parkerede biler fra {self.sqlite_file}")
+
+    def _import_json(self):
+        """Første opstart: overtag en eksisterende JSON database (nyt format eller liste)"""
+        if not os.path.exists(self.db_file):
+            return
+        try:
+            with open(self.db_file, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Fejl ved import af {self.db_file}: {e}")
+            return
+        if isinstance(data, list):
+            data = {plate: {"entry_time": None, "lane": None} for plate in data}
+        with self.connection:
+            self.connection.executemany(INSERT_CAR, ((plate, entry.get("entry_time"), entry.get("lane"))
+                                                     for plate, entry in data.items()))
+        print(f"Importeret {len(data)} parkerede biler fra {self.db_file}")
+
+    @METRICS.timed("sqlite_write")
+    def _write(self, sql, params=(), delta=0):
+        """
+        Kør én ændring som sin egen transaktion og returnér antal ramte rækker -
+        antallet justeres med delta pr. ramt række under samme lås
+        """
+        with self._lock:
+            with self.connection:
+                changed = self.connection.execute(sql, params).rowcount
+            self._count += delta * changed
+            return changed
+
+    def car_entry(self, plate_number, lane=None):
+        """Registrer indkørsel - tilføj bil til database med tidspunkt og bane"""
+        entry_time = datetime.now().isoformat(timespec="seconds")
+        try:
+            added = self._write(INSERT_CAR, (plate_number, entry_time, lane), delta=1)
+        except sqlite3.Error as e:
+            print(f"Fejl ved gemning af data: {e}")
+            return False
+        if not added:
+            print(f"Bil {plate_number} er allerede registreret")
+            return False
+        print(f"Bil {plate_number} tilføjet til database")
+        print(f"Antal parkerede biler: {self._count}")
+        return True
+
+    def car_exit(self, plate_number):
+        """Registrer udkørsel - fjern bil fra database"""
+        try:
+            removed = self._write(DELETE_CAR, (plate_number,), delta=-1)
+        except sqlite3.Error as e:
+            print(f"Fejl ved gemning af data: {e}")
+            return False
+        if removed:
+            print(f"Bil {plate_number} fjernet fra database")
+            print(f"Antal parkerede biler: {self._count}")
+            return True
+        print(f"Bil {plate_number} findes ikke i database")
+        return False
+
+    def is_car_parked(self, plate_number):
+        """Tjek om en bil er registreret som parkeret"""
+        return self.get_entry(plate_number) is not None
+
+    def get_entry(self, plate_number):
+        """Hent indkørselstid og bane for en parkeret bil (None hvis den ikke er parkeret)"""
+        with self._lock:
+            row = self.connection.execute(SELECT_CAR, (plate_number,)).fetchone()
+        return {"entry_time": row[0], "lane": row[1]} if row is not None else None
+
+    def get_all_parked_cars(self):
+        """Hent liste over alle parkerede biler"""
+        with self._lock:
+            return [row[0] for row in self.connection.execute(SELECT_ALL)]
+
+    def get_count(self):
+        """Hent antal parkerede biler"""
+        return self._count
+
+    def clear_all(self):
+        """Ryd alle data (til debugging)"""
+        self._write(DELETE_ALL, delta=-1)
+        print("Alle data ryddet")
+
+    def save_data(self):
+        """Intet at gemme - hver ændring er allerede committet"""
+        pass
+
+    def close(self):
+        """Luk forbindelsen (SQLite flytter WAL'en ind i databasen ved sidste lukning)"""
+        with self._lock:
+            self.connection.close()
+        self._lock_file.close()
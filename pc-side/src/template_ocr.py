@@ -0,0 +1,125 @@
+# pc-side/src/template_ocr.py
+import string
+import cv2
+import numpy as np
+
+CHARACTERS = string.digits + string.ascii_uppercase
+TEMPLATE_SIZE = (20, 30)   # (bredde, højde) som i old/src/plate_tracker.py
+
+# Dansk format: True = bogstav, False = ciffer
+PLATE_FORMAT = np.array([True, True, False, False, False, False, False])
+IS_LETTER = np.array([c.isalpha() for c in CHARACTERS])
+
+
+def fit_to_template(glyph):
+    """Skaler tegn ind i skabelonen med bevaret form og centrer det (smalle I/1, brede M/W)"""
+    width, height = TEMPLATE_SIZE
+    h, w = glyph.shape
+    scale = min(width / float(w), height / float(h))
+    new_w = max(1, min(width, int(round(w * scale))))
+    new_h = max(1, min(height, int(round(h * scale))))
+    resized = cv2.resize(glyph, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    fitted = np.zeros((height, width), dtype=np.uint8)
+    top, left = (height - new_h) // 2, (width - new_w) // 2
+    fitted[top:top + new_h, left:left + new_w] = resized
+    # Let sløring gør matchet tolerant over for forskellig stregtykkelse
+    return cv2.GaussianBlur(fitted, (5, 5), 0)
+
+
+def render_template(char):
+    """Tegn ét tegn ligesom create_license_plate_templates og beskær til tegnets boks"""
+    # Større lærred end de oprindelige 30x20 - ellers blev brede tegn (M, W) skåret over
+    canvas = np.zeros((40, 40), dtype=np.uint8)
+    cv2.putText(canvas, char, (5, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 255, 2)
+    ys, xs = np.nonzero(canvas)
+    return fit_to_template(canvas[ys.min():ys.max() + 1, xs.min():xs.max() + 1])
+
+
+def normalize_rows(matrix):
+    """Træk middelværdien fra og normér hver række (TM_CCOEFF_NORMED som prikprodukt)"""
+    matrix = matrix - matrix.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-6)
+
+
+class TemplateOCR:
+    """
+    Hurtig OCR til rene, velbelyste plader: tegnene segmenteres og matches mod
+    alle 36 skabeloner i én matrixmultiplikation i stedet for en løkke pr. skabelon
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.min_confidence = config.get('min_confidence', 0.6)
+        self.min_char_height = config.get('min_char_height', 0.35)   # Relativt til pladens højde
+        self.max_char_height = config.get('max_char_height', 0.95)
+
+        self.characters = np.array(list(CHARACTERS))
+        templates = np.stack([render_template(c) for c in CHARACTERS]).reshape(len(CHARACTERS), -1)
+        # (pixels, 36) - alle skabeloner normeret på forhånd
+        self.templates = normalize_rows(templates.astype(np.float32)).T
+
+        # Statistik
+        self.reads = 0
+        self.accepted = 0
+
+    def extract_characters(self, plate_img):
+        """Segmenter tegn fra venstre mod højre som binære billeder (hvid tekst på sort)"""
+        gray = cv2.cvtColor(plate_img, cv2.COLOR_BGR2GRAY) if plate_img.ndim == 3 else plate_img
+        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        # Inverter hvis baggrunden er lys (mørk tekst på hvid plade)
+        if np.mean(thresh) > 127:
+            thresh = cv2.bitwise_not(thresh)
+
+        # Fjern pladens kant (rækker/kolonner der næsten er helt tændt) så tegn der rører
+        # kanten (fx halen på Q) ikke smelter sammen med den
+        foreground = thresh > 0
+        rows = foreground.mean(axis=1) > 0.8
+        cols = foreground.mean(axis=0) > 0.8
+        rows[len(rows) // 5:len(rows) - len(rows) // 5] = False   # Kun i yderste 20%
+        cols[len(cols) // 5:len(cols) - len(cols) // 5] = False
+        thresh[rows, :] = 0
+        thresh[:, cols] = 0
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(thresh, connectivity=8)
+        if count <= 1:
+            return []
+
+        height, width = thresh.shape
+        x, y, w, h = (stats[1:, i] for i in range(4))
+
+        # Tegn: rimelig højde, smallere end høje, og ikke en del af pladens kant
+        keep = (h >= self.min_char_height * height) & (h <= self.max_char_height * height)
+        keep &= (w <= 1.5 * h) & (w >= 2)
+        keep &= (x > 0) & (y > 0) & (x + w < width) & (y + h < height)
+
+        order = np.argsort(x[keep])
+        boxes = np.stack([x, y, w, h], axis=1)[keep][order]
+        return [thresh[by:by + bh, bx:bx + bw] for bx, by, bw, bh in boxes]
+
+    def match(self, char_images):
+        """Match alle tegn mod alle skabeloner på én gang - returnerer (tegn, scores)"""
+        chars = np.stack([fit_to_template(c) for c in char_images])
+        chars = chars.reshape(len(char_images), -1).astype(np.float32)
+
+        # (tegn, 36) korrelationer - samme tal som TM_CCOEFF_NORMED på billeder af ens størrelse
+        scores = normalize_rows(chars) @ self.templates
+
+        # Med præcis 7 tegn er formatet kendt (2 bogstaver + 5 cifre) - det skiller O/0, B/8 og I/1
+        if len(char_images) == len(PLATE_FORMAT):
+            scores = np.where(PLATE_FORMAT[:, None] == IS_LETTER[None, :], scores, -1.0)
+        return self.characters[scores.argmax(axis=1)], scores
+
+    def read(self, plate_img):
+        """Læs plade - returnerer (tekst, confidence) hvor confidence er det svageste tegns score"""
+        self.reads += 1
+        char_images = self.extract_characters(plate_img)
+        if not char_images:
+            return "", 0.0
+
+        chars, scores = self.match(char_images)
+        confidence = float(scores.max(axis=1).min())
+        if confidence >= self.min_confidence:
+            self.accepted += 1
+        return "".join(chars), confidence
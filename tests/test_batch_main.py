@@ -0,0 +1,89 @@
+import sys
+import os
+import io
+import csv
+import json
+import pytest
+import numpy as np
+import cv2
+from unittest.mock import MagicMock
+
+sys.modules['easyocr'] = MagicMock()
+sys.modules['mysql'] = MagicMock()
+sys.modules['mysql.connector'] = MagicMock()
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+import batch_main
+from license_plate_recognizer import LicensePlateRecognizer
+
+
+def make_scene():
+    frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+    frame[300:340, 240:400] = 255
+    cv2.rectangle(frame, (240, 300), (399, 339), (0, 0, 0), 2)
+    return frame
+
+@pytest.fixture
+def recognizer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rec = LicensePlateRecognizer(batch_main.batch_config({}))
+    rec.reader = MagicMock()
+    rec.reader.readtext.return_value = ["AB 12345"]
+    monkeypatch.setattr(batch_main, "_recognizer", rec)
+    return rec
+
+def test_find_inputs_filters_extensions(tmp_path):
+    (tmp_path / "a.jpg").write_bytes(b"")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.mp4").write_bytes(b"")
+    (tmp_path / "notes.txt").write_text("x")
+
+    found = batch_main.find_inputs([str(tmp_path)])
+    assert sorted(os.path.basename(f) for f in found) == ["a.jpg", "b.mp4"]
+
+def test_batch_config_disables_live_features():
+    config = batch_main.batch_config({"license_plate": {"motion": {"enabled": True},
+                                                        "ocr_cache": {"enabled": True},
+                                                        "ocr_pool": {"workers": 4}}})
+    assert config["license_plate"]["motion"]["enabled"] is False
+    assert config["license_plate"]["ocr_cache"]["enabled"] is False
+    assert config["license_plate"]["ocr_pool"]["workers"] == 0
+
+def test_batch_workers_do_not_open_the_parking_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = batch_main.batch_config({"parking_db": {"backend": "journal", "file": "parked_cars.json"}})
+
+    rec = LicensePlateRecognizer(config)
+    rec.db.car_entry("AB12345")
+    rec.close()
+
+    assert os.listdir(tmp_path) == []   # Ingen snapshot, log eller lås
+
+def test_process_image_file(recognizer, tmp_path):
+    path = str(tmp_path / "car.png")
+    cv2.imwrite(path, make_scene())
+
+    plate, summary = batch_main.process_file(path, frame_step=1)
+    assert plate["plate"] == "AB12345"
+    assert plate["x"] is not None and plate["detect_ms"] >= 0
+    assert summary["type"] == "file" and summary["frames"] == 1 and summary["error"] is None
+
+def test_unreadable_file_reports_error(recognizer, tmp_path):
+    path = str(tmp_path / "broken.jpg")
+    open(path, "wb").close()
+
+    summary, = batch_main.process_file(path, frame_step=1)
+    assert summary["error"]
+
+def test_writer_streams_csv_and_jsonl():
+    record = {"type": "plate", "file": "a.jpg", "frame": 0, "plate": "AB12345"}
+
+    out = io.StringIO()
+    batch_main.ResultWriter(out, "jsonl").write(record)
+    assert json.loads(out.getvalue()) == record
+
+    out = io.StringIO()
+    batch_main.ResultWriter(out, "csv").write(record)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert rows[0]["plate"] == "AB12345"
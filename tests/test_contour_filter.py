@@ -0,0 +1,43 @@
+import sys
+import os
+import numpy as np
+import cv2
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from contour_filter import filter_candidates, filter_candidates_loop, filter_candidates_numpy
+
+
+def noisy_contours(seed, width=640, height=480, shapes=400):
+    """Konturer fra et frame med mange tilfældige figurer (som et støjfyldt frame)"""
+    rng = np.random.default_rng(seed)
+    frame = np.zeros((height, width), dtype=np.uint8)
+    for _ in range(shapes):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        w, h = int(rng.integers(2, 200)), int(rng.integers(2, 60))
+        if rng.random() < 0.5:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), 255, -1)
+        else:
+            cv2.ellipse(frame, (x, y), (w // 2, h // 2), float(rng.integers(0, 180)), 0, 360, 255, -1)
+        cv2.rectangle(frame, (x + 2, y + 2), (x + 4, y + 4), 0, -1)
+    contours, _ = cv2.findContours(frame, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    return contours
+
+def test_vectorized_matches_loop_exactly():
+    for seed in range(10):
+        contours = noisy_contours(seed)
+        for min_area, scale in [(2500, 1.0), (50, 1.0), (50, 0.5)]:
+            expected = filter_candidates_loop(contours, min_area, 640, 480, scale)
+            assert filter_candidates_numpy(contours, min_area, 640, 480, scale) == expected
+            assert filter_candidates(contours, min_area, 640, 480, scale) == expected
+
+def test_area_and_rect_match_opencv():
+    contours = noisy_contours(42)
+    assert len(contours) > 100
+    rows = filter_candidates_numpy(contours, 0, 640, 480)
+    expected = filter_candidates_loop(contours, 0, 640, 480)
+    assert [r[1:] for r in rows] == [r[1:] for r in expected]
+
+def test_no_contours():
+    assert filter_candidates((), 2500, 640, 480) == []
+    assert filter_candidates_numpy((), 2500, 640, 480) == []
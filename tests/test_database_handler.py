@@ -1,5 +1,6 @@
 import sys
 import os
+import threading
 import pytest
 from unittest.mock import Mock
 from unittest.mock import MagicMock
@@ -9,9 +10,20 @@ sys.modules['mysql.connector'] = MagicMock()
 
 # Tilføj pc-side/src til Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+import database_handler
 from database_handler import DatabaseHandler
 
-# Fixture: DatabaseHandler med mock connection
+class SingleConnectionPool:
+    """Pool der altid låner den samme mock forbindelse ud"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get_connection(self):
+        return self.connection
+
+
+# Fixture: DatabaseHandler med mock connection i poolen
 @pytest.fixture
 def db_handler():
     config = {
@@ -26,35 +38,35 @@ def db_handler():
     mock_conn = Mock()
     mock_conn.cursor.return_value = Mock()
     handler = DatabaseHandler(config)
-    handler.connection = mock_conn
+    handler.pool = SingleConnectionPool(mock_conn)
     return handler
 
 def test_insert_license_plate(db_handler):
     db_handler.insert_license_plate("ABC123")
-    db_handler.connection.cursor().execute.assert_called_with(
+    db_handler.pool.connection.cursor().execute.assert_called_with(
         "INSERT INTO license_plates (plate_number) VALUES (%s)", ("ABC123",)
     )
-    db_handler.connection.commit.assert_called_once()
-    db_handler.connection.cursor().close.assert_called_once()
+    db_handler.pool.connection.commit.assert_called_once()
+    db_handler.pool.connection.cursor().close.assert_called_once()
 
 def test_insert_parking_event(db_handler):
     db_handler.insert_parking_event("XYZ789", "entry")
-    db_handler.connection.cursor().execute.assert_called_with(
+    db_handler.pool.connection.cursor().execute.assert_called_with(
         "INSERT INTO parking_events (plate_number, event_type) VALUES (%s, %s)",
         ("XYZ789", "entry")
     )
-    db_handler.connection.commit.assert_called_once()
-    db_handler.connection.cursor().close.assert_called_once()
+    db_handler.pool.connection.commit.assert_called_once()
+    db_handler.pool.connection.cursor().close.assert_called_once()
 
 def test_update_parking_spots(db_handler):
     db_handler.update_parking_spots(5)
-    assert db_handler.connection.cursor().execute.call_count > 0
-    db_handler.connection.commit.assert_called_once()
-    db_handler.connection.cursor().close.assert_called_once()
+    assert db_handler.pool.connection.cursor().execute.call_count > 0
+    db_handler.pool.connection.commit.assert_called_once()
+    db_handler.pool.connection.cursor().close.assert_called_once()
 
 def test_insert_license_plate_db_error(db_handler):
     # Simulerer exception i execute
-    db_handler.connection.cursor().execute.side_effect = Exception("DB fejl")
+    db_handler.pool.connection.cursor().execute.side_effect = Exception("DB fejl")
     try:
         db_handler.insert_license_plate("ABC123")
         success = True
@@ -67,7 +79,140 @@ def test_multiple_inserts(db_handler):
     for plate in plates:
         db_handler.insert_license_plate(plate)
 
-    cursor = db_handler.connection.cursor()
+    cursor = db_handler.pool.connection.cursor()
     assert cursor.execute.call_count == len(plates)
-    assert db_handler.connection.commit.call_count == len(plates)
+    assert db_handler.pool.connection.commit.call_count == len(plates)
     assert cursor.close.call_count == len(plates)
+
+
+class FakeError(Exception):
+    pass
+
+class FakeOperationalError(FakeError):
+    pass
+
+class FakePoolError(FakeError):
+    pass
+
+
+class FakePool:
+    """Connection pool der udleverer mock forbindelser og tæller udlån"""
+
+    def __init__(self, size=4, fail_connect=0, **kwargs):
+        self.free = [self.make_connection() for _ in range(size)]
+        self.created = list(self.free)
+        self.fail_connect = fail_connect
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.max_in_use = 0
+
+    def make_connection(self):
+        connection = Mock()
+        connection.lost = False
+        connection.cursor.side_effect = lambda: Mock()
+        connection.close.side_effect = lambda: self.close(connection)
+        return connection
+
+    def close(self, connection):
+        """Som PooledMySQLConnection.close: reset_session fejler på en død forbindelse"""
+        try:
+            if connection.lost:
+                connection.lost = False   # Genoprettes ved næste udlån
+                raise FakeOperationalError("Lost connection (reset_session)")
+        finally:
+            self.release(connection)
+
+    def release(self, connection):
+        with self.lock:
+            self.in_use -= 1
+            self.free.append(connection)
+
+    def get_connection(self):
+        with self.lock:
+            if self.fail_connect:
+                self.fail_connect -= 1
+                raise FakeOperationalError("MariaDB genstarter")
+            if not self.free:
+                raise FakePoolError("pool exhausted")
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            return self.free.pop()
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    """Erstat mysql.connector's fejltyper og pool i database_handler med fakes"""
+    connector = database_handler.mysql.connector
+    monkeypatch.setattr(connector, "Error", FakeError)
+    monkeypatch.setattr(connector, "OperationalError", FakeOperationalError)
+    monkeypatch.setattr(connector, "InterfaceError", FakeOperationalError)
+    monkeypatch.setattr(connector, "IntegrityError", type("FakeIntegrityError", (FakeError,), {}))
+    monkeypatch.setattr(connector, "PoolError", FakePoolError)
+    pools = []
+
+    def create_pool(**kwargs):
+        pools.append(FakePool(size=kwargs['pool_size']))
+        return pools[-1]
+    monkeypatch.setattr(database_handler.pooling, "MySQLConnectionPool", create_pool)
+    return pools
+
+def test_each_call_checks_out_its_own_connection(pooled):
+    handler = DatabaseHandler({"database": {"pool_size": 2}})
+    pool = pooled[0]
+
+    assert handler.insert_license_plate("AAA111")
+    assert handler.insert_license_plate("BBB222")
+
+    used = [c for c in pool.created if c.commit.called]
+    assert len(used) >= 1 and pool.in_use == 0   # Forbindelserne er afleveret igen
+
+def test_lost_connection_is_retried_on_a_new_connection(pooled):
+    handler = DatabaseHandler({"database": {}})
+    broken = pooled[0].free[-1]
+    broken.cursor.side_effect = None
+    # Fejler én gang - poolen genopretter forbindelsen ved næste udlån
+    def execute(query, params):
+        if not execute.failed:
+            execute.failed = broken.lost = True
+            raise FakeOperationalError("Lost connection")
+    execute.failed = False
+    broken.cursor.return_value.execute.side_effect = execute
+
+    assert handler.insert_license_plate("ABC123")
+    assert broken.cursor.return_value.execute.call_count == 2
+    assert broken.cursor.return_value.close.call_count == 2
+    assert sum(c.commit.call_count for c in pooled[0].created) == 1
+
+def test_reconnect_backoff_after_database_restart(pooled, monkeypatch):
+    handler = DatabaseHandler({"database": {"reconnect_delay": 0.5}})
+    pooled[0].fail_connect = 1
+    now = [1000.0]
+    monkeypatch.setattr(database_handler.time, "time", lambda: now[0])
+
+    assert not handler.insert_license_plate("ABC123")   # Reconnect fejler
+    pooled[0].fail_connect = 1
+    assert not handler.insert_license_plate("ABC123")   # Inden for backoff - poolen røres ikke
+    assert pooled[0].fail_connect == 1
+
+    now[0] += 0.6
+    pooled[0].fail_connect = 0
+    assert handler.insert_license_plate("ABC123")
+    assert handler._retry_delay == 0.5
+
+def test_concurrent_inserts_share_the_pool(pooled):
+    handler = DatabaseHandler({"database": {"pool_size": 2}})
+    results = []
+
+    def insert(offset):
+        for i in range(20):
+            results.append(handler.insert_license_plate(f"AB{offset + i:05d}"))
+
+    threads = [threading.Thread(target=insert, args=(i * 100,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(results) and len(results) == 80
+    assert pooled[0].max_in_use <= 2
+    assert sum(c.commit.call_count for c in pooled[0].created) == 80
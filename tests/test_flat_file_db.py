@@ -0,0 +1,51 @@
+import sys
+import os
+import json
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from flat_file_db import FlatFileDB
+
+
+def test_entry_stores_time_and_lane(tmp_path):
+    db = FlatFileDB(str(tmp_path / "parked.json"))
+
+    assert db.car_entry("AB12345", lane="ind-1")
+    assert not db.car_entry("AB12345", lane="ind-2")
+
+    entry = db.get_entry("AB12345")
+    assert entry['lane'] == "ind-1"
+    assert entry['entry_time']
+    assert db.is_car_parked("AB12345")
+    assert db.get_entry("CD67890") is None
+
+def test_exit_removes_car(tmp_path):
+    db = FlatFileDB(str(tmp_path / "parked.json"))
+    db.car_entry("AB12345")
+    db.car_entry("CD67890")
+
+    assert db.car_exit("AB12345")
+    assert not db.car_exit("AB12345")
+    assert db.get_all_parked_cars() == ["CD67890"]
+    assert db.get_count() == 1
+
+def test_data_survives_restart(tmp_path):
+    path = str(tmp_path / "parked.json")
+    db = FlatFileDB(path)
+    db.car_entry("AB12345", lane="ind-1")
+    db.car_entry("CD67890", lane="ind-2")
+
+    reloaded = FlatFileDB(path)
+    assert reloaded.get_all_parked_cars() == ["AB12345", "CD67890"]
+    assert reloaded.get_entry("CD67890") == db.get_entry("CD67890")
+
+def test_loads_old_list_format(tmp_path):
+    path = tmp_path / "parked.json"
+    path.write_text(json.dumps(["AB12345", "CD67890"]))
+
+    db = FlatFileDB(str(path))
+
+    assert db.is_car_parked("CD67890")
+    assert db.get_entry("AB12345") == {"entry_time": None, "lane": None}
+    assert db.car_exit("AB12345")
+    assert db.get_all_parked_cars() == ["CD67890"]
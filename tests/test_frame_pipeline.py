@@ -0,0 +1,70 @@
+import sys
+import os
+import threading
+import time
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from frame_pipeline import LatestFrameSlot, CaptureThread, RecognitionWorker
+
+
+class FakeCapture:
+    """Kamera der leverer et fast antal frames"""
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def read(self):
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+
+def test_slot_keeps_only_newest_frame():
+    slot = LatestFrameSlot()
+    slot.put("frame1")
+    slot.put("frame2")
+    slot.put("frame3")
+
+    seq, frame = slot.take(timeout=0.1)
+    assert frame == "frame3"
+    assert seq == 3
+    assert slot.dropped == 2
+    assert slot.captured == 3
+
+def test_take_consumes_but_peek_does_not():
+    slot = LatestFrameSlot()
+    slot.put("frame1")
+
+    assert slot.take(timeout=0.1) == (1, "frame1")
+    assert slot.take(timeout=0.05) is None
+    assert slot.peek() == (1, "frame1")
+
+def test_close_wakes_waiting_take():
+    slot = LatestFrameSlot()
+    result = []
+
+    t = threading.Thread(target=lambda: result.append(slot.take(timeout=5)))
+    t.start()
+    time.sleep(0.05)
+    slot.close()
+    t.join(timeout=1)
+
+    assert not t.is_alive()
+    assert result == [None]
+
+def test_capture_and_worker_process_frames():
+    slot = LatestFrameSlot()
+    handled = []
+
+    capture = CaptureThread(FakeCapture(range(5)), slot)
+    worker = RecognitionWorker(slot, lambda seq, frame: handled.append(seq))
+    capture.start()
+    worker.start()
+    capture.join(timeout=1)
+    worker.join(timeout=1)
+
+    assert slot.closed
+    assert slot.captured == 5
+    # Hvert frame er enten genkendt eller talt som droppet
+    assert len(handled) + slot.dropped == 5
+    assert handled == sorted(handled)
@@ -0,0 +1,143 @@
+import sys
+import os
+import json
+import time
+import pytest
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+import journaled_db
+from journaled_db import JournaledFlatFileDB
+from flat_file_db import DatabaseLockedError
+from parking_state import create_parking_db
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "parked.json")
+
+def crash(db):
+    """Som et nedbrud: tråd og filer forsvinder uden komprimering"""
+    db._stop.set()
+    db._compact_requested.set()
+    db._compactor.join(timeout=5)
+    db._journal.close()
+    db._lock_file.close()
+
+def test_changes_are_appended_to_the_log(path):
+    db = JournaledFlatFileDB(path, {'fsync': 'never'})
+    db.car_entry("AB12345", lane="ind-1")
+    db.car_entry("CD67890")
+    db.car_exit("AB12345")
+
+    with open(path + ".log") as f:
+        records = [json.loads(line) for line in f]
+    assert [r['op'] for r in records] == ["entry", "entry", "exit"]
+    assert records[0]['lane'] == "ind-1"
+    assert not os.path.exists(path)   # Intet snapshot endnu
+    db.close()
+
+def test_startup_replays_log_after_crash(path):
+    db = JournaledFlatFileDB(path, {'fsync': 'always'})
+    db.car_entry("AB12345", lane="ind-1")
+    db.car_entry("CD67890")
+    db.car_exit("CD67890")
+    # Intet close() - som et nedbrud, og en halv linje til sidst
+    crash(db)
+    with open(path + ".log", "a") as f:
+        f.write('{"op": "entry", "pla')
+
+    restored = JournaledFlatFileDB(path)
+    assert restored.get_all_parked_cars() == ["AB12345"]
+    assert restored.get_entry("AB12345") == db.get_entry("AB12345")
+    restored.close()
+
+def test_compaction_writes_snapshot_and_truncates_log(path):
+    db = JournaledFlatFileDB(path, {'compact_records': 1000})
+    for i in range(5):
+        db.car_entry(f"AB{i:05d}")
+    db.compact()
+
+    with open(path) as f:
+        assert list(json.load(f)) == [f"AB{i:05d}" for i in range(5)]
+    assert os.path.getsize(path + ".log") == 0
+    assert not os.path.exists(path + ".log.old")
+
+    db.car_exit("AB00000")
+    db.close()
+    assert JournaledFlatFileDB(path).get_all_parked_cars() == [f"AB{i:05d}" for i in range(1, 5)]
+
+def test_background_compaction_after_record_limit(path):
+    db = JournaledFlatFileDB(path, {'compact_records': 3})
+    for i in range(3):
+        db.car_entry(f"AB{i:05d}")
+
+    deadline = time.time() + 5
+    while db.compactions == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert db.compactions == 1
+    assert os.path.exists(path)
+    db.close()
+
+def test_failed_compaction_keeps_records_for_replay(path, monkeypatch):
+    db = JournaledFlatFileDB(path)
+    db.car_entry("AB12345")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk fuld")
+    monkeypatch.setattr(journaled_db, "write_snapshot", fail)
+    db.compact()
+    db.car_entry("CD67890")
+    db.compact()   # Anden fejl - den første logs poster må ikke overskrives
+    crash(db)
+
+    assert JournaledFlatFileDB(path).get_all_parked_cars() == ["AB12345", "CD67890"]
+
+def test_old_list_snapshot_with_log(path):
+    with open(path, "w") as f:
+        json.dump(["AB12345"], f)
+    with open(path + ".log", "w") as f:
+        f.write(json.dumps({"op": "entry", "plate": "CD67890", "entry_time": "2024-01-01T08:00:00",
+                            "lane": "ind-1"}) + "\n")
+
+    db = create_parking_db({'backend': 'journal', 'file': path})
+
+    assert isinstance(db, JournaledFlatFileDB)
+    assert db.get_all_parked_cars() == ["AB12345", "CD67890"]
+    db.close()
+
+def test_unknown_fsync_policy_is_rejected(path):
+    with pytest.raises(ValueError):
+        JournaledFlatFileDB(path, {'fsync': 'sometimes'})
+
+def test_second_writer_is_rejected(path):
+    db = JournaledFlatFileDB(path)
+    db.car_entry("AB11111")
+
+    # Fx en batch worker med samme config - den må hverken afspille eller komprimere
+    with pytest.raises(DatabaseLockedError):
+        JournaledFlatFileDB(path)
+
+    db.car_entry("AB22222")
+    db.close()
+    restored = JournaledFlatFileDB(path)
+    assert restored.get_all_parked_cars() == ["AB11111", "AB22222"]
+    restored.close()
+
+def test_torn_tail_is_cut_before_new_records(path):
+    db = JournaledFlatFileDB(path, {'fsync': 'always'})
+    db.car_entry("AB11111")
+    db.car_entry("AB22222")
+    crash(db)
+    with open(path + ".log", "a") as f:
+        f.write('{"op": "entry", "pla')
+
+    # Nye poster efter første nedbrud må ikke limes på den halve linje
+    db = JournaledFlatFileDB(path, {'fsync': 'always'})
+    db.car_entry("AB33333")
+    db.car_entry("AB44444")
+    crash(db)
+
+    restored = JournaledFlatFileDB(path)
+    assert restored.get_all_parked_cars() == ["AB11111", "AB22222", "AB33333", "AB44444"]
+    restored.close()
@@ -0,0 +1,119 @@
+import sys
+import os
+import threading
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+
+sys.modules['easyocr'] = MagicMock()
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from lane_manager import LaneManager, lane_config
+
+CAMERAS = [
+    {'name': 'ind-1', 'source': 0, 'role': 'entry'},
+    {'name': 'ind-2', 'source': 1, 'role': 'entry'},
+    {'name': 'ud-1', 'source': 2, 'role': 'exit'},
+]
+
+
+class FakeCapture:
+    """Kamera der leverer et fast antal sorte frames"""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def read(self):
+        if self.frames <= 0:
+            return False, None
+        self.frames -= 1
+        return True, np.zeros((120, 160, 3), np.uint8)
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {
+        'camera': {'width': 320, 'headless': True, 'lane_report_interval': 0},
+        'cameras': CAMERAS,
+        'license_plate': {},
+    }
+    return LaneManager(config)
+
+def test_lane_config_fixes_role_and_inherits_camera_settings():
+    config = {'camera': {'width': 320, 'mode': 'entry', 'headless': False}}
+
+    lane = lane_config(config, {'source': 2, 'role': 'exit'}, 1)
+
+    assert lane['camera'] == {'width': 320, 'mode': 'exit', 'headless': True,
+                              'source': 2, 'role': 'exit', 'name': 'exit-2'}
+    assert config['camera']['mode'] == 'entry'
+    with pytest.raises(ValueError):
+        lane_config(config, {'role': 'both'}, 0)
+
+def test_lanes_share_ocr_backend_and_parking_state(manager):
+    first, second, exit_lane = manager.lanes
+
+    assert [lane.mode for lane in manager.lanes] == ['entry', 'entry', 'exit']
+    assert second.ocr_ready is first.ocr_ready
+    assert second.reader is None and second.ocr_source is first
+    assert second.parking is first.parking is exit_lane.parking
+
+    first.reader = MagicMock()
+    first.reader.readtext.return_value = ["AB 12345"]
+    assert second.read_plate_easyocr(np.zeros((60, 240, 3), np.uint8)) == "AB12345"
+
+def test_entry_and_exit_lanes_keep_parking_state_consistent(manager):
+    first, second, exit_lane = manager.lanes
+    db_handler, mqtt = MagicMock(), MagicMock()
+
+    first.handle_plate("AB12345", db_handler, mqtt)
+    second.handle_plate("AB12345", db_handler, mqtt)   # Samme bil set af anden indkørsel
+    assert manager.available_spots == 49
+    assert db_handler.insert_license_plate.call_count == 1
+
+    exit_lane.handle_plate("AB12345", db_handler, mqtt)
+    assert manager.available_spots == 50
+    assert not first.db.is_car_parked("AB12345")
+    mqtt.publish_gate_command.assert_called_once_with("open", "AB12345")
+
+def test_concurrent_entries_from_all_lanes(manager):
+    db_handler, mqtt = MagicMock(), MagicMock()
+    entry_lanes = manager.lanes[:2]
+
+    def enter(lane, offset):
+        for i in range(10):
+            lane.handle_plate(f"AB{offset + i:05d}", db_handler, mqtt)
+
+    threads = [threading.Thread(target=enter, args=(lane, i * 100)) for i, lane in enumerate(entry_lanes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert manager.available_spots == 30
+    assert manager.parking.db.get_count() == 20
+
+def test_run_reports_throughput_per_lane(manager, monkeypatch):
+    frames = {'ind-1': 5, 'ind-2': 3, 'ud-1': 0}
+    for lane in manager.lanes:
+        monkeypatch.setattr(lane, "open_camera", lambda n=frames[lane.lane_name]: FakeCapture(n))
+
+    manager.run_real_time(MagicMock(), MagicMock())
+
+    assert [lane.frames_processed for lane in manager.lanes] == [5, 3, 0]
+    throughput = manager.throughput()
+    assert set(throughput) == {'ind-1', 'ind-2', 'ud-1'}
+    report = manager.report(final=True)
+    assert "ind-1 (entry)" in report and "ud-1 (exit)" in report
+
+def test_duplicate_lane_names_are_rejected(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cameras = [{'name': 'gate', 'role': 'entry'}, {'name': 'gate', 'role': 'exit'}]
+
+    with pytest.raises(ValueError):
+        LaneManager({'camera': {}, 'cameras': cameras, 'license_plate': {}})
@@ -0,0 +1,289 @@
+import sys
+import os
+import threading
+import pytest
+import numpy as np
+import cv2
+from unittest.mock import MagicMock
+
+sys.modules['easyocr'] = MagicMock()
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from license_plate_recognizer import LicensePlateRecognizer
+from plate_tracker import Track
+
+
+def render_plate(text):
+    plate = np.full((60, 240, 3), 255, dtype=np.uint8)
+    cv2.putText(plate, text, (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3)
+    return plate
+
+# Fixture: recognizer med mock EasyOCR reader og database i tmp mappe
+@pytest.fixture
+def make_recognizer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def factory(license_plate_config=None):
+        rec = LicensePlateRecognizer({"license_plate": license_plate_config or {}})
+        rec.reader = MagicMock()
+        rec.reader.readtext.return_value = ["AB 12345"]
+        return rec
+
+    return factory
+
+def test_validate_plate_text(make_recognizer):
+    rec = make_recognizer()
+    assert rec.validate_plate_text("ab 12345")
+    assert not rec.validate_plate_text("A123456")
+
+def test_read_plate_normalizes_text(make_recognizer):
+    rec = make_recognizer()
+    assert rec.read_plate_easyocr(render_plate("AB12345")) == "AB12345"
+
+def test_ocr_cache_skips_reader_for_same_crop(make_recognizer):
+    rec = make_recognizer({"ocr_cache": {"enabled": True}})
+    plate = render_plate("AB12345")
+
+    assert rec.read_plate_easyocr(plate) == "AB12345"
+    assert rec.read_plate_easyocr(plate.copy()) == "AB12345"
+    assert rec.reader.readtext.call_count == 1
+    assert rec.ocr_cache.hits == 1
+
+def test_cached_read_does_not_vote_again(make_recognizer):
+    rec = make_recognizer({"ocr_cache": {"enabled": True}})
+    track = Track(1, (0, 0, 10, 10), 0)
+    plate = render_plate("AB12345")
+
+    # Samme crop igen er ikke en ny læsning - kun den første stemmer
+    plates = []
+    for i in range(4):
+        text, weight = rec.read_plates_scored([plate.copy()])[0]
+        plates.append(rec.update_tracking([(track, text, weight)], now=i * 0.05))
+    assert plates == [None] * 4
+    assert len(track.reads) == 1 and rec.ocr_cache.hits == 3
+
+def test_batching_sends_candidates_through_readtext_batched(make_recognizer):
+    rec = make_recognizer({"batching": {"enabled": True, "max_wait_ms": 50}})
+    rec.reader.readtext_batched.return_value = [["AB12345"], ["CD 67890"]]
+
+    texts = rec.read_plates_easyocr([render_plate("AB12345"), render_plate("CD67890")])
+    rec.close()
+
+    assert texts == ["AB12345", "CD67890"]
+    rec.reader.readtext_batched.assert_called_once()
+    rec.reader.readtext.assert_not_called()
+
+def make_scene(width=640, height=480, plate_box=(240, 300, 160, 40)):
+    """Gråt billede med en hvid nummerplade med sort tekst"""
+    frame = np.full((height, width, 3), 90, dtype=np.uint8)
+    x, y, w, h = plate_box
+    frame[y:y+h, x:x+w] = 255
+    cv2.rectangle(frame, (x, y), (x + w - 1, y + h - 1), (0, 0, 0), 2)
+    cv2.putText(frame, "AB12345", (x + 8, y + int(h * 0.75)),
+                cv2.FONT_HERSHEY_SIMPLEX, h / 45.0, (0, 0, 0), max(1, h // 20))
+    return frame
+
+def test_detects_plate_at_reference_resolution(make_recognizer):
+    rec = make_recognizer()
+    (x, y, w, h), = rec.detect_license_plate(make_scene())
+    assert abs(x - 240) <= 4 and abs(y - 300) <= 4
+    assert abs(w - 160) <= 8 and abs(h - 40) <= 8
+
+def test_downscaled_detection_maps_box_to_full_resolution(make_recognizer):
+    rec = make_recognizer({"detection_width": 640})
+    frame = make_scene(1920, 1080, plate_box=(720, 675, 480, 120))
+
+    (x, y, w, h), = rec.detect_license_plate(frame)
+    assert abs(x - 720) <= 8 and abs(y - 675) <= 8
+    assert abs(w - 480) <= 12 and abs(h - 120) <= 12
+
+def test_pyramid_level_finds_small_far_plate(make_recognizer):
+    frame = make_scene(1920, 1080, plate_box=(900, 500, 200, 50))
+
+    assert make_recognizer({"detection_width": 640}).detect_license_plate(frame) == []
+    boxes = make_recognizer({"detection_width": 640, "detection_pyramid": [1.0, 3.0]}).detect_license_plate(frame)
+    (x, y, w, h), = boxes
+    assert abs(x - 900) <= 8 and abs(w - 200) <= 12
+
+def test_tracker_skips_detection_between_full_detections(make_recognizer, monkeypatch):
+    rec = make_recognizer({"tracking": {"detect_every": 4}})
+    frame = make_scene()
+
+    calls = []
+    detect = rec.detect_license_plate
+    monkeypatch.setattr(rec, "detect_license_plate", lambda f: calls.append(1) or detect(f))
+
+    plates = [rec.update_tracking(rec.recognize_frame(frame), now=i * 0.1) for i in range(8)]
+
+    assert len(calls) == 3                 # Frame 1, 4 og 8
+    assert len(rec.tracker.tracks) == 1
+    assert "AB12345" in plates
+
+def test_ranked_candidates_stop_at_first_valid_plate(make_recognizer):
+    rec = make_recognizer()
+    rec.reader.readtext.side_effect = [["GRILL"], ["AB 12345"], ["CD67890"]]
+    boxes = [(0, 0, 100, 30), (0, 40, 100, 30), (0, 80, 100, 30)]
+
+    box, text = rec.read_ranked_candidates(make_scene(), boxes)
+
+    assert (box, text) == ((0, 40, 100, 30), "AB12345")
+    assert rec.reader.readtext.call_count == 2
+
+def test_ranked_candidates_respect_ocr_budget(make_recognizer):
+    rec = make_recognizer({"ocr_budget_ms": 0})
+    rec.reader.readtext.return_value = ["GRILL"]
+    boxes = [(0, 0, 100, 30), (0, 40, 100, 30), (0, 80, 100, 30)]
+
+    assert rec.read_ranked_candidates(make_scene(), boxes) == (None, None)
+    assert rec.reader.readtext.call_count == 1
+
+def test_detect_returns_top_k_in_score_order(make_recognizer):
+    rec = make_recognizer({"top_k": 2})
+    frame = make_scene()
+    cv2.rectangle(frame, (20, 20), (140, 50), (255, 255, 255), -1)   # Mindre skilt
+
+    boxes = rec.detect_license_plate(frame)
+    assert len(boxes) == 2
+    assert boxes[0][2] * boxes[0][3] > boxes[1][2] * boxes[1][3]
+
+def test_overlay_reuses_buffer_and_keeps_frame(make_recognizer):
+    rec = make_recognizer()
+    frame = make_scene()
+    original = frame.copy()
+
+    first = rec.add_overlay(frame)
+    second = rec.add_overlay(frame)
+
+    assert first is second
+    assert np.array_equal(frame, original)
+    assert not np.array_equal(first, original)
+
+def test_overlay_in_place_draws_into_frame(make_recognizer):
+    rec = make_recognizer()
+    frame = make_scene()
+    assert rec.add_overlay(frame, in_place=True) is frame
+
+def test_preview_is_throttled_to_preview_fps(make_recognizer, monkeypatch):
+    rec = make_recognizer()
+    rec.preview_fps = 10
+    clock = iter([100.0, 100.05, 100.11])
+    monkeypatch.setattr("license_plate_recognizer.time.time", lambda: next(clock))
+
+    assert [rec.preview_due() for _ in range(3)] == [True, False, True]
+
+def test_headless_run_never_opens_a_window(make_recognizer, monkeypatch):
+    rec = make_recognizer()
+    rec.headless = True
+    frames = [make_scene() for _ in range(3)]
+    cap = MagicMock()
+    cap.read.side_effect = [(True, f) for f in frames] + [(False, None)]
+    monkeypatch.setattr(rec, "open_camera", lambda: cap)
+    imshow = MagicMock()
+    monkeypatch.setattr("license_plate_recognizer.cv2.imshow", imshow)
+
+    rec.run_real_time(MagicMock(), MagicMock())
+
+    imshow.assert_not_called()
+    cap.release.assert_called_once()
+
+def test_background_ocr_loading_queues_frames_until_ready(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    release = threading.Event()
+    reader = MagicMock()
+    reader.readtext.return_value = ["AB 12345"]
+
+    def slow_reader(*args, **kwargs):
+        release.wait(5)
+        return reader
+
+    monkeypatch.setattr(sys.modules['easyocr'], "Reader", slow_reader)
+    rec = LicensePlateRecognizer({"license_plate": {
+        "ocr_loading": {"background": True, "queue_size": 2},
+        "tracking": {"detect_every": 1},
+    }})
+
+    # Frames før modellen er klar gemmes (kun de nyeste) i stedet for at blokere
+    for _ in range(3):
+        assert rec.process_frame(make_scene()) is None
+    assert len(rec._startup_frames) == 2
+    reader.readtext.assert_not_called()
+
+    release.set()
+    assert rec.ocr_ready.wait(5)
+
+    # Næste frame læser først de gemte frames og derefter sig selv
+    rec.process_frame(make_scene())
+    assert len(rec._startup_frames) == 0
+    assert reader.readtext.call_count == 3
+    assert [t.stable_plate for t in rec.tracker.tracks.values()] == ["AB12345"]
+    assert rec.startup_timings['ocr_load'] > 0
+
+def test_template_fast_path_skips_easyocr_for_clean_plate(make_recognizer):
+    rec = make_recognizer({"template_ocr": {"enabled": True}})
+
+    assert rec.read_plate_easyocr(render_plate("CD67890")) == "CD67890"
+    rec.reader.readtext.assert_not_called()
+
+def test_template_fast_path_falls_back_to_easyocr(make_recognizer):
+    rec = make_recognizer({"template_ocr": {"enabled": True}})
+
+    # Kun 5 tegn - består ikke validate_plate_text, så EasyOCR læser pladen
+    assert rec.read_plate_easyocr(render_plate("CD678")) == "AB12345"
+    rec.reader.readtext.assert_called_once()
+
+def test_recognition_only_skips_text_detection(make_recognizer):
+    rec = make_recognizer({"recognition_only": True})
+    rec.reader.recognize.return_value = [([[0, 0], [240, 0], [240, 60], [0, 60]], "AB 12345", 0.9)]
+
+    assert rec.read_plate_easyocr(render_plate("AB12345")) == "AB12345"
+    rec.reader.recognize.assert_called_once()
+    rec.reader.readtext.assert_not_called()
+
+def test_constrained_decoding_reads_through_decoder(make_recognizer, monkeypatch):
+    import license_plate_recognizer
+    rec = make_recognizer({"constrained_decoding": {"enabled": True}})
+    decoded = MagicMock(return_value=[("AB12345", 0.95)])
+    monkeypatch.setattr(license_plate_recognizer, "decode_rois", decoded)
+
+    # CTC sandsynligheden omsættes til en stemmevægt på decoderens skala
+    assert rec.read_plates_scored([render_plate("AB12345")]) == [
+        ("AB12345", pytest.approx(rec.voter.weight('decoder', 0.95)))]
+    assert decoded.call_args[0][0] == {"min_confidence": 0.3}
+    rec.reader.readtext.assert_not_called()
+
+def test_voting_needs_two_confident_reads(make_recognizer):
+    rec = make_recognizer()
+    confident, unsure = Track(1, (0, 0, 10, 10), 0), Track(2, (50, 0, 10, 10), 0)
+    sure = rec.voter.weight('template', 0.99)
+
+    # Selv en næsten perfekt template læsning kan ikke afgøre pladen alene
+    assert rec.update_tracking([(confident, "AB12345", sure)], now=1.0) is None
+    assert rec.update_tracking([(confident, "AB12345", sure)], now=1.05) == "AB12345"
+    # Usikre læsninger skal bekræftes flere gange, men uden at vente 0.3 s
+    weak = rec.voter.weight('easyocr', 0.5)
+    plates = [rec.update_tracking([(unsure, "CD67890", weak)], now=1.0 + i * 0.05) for i in range(4)]
+    assert plates[:2] == [None, None] and "CD67890" in plates
+
+def test_easyocr_confidence_is_passed_to_the_vote(make_recognizer):
+    rec = make_recognizer()
+    box = [[0, 0], [10, 0], [10, 10], [0, 10]]
+    rec.reader.readtext.return_value = [(box, "AB", 0.9), (box, "12345", 0.4)]
+
+    text, weight = rec.read_plates_scored([render_plate("AB12345")])[0]
+
+    assert text == "AB12345"
+    assert weight == pytest.approx(rec.voter.weight('easyocr', 0.4))   # Svageste tekststykke
+    assert rec.reader.readtext.call_args[1]['detail'] == 1
+
+def test_voting_outvotes_single_misread(make_recognizer):
+    rec = make_recognizer()
+    track = Track(1, (0, 0, 10, 10), 0)
+    reads = ["AB12345", "AB12845"] + ["AB12345"] * 4
+
+    plates = [rec.update_tracking([(track, text, 0.5)], now=i * 0.05) for i, text in enumerate(reads)]
+
+    # Det gamle stabilitetscheck startede forfra ved fejllæsningen og skulle bruge 9 frames
+    assert plates[:5] == [None] * 5
+    assert plates[5] == "AB12345"
+    assert track.stable_plate == "AB12345"
@@ -0,0 +1,68 @@
+import sys
+import os
+import urllib.request
+import pytest
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from metrics import Histogram, MetricsRegistry, MetricsServer
+
+
+def test_histogram_buckets_and_quantile():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 50 + [0.05] * 45 + [0.5] * 4 + [5.0]:
+        histogram.observe(seconds)
+
+    counts, total, count = histogram.snapshot()
+    assert counts == [50, 45, 4, 1]
+    assert count == 100
+    assert total == pytest.approx(0.25 + 2.25 + 2.0 + 5.0)
+
+    assert histogram.quantile(0.5) <= 0.01
+    assert 0.01 < histogram.quantile(0.95) <= 0.1
+
+def test_timed_decorator_records_calls_and_errors():
+    registry = MetricsRegistry()
+
+    @registry.timed("stage")
+    def work(fail=False):
+        if fail:
+            raise ValueError("fejl")
+        return 42
+
+    assert work() == 42
+    with pytest.raises(ValueError):
+        work(fail=True)
+
+    assert registry.histogram("stage").count == 2
+
+def test_render_prometheus_is_cumulative():
+    registry = MetricsRegistry()
+    registry.observe("detect", 0.002)
+    registry.observe("detect", 0.2)
+    registry.inc("frames", 3)
+
+    text = registry.render_prometheus()
+
+    assert 'anpr_stage_duration_seconds_bucket{stage="detect",le="0.0025"} 1' in text
+    assert 'anpr_stage_duration_seconds_bucket{stage="detect",le="0.25"} 2' in text
+    assert 'anpr_stage_duration_seconds_bucket{stage="detect",le="+Inf"} 2' in text
+    assert 'anpr_stage_duration_seconds_count{stage="detect"} 2' in text
+    assert "anpr_frames_total 3" in text
+    assert "detect: 2" in registry.summary()
+
+def test_server_serves_metrics_on_localhost():
+    registry = MetricsRegistry()
+    with registry.time("ocr"):
+        pass
+
+    server = MetricsServer({'port': 0, 'summary_interval': 0}, registry=registry).start()
+    try:
+        host, port = server.address
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.stop()
+
+    assert 'anpr_stage_duration_seconds_count{stage="ocr"} 1' in body
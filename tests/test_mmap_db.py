@@ -0,0 +1,128 @@
+import sys
+import os
+import json
+import pytest
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+import mmap_db
+from mmap_db import MmapFlatFileDB
+from flat_file_db import DatabaseLockedError
+from parking_state import create_parking_db
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "parked.json")
+
+def test_entry_exit_and_lookup(path):
+    db = MmapFlatFileDB(path)
+
+    assert db.car_entry("AB12345", lane="ind-1")
+    assert not db.car_entry("AB12345")
+    assert db.car_entry("CD67890")
+    assert db.is_car_parked("AB12345") and not db.is_car_parked("EF11111")
+    assert db.get_entry("AB12345")["lane"] == "ind-1"
+    assert db.get_entry("EF11111") is None
+
+    assert db.car_exit("AB12345")
+    assert not db.car_exit("AB12345")
+    assert db.get_all_parked_cars() == ["CD67890"]
+    assert db.get_count() == 1
+    db.close()
+
+def test_table_survives_restart(path):
+    db = MmapFlatFileDB(path)
+    db.car_entry("AB12345", lane="ud-1")
+    entry = db.get_entry("AB12345")
+    db.close()
+
+    restored = MmapFlatFileDB(path)
+    assert restored.get_count() == 1
+    assert restored.get_entry("AB12345") == entry
+    restored.close()
+
+def test_table_grows_and_reuses_deleted_slots(path):
+    db = MmapFlatFileDB(path, {'initial_slots': 16})
+    plates = [f"AB{i:05d}" for i in range(500)]
+    for plate in plates:
+        db.car_entry(plate)
+    for plate in plates[::2]:
+        db.car_exit(plate)
+    for i in range(200):
+        db.car_entry(f"CD{i:05d}")
+
+    assert db.slots > 16
+    assert db.get_count() == 450
+    assert all(db.is_car_parked(plate) for plate in plates[1::2])
+    assert not any(db.is_car_parked(plate) for plate in plates[::2])
+    db.close()
+
+def test_unclean_shutdown_rebuilds_index(path):
+    db = MmapFlatFileDB(path)
+    for i in range(20):
+        db.car_entry(f"AB{i:05d}")
+    db.car_exit("AB00003")
+    db.save_data()
+    # Intet close() - som et nedbrud (låsen slippes når processen dør)
+    db._close_map()
+    db._lock_file.close()
+
+    restored = MmapFlatFileDB(path)
+    assert restored.get_count() == 19
+    assert restored.tombstones == 0
+    assert not restored.is_car_parked("AB00003") and restored.is_car_parked("AB00019")
+    restored.close()
+
+def test_imports_existing_json_database(path):
+    with open(path, "w") as f:
+        json.dump({"AB12345": {"entry_time": "2024-01-01T08:00:00", "lane": "ind-1"},
+                   "CD67890": {"entry_time": "2024-01-01T07:00:00", "lane": None}}, f)
+
+    db = create_parking_db({'backend': 'mmap', 'file': path})
+
+    assert isinstance(db, MmapFlatFileDB)
+    assert db.get_all_parked_cars() == ["CD67890", "AB12345"]   # Efter indkørselstid
+    assert db.get_entry("AB12345") == {"entry_time": "2024-01-01T08:00:00", "lane": "ind-1"}
+    db.close()
+
+def test_clear_all_and_too_long_plate(path):
+    db = MmapFlatFileDB(path)
+    db.car_entry("AB12345")
+    db.clear_all()
+    assert db.get_count() == 0 and not db.is_car_parked("AB12345")
+
+    with pytest.raises(ValueError):
+        db.car_entry("X" * 16)
+    db.close()
+
+def test_second_instance_cannot_open_or_rebuild_table(path):
+    db = MmapFlatFileDB(path)
+    db.car_entry("AB11111")
+
+    # Headeren er dirty mens tabellen er åben - en anden må ikke genopbygge den
+    with pytest.raises(DatabaseLockedError):
+        MmapFlatFileDB(path)
+
+    db.car_entry("AB22222")
+    db.close()
+    restored = MmapFlatFileDB(path)
+    assert sorted(restored.get_all_parked_cars()) == ["AB11111", "AB22222"]
+    restored.close()
+
+def test_rebuild_drops_slot_written_before_header(path):
+    db = MmapFlatFileDB(path)
+    db.car_entry("AB11111")
+    # Nedbrud mellem slot og header: slottet peger på post high, som headeren ikke kender
+    plate = b"CD22222"
+    slot = db._find(plate)[0]
+    mmap_db.SLOT.pack_into(db._mm, mmap_db.HEADER_SIZE + slot * mmap_db.SLOT.size,
+                           db.high + 1, mmap_db.plate_hash(plate))
+    db.save_data()
+    db._close_map()
+    db._lock_file.close()
+
+    restored = MmapFlatFileDB(path)
+    assert restored.get_all_parked_cars() == ["AB11111"]
+    assert restored.car_entry("CD22222")
+    restored.close()
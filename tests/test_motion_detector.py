@@ -0,0 +1,43 @@
+import sys
+import os
+import numpy as np
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from motion_detector import MotionDetector
+
+
+def make_frame(box=None):
+    frame = np.full((480, 640, 3), 80, dtype=np.uint8)
+    if box:
+        x, y, w, h = box
+        frame[y:y+h, x:x+w] = 255
+    return frame
+
+def test_first_frame_is_always_processed():
+    detector = MotionDetector()
+    assert detector.has_motion(make_frame(), now=0.0)
+
+def test_static_scene_is_skipped_after_hold_time():
+    detector = MotionDetector({"hold_time": 1.0})
+    detector.has_motion(make_frame(), now=0.0)
+
+    assert detector.has_motion(make_frame(), now=0.5)      # Stadig inden for hold_time
+    assert not detector.has_motion(make_frame(), now=2.0)
+    assert detector.skipped == 1
+
+def test_motion_resumes_immediately():
+    detector = MotionDetector({"hold_time": 0.0})
+    detector.has_motion(make_frame(), now=0.0)
+    assert not detector.has_motion(make_frame(), now=1.0)
+
+    # En bil kører ind i billedet
+    assert detector.has_motion(make_frame((200, 200, 200, 100)), now=1.1)
+
+def test_reset_forces_processing():
+    detector = MotionDetector({"hold_time": 0.0})
+    detector.has_motion(make_frame(), now=0.0)
+    assert not detector.has_motion(make_frame(), now=1.0)
+
+    detector.reset()
+    assert detector.has_motion(make_frame(), now=1.1)
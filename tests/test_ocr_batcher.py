@@ -0,0 +1,74 @@
+import sys
+import os
+import threading
+import pytest
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from ocr_batcher import OCRBatcher
+
+
+@pytest.fixture
+def batch_calls():
+    return []
+
+@pytest.fixture
+def batcher(batch_calls):
+    def batch_fn(rois):
+        batch_calls.append(list(rois))
+        return [f"result-{roi}" for roi in rois]
+
+    batcher = OCRBatcher(batch_fn, {"max_batch_size": 4, "max_wait_ms": 200, "report_interval": 0})
+    yield batcher
+    batcher.stop()
+
+def test_results_are_dispatched_to_their_submitter(batcher):
+    futures = {roi: batcher.submit(roi) for roi in ["a", "b", "c"]}
+    for roi, future in futures.items():
+        assert future.result(timeout=2) == f"result-{roi}"
+
+def test_submissions_from_several_threads_share_a_batch(batcher, batch_calls):
+    barrier = threading.Barrier(4)
+    results = {}
+
+    def frame_worker(i):
+        barrier.wait()
+        results[i] = batcher.submit(i).result(timeout=2)
+
+    threads = [threading.Thread(target=frame_worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: f"result-{i}" for i in range(4)}
+    assert len(batch_calls) == 1
+    assert sorted(batch_calls[0]) == [0, 1, 2, 3]
+    assert batcher.batches == 1
+    assert batcher.items == 4
+
+def test_max_batch_size_is_respected(batcher, batch_calls):
+    futures = [batcher.submit(i) for i in range(10)]
+    assert [f.result(timeout=2) for f in futures] == [f"result-{i}" for i in range(10)]
+    assert all(len(call) <= 4 for call in batch_calls)
+    assert "OCR batch:" in batcher.report()
+
+def test_batch_errors_reach_every_caller():
+    def failing(rois):
+        raise RuntimeError("OCR fejl")
+
+    batcher = OCRBatcher(failing, {"max_wait_ms": 10})
+    future = batcher.submit("x")
+    with pytest.raises(RuntimeError):
+        future.result(timeout=2)
+    batcher.stop()
+
+def test_missing_results_fail_instead_of_hanging():
+    batcher = OCRBatcher(lambda rois: [f"result-{rois[0]}"], {"max_wait_ms": 50})
+    futures = [batcher.submit(i) for i in range(3)]
+
+    assert futures[0].result(timeout=2) == "result-0"
+    for future in futures[1:]:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=2)
+    batcher.stop()
@@ -0,0 +1,52 @@
+import sys
+import os
+import numpy as np
+import cv2
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from ocr_cache import OCRCache, dhash, hamming_distance
+
+
+def render_plate(text, noise=0, seed=0):
+    plate = np.full((60, 240, 3), 255, dtype=np.uint8)
+    cv2.putText(plate, text, (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3)
+    if noise:
+        rng = np.random.default_rng(seed)
+        plate = np.clip(plate.astype(int) + rng.integers(-noise, noise, plate.shape), 0, 255)
+        plate = plate.astype(np.uint8)
+    return plate
+
+def test_near_duplicate_crops_hash_close():
+    a = dhash(render_plate("AB12345"))
+    b = dhash(render_plate("AB12345", noise=10, seed=1))
+    c = dhash(render_plate("AB12845"))
+    assert hamming_distance(a, b) < hamming_distance(a, c)
+
+def test_hit_for_near_duplicate_and_miss_for_other_plate():
+    cache = OCRCache()
+    cache.put(cache.key(render_plate("AB12345")), "AB12345", now=0.0)
+
+    assert cache.get(cache.key(render_plate("AB12345", noise=10, seed=2)), now=1.0) == "AB12345"
+    assert cache.get(cache.key(render_plate("AB12845")), now=1.0) is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_ttl_expires_entries():
+    cache = OCRCache({"ttl": 5.0})
+    key = cache.key(render_plate("AB12345"))
+    cache.put(key, "AB12345", now=0.0)
+
+    assert cache.get(key, now=6.0) is None
+    assert len(cache) == 0
+
+def test_lru_eviction():
+    cache = OCRCache({"max_size": 2, "max_distance": 0})
+    cache.put(1, "A", now=0.0)
+    cache.put(2, "B", now=0.0)
+    cache.get(1, now=0.0)         # 1 er nu senest brugt
+    cache.put(4, "C", now=0.0)    # 2 skal ud
+
+    assert cache.get(2, now=0.0) is None
+    assert cache.get(1, now=0.0) == "A"
+    assert cache.get(4, now=0.0) == "C"
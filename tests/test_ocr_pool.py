@@ -0,0 +1,55 @@
+import sys
+import os
+import threading
+import time
+import pytest
+import numpy as np
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from ocr_pool import OCRWorkerPool
+
+
+class FakeReader:
+    """Reader der 'læser' ROI'ens første pixelværdi og sin egen proces id"""
+    def readtext(self, roi, detail=0, paragraph=False):
+        time.sleep(0.2)   # Langsom nok til at samtidige kald lander på hver sin worker
+        return [f"ROI{int(roi[0, 0])}", str(os.getpid())]
+
+
+def fake_reader_factory(languages):
+    return FakeReader()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = OCRWorkerPool({"workers": 2}, reader_factory=fake_reader_factory)
+    pool.warm_up()   # Som i recognizeren - begge workers kører før første kald
+    yield pool
+    pool.shutdown()
+
+def roi(value):
+    return np.full((10, 40), value, dtype=np.uint8)
+
+def test_read_runs_in_worker_process(pool):
+    text, pid = pool.read(roi(7))
+    assert text == "ROI7"
+    assert int(pid) != os.getpid()
+
+def test_concurrent_calls_run_on_separate_workers(pool):
+    # Som to genkendelsestråde i pipeline mode - hver venter på sit eget resultat
+    results = {}
+
+    def read(frame_id):
+        results[frame_id] = pool.read_many([roi(frame_id), roi(frame_id + 100)])
+
+    threads = [threading.Thread(target=read, args=(frame_id,)) for frame_id in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for frame_id, rois in results.items():
+        assert [r[0] for r in rois] == [f"ROI{frame_id}", f"ROI{frame_id + 100}"]
+    assert len({r[1] for rois in results.values() for r in rois}) == 2
+    assert pool.submitted == pool.completed
@@ -0,0 +1,92 @@
+import sys
+import os
+import types
+import numpy as np
+import pytest
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from plate_decoder import PlateDecoder, preprocess_rois, decode_rois
+
+# Samme opbygning som EasyOCR's converter.character (indeks 0 er CTC blank)
+CHARACTERS = ['[blank]'] + list("0123456789 -.ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+INDEX = {c: i for i, c in enumerate(CHARACTERS)}
+
+
+def make_probs(steps, noise=0.001):
+    """
+    CTC sandsynligheder fra en liste af tidsskridt, hvor hvert skridt er et tegn,
+    None (blank) eller en dict {tegn: sandsynlighed}
+    """
+    probs = np.full((len(steps), len(CHARACTERS)), noise)
+    for t, step in enumerate(steps):
+        if step is None:
+            step = {'[blank]': 1.0}
+        elif isinstance(step, str):
+            step = {step: 1.0}
+        for char, p in step.items():
+            probs[t, INDEX[char]] += p
+    return probs / probs.sum(axis=1, keepdims=True)
+
+def test_layout_fixes_letter_digit_confusions():
+    decoder = PlateDecoder(CHARACTERS)
+    probs = make_probs(['A', None, 'B', ' ', {'O': 0.6, '0': 0.35}, None, '2', None,
+                        '3', '4', None, {'I': 0.55, '1': 0.4}, None])
+
+    assert decoder.greedy(probs) == "AB O234I"
+    plate, confidence = decoder.decode(probs)
+    assert plate == "AB02341"
+    assert 0.3 < confidence < 0.5
+
+def test_repeated_characters_need_a_blank():
+    decoder = PlateDecoder(CHARACTERS)
+    probs = make_probs(['X', 'X', None, 'X', '1', None, '1', '1', None, '2', None, '2', '3'])
+
+    plate, confidence = decoder.decode(probs)
+    assert plate == "XX11223"
+    assert confidence > 0.8
+
+def test_letter_to_digit_needs_no_blank():
+    decoder = PlateDecoder(CHARACTERS)
+    # Bogstav A og ciffer 0 har samme plads i hver klasse, men er forskellige tegn
+    plate, _ = decoder.decode(make_probs(['A', 'B', '0', '1', '2', '3', '4']))
+    assert plate == "AB01234"
+
+def test_unreadable_crop_falls_back_to_greedy_text():
+    decoder = PlateDecoder(CHARACTERS, {'min_confidence': 0.3})
+
+    assert decoder.decode(make_probs(['A', 'B'])) == ("", 0.0)
+    text, confidence = decoder.read(make_probs(['G', 'R', 'I', 'L', 'L'] * 3))
+    assert text == "GRILGRILGRIL"
+    assert confidence < 0.3
+
+def test_preprocess_pads_to_common_width():
+    rois = [np.full((32, 128, 3), 255, np.uint8), np.zeros((20, 45), np.uint8)]
+
+    batch = preprocess_rois(rois)
+
+    assert batch.shape == (2, 1, 64, 256)
+    assert batch.dtype == np.float32
+    assert np.all(batch[0] == 1.0)
+    assert np.all(batch[1] == -1.0)   # Højre-padding gentager sidste kolonne
+
+def test_decode_rois_reads_whole_batch_in_one_forward_pass():
+    torch = pytest.importorskip("torch")
+    steps = ['A', 'B', None, '1', '2', None, '3', {'O': 0.55, '0': 0.45}, '5', None]
+    logits = torch.log(torch.tensor(make_probs(steps), dtype=torch.float32))
+
+    class FixedModel(torch.nn.Module):
+        def forward(self, image, text):
+            self.batches = getattr(self, 'batches', []) + [image.shape[0]]
+            return logits.unsqueeze(0).repeat(image.shape[0], 1, 1)
+
+    model = FixedModel()
+    reader = types.SimpleNamespace(recognizer=model, lang_char="0123456789 ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+                                   converter=types.SimpleNamespace(character=CHARACTERS))
+    rois = [np.zeros((30, 120, 3), np.uint8)] * 3
+
+    results = decode_rois({}, reader, rois)
+
+    assert model.batches == [3]
+    assert [text for text, _ in results] == ["AB12305"] * 3
+    assert all(0.4 < confidence < 0.5 for _, confidence in results)
@@ -0,0 +1,51 @@
+import sys
+import os
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from plate_tracker import PlateTracker, box_iou
+
+
+def test_box_iou():
+    assert box_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert box_iou((0, 0, 10, 10), (20, 20, 10, 10)) == 0.0
+    assert abs(box_iou((0, 0, 10, 10), (5, 0, 10, 10)) - 1 / 3) < 1e-9
+
+def test_detection_runs_every_nth_frame_while_tracking():
+    tracker = PlateTracker({"detect_every": 3})
+
+    _, detect = tracker.next_frame()
+    assert detect                                   # Ingen tracks endnu
+    tracker.update([(100, 100, 160, 40)], 1)
+
+    decisions = [tracker.next_frame()[1] for _ in range(5)]
+    assert decisions == [False, True, False, False, True]
+
+def test_same_plate_keeps_track_id():
+    tracker = PlateTracker()
+    (first, _), = tracker.update([(100, 100, 160, 40)], 1)
+    (second, _), = tracker.update([(110, 102, 160, 40)], 2)
+    (other, _), = tracker.update([(400, 300, 160, 40)], 3)
+
+    assert first.track_id == second.track_id
+    assert other.track_id != first.track_id
+
+def test_prediction_follows_velocity_with_margin():
+    tracker = PlateTracker({"margin": 0.0})
+    tracker.update([(100, 100, 160, 40)], 1)
+    tracker.update([(110, 100, 160, 40)], 2)
+
+    (_, box), = tracker.predicted(4, (480, 640))
+    assert box == (130, 100, 160, 40)
+
+def test_lost_track_forces_detection():
+    tracker = PlateTracker({"detect_every": 10, "max_misses": 1})
+    tracker.next_frame()
+    (track, _), = tracker.update([(100, 100, 160, 40)], 1)
+
+    assert tracker.next_frame()[1] is False
+    tracker.report(track, False)
+    tracker.report(track, False)
+
+    assert track.track_id not in tracker.tracks
+    assert tracker.next_frame()[1] is True
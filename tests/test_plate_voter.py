@@ -0,0 +1,79 @@
+import sys
+import os
+import pytest
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from plate_tracker import Track
+from plate_voter import PlateVoter
+
+
+def make_track():
+    return Track(1, (0, 0, 100, 30), 0)
+
+def test_tally_votes_per_position():
+    voter = PlateVoter({'prior': 0.0})
+    plate, posterior = voter.tally([("AB12345", 0.9), ("AB12845", 0.3), ("A812345", 0.2)])
+
+    assert plate == "AB12345"
+    assert posterior == pytest.approx(1.1 / 1.4)   # Svageste position er 3 mod 8
+
+def test_confident_read_emits_immediately():
+    voter = PlateVoter({'threshold': 0.75, 'prior': 0.25})
+
+    assert voter.add(make_track(), "AB12345", 0.95, now=0.0)[0] == "AB12345"
+    assert voter.add(make_track(), "AB12345", 0.5, now=0.0)[0] is None
+
+def test_window_forgets_old_reads():
+    voter = PlateVoter({'window': 3, 'threshold': 0.7, 'prior': 0.5, 'max_wait': 100})
+    track = make_track()
+
+    for text in ["CD67890", "AB12345", "AB12345"]:
+        assert voter.add(track, text, 0.5, now=0.0)[0] is None
+    assert len(track.reads) == 3
+    # Den første læsning falder ud af vinduet - nu er alle tre enige
+    assert voter.add(track, "AB12345", 0.5, now=0.1) == ("AB12345", 0.75)
+
+def test_max_wait_settles_on_majority():
+    voter = PlateVoter({'threshold': 0.99, 'max_wait': 1.0, 'min_reads': 2})
+    track = make_track()
+
+    assert voter.add(track, "AB12345", 0.5, now=0.0)[0] is None
+    assert voter.add(track, "AB12845", 0.5, now=0.5)[0] is None
+    assert voter.add(track, "AB12345", 0.5, now=1.2)[0] == "AB12345"
+
+def test_max_wait_needs_full_reads_of_majority():
+    voter = PlateVoter({'threshold': 0.99, 'max_wait': 1.0, 'min_reads': 2})
+    track = make_track()
+
+    # Flertallet pr. position er AB12345, men det er kun læst helt én gang
+    voter.add(track, "AB12345", 0.9, now=0.0)
+    voter.add(track, "AB12845", 0.5, now=0.5)
+    assert voter.add(track, "XB12345", 0.5, now=1.5)[0] is None
+
+def test_weight_scales_each_source_to_a_common_cap():
+    voter = PlateVoter()
+
+    # Hver kildes acceptgrænse giver min_weight, perfekt confidence giver max_weight
+    assert voter.weight('template', 0.6) == pytest.approx(0.1)
+    assert voter.weight('decoder', 0.3) == pytest.approx(0.1)
+    assert voter.weight('easyocr', 1.0) == pytest.approx(0.5)
+    assert voter.weight('template', 1.2) == pytest.approx(0.5)
+    assert voter.weight('easyocr', None) == pytest.approx(0.5)
+
+def test_single_read_cannot_lock_with_defaults():
+    voter = PlateVoter()
+    track = make_track()
+
+    assert voter.add(track, "AB12345", voter.weight('template', 1.0), now=0.0)[0] is None
+    assert voter.add(track, "AB12345", voter.weight('decoder', 0.99), now=0.05)[0] == "AB12345"
+
+def test_zero_weight_read_does_not_vote():
+    voter = PlateVoter()
+    track = make_track()
+
+    assert voter.add(track, "AB12345", 0.0, now=0.0) == (None, 0.0)
+    voter.add(track, "AB12345", voter.weight('easyocr', 1.0), now=0.1)
+    for i in range(3):
+        assert voter.add(track, "AB12345", 0.0, now=0.2 + i)[0] is None
+    assert len(track.reads) == 1 and track.first_read == 0.1
@@ -0,0 +1,100 @@
+import sys
+import os
+import json
+import sqlite3
+import threading
+import pytest
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from sqlite_db import SqliteFlatFileDB
+from flat_file_db import DatabaseLockedError
+from parking_state import create_parking_db
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "parked.json")
+
+def test_entry_exit_and_cached_count(path):
+    db = SqliteFlatFileDB(path)
+
+    assert db.car_entry("AB12345", lane="ind-1")
+    assert not db.car_entry("AB12345")
+    assert db.car_entry("CD67890")
+    assert db.get_count() == 2
+    assert db.is_car_parked("AB12345") and not db.is_car_parked("EF11111")
+    assert db.get_entry("AB12345")["lane"] == "ind-1"
+
+    assert db.car_exit("AB12345")
+    assert not db.car_exit("AB12345")
+    assert db.get_all_parked_cars() == ["CD67890"]
+    assert db.get_count() == 1
+    db.clear_all()
+    assert db.get_count() == 0 and db.get_all_parked_cars() == []
+    db.close()
+
+def test_wal_mode_and_plate_index(path):
+    db = SqliteFlatFileDB(path)
+    assert db.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = db.connection.execute("EXPLAIN QUERY PLAN SELECT entry_time, lane FROM parked_cars WHERE plate = ?",
+                                 ("AB12345",)).fetchall()
+    assert "idx_parked_cars_plate" in str(plan)
+    db.close()
+
+def test_other_connection_reads_committed_changes(path):
+    db = SqliteFlatFileDB(path)
+    db.car_entry("AB12345")
+
+    reader = sqlite3.connect(db.sqlite_file)
+    assert reader.execute("SELECT plate FROM parked_cars").fetchall() == [("AB12345",)]
+    reader.close()
+    db.close()
+
+    restored = SqliteFlatFileDB(path)
+    assert restored.get_all_parked_cars() == ["AB12345"]
+    restored.close()
+
+def test_concurrent_entries_from_threads(path):
+    db = SqliteFlatFileDB(path)
+
+    def enter(offset):
+        for i in range(25):
+            db.car_entry(f"AB{offset + i:05d}")
+
+    threads = [threading.Thread(target=enter, args=(i * 100,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert db.get_count() == 100
+    assert len(db.get_all_parked_cars()) == 100
+    db.close()
+
+def test_imports_existing_json_database(path):
+    with open(path, "w") as f:
+        json.dump(["AB12345", "CD67890"], f)
+
+    db = create_parking_db({'backend': 'sqlite', 'file': path, 'sqlite': {'synchronous': 'full'}})
+
+    assert isinstance(db, SqliteFlatFileDB)
+    assert db.get_all_parked_cars() == ["AB12345", "CD67890"]
+    assert db.get_entry("AB12345") == {"entry_time": None, "lane": None}
+    db.close()
+    with pytest.raises(ValueError):
+        SqliteFlatFileDB(path, {'synchronous': 'sometimes'})
+
+def test_second_writer_is_rejected(path):
+    db = SqliteFlatFileDB(path)
+    db.car_entry("AB11111")
+
+    # Det cachede antal passer kun med én skriver
+    with pytest.raises(DatabaseLockedError):
+        SqliteFlatFileDB(path)
+
+    db.car_entry("AB22222")
+    db.close()
+    restored = SqliteFlatFileDB(path)
+    assert restored.get_count() == 2
+    restored.close()
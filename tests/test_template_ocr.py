@@ -0,0 +1,49 @@
+import sys
+import os
+import numpy as np
+import cv2
+
+# Tilføj pc-side/src til Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pc-side', 'src')))
+from template_ocr import TemplateOCR, CHARACTERS, fit_to_template, render_template
+
+
+def render_plate(text, height=50):
+    """Dansk plade ('AB 12 345') med rød kant som i benchmarks/synthetic.py"""
+    width = int(height * 4.7)
+    plate = np.full((height, width, 3), 245, dtype=np.uint8)
+    cv2.rectangle(plate, (0, 0), (width - 1, height - 1), (40, 40, 200), max(2, height // 14))
+    label = f"{text[:2]} {text[2:4]} {text[4:]}"
+    scale, thickness = height / 34.0, max(1, height // 16)
+    (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    cv2.putText(plate, label, ((width - tw) // 2, (height + th) // 2),
+                cv2.FONT_HERSHEY_SIMPLEX, scale, (20, 20, 20), thickness, cv2.LINE_AA)
+    return plate
+
+def test_reads_clean_plates_with_high_confidence():
+    ocr = TemplateOCR()
+    for text, height in [("AB12345", 50), ("MW67890", 60), ("QI10101", 70), ("XO80808", 45)]:
+        read, confidence = ocr.read(render_plate(text, height))
+        assert read == text
+        assert confidence >= ocr.min_confidence
+
+def test_blank_crop_has_no_confidence():
+    ocr = TemplateOCR()
+    assert ocr.read(np.full((40, 180, 3), 200, dtype=np.uint8)) == ("", 0.0)
+
+def test_tiny_plate_is_not_trusted():
+    ocr = TemplateOCR()
+    text, confidence = ocr.read(render_plate("AR56817", 31))
+    assert text != "AR56817" and confidence < ocr.min_confidence
+
+def test_batched_match_equals_match_template_loop():
+    ocr = TemplateOCR()
+    chars = ocr.extract_characters(render_plate("AB1234", 60))[:3]
+    _, scores = ocr.match(chars[:3])
+
+    # Den oprindelige løkke: ét cv2.matchTemplate kald pr. skabelon
+    for row, char in zip(scores, chars):
+        fitted = fit_to_template(char)
+        expected = [cv2.matchTemplate(fitted, render_template(c), cv2.TM_CCOEFF_NORMED)[0, 0]
+                    for c in CHARACTERS]
+        assert np.allclose(row, expected, atol=1e-3)